@@ -21,16 +21,32 @@ mpl.rcParams['xtick.direction'] = 'in'
 mpl.rcParams['ytick.direction'] = 'in'
 
 from .ang_dist import ang_dist
-from .combine_measurements import combine_measurements
+from .batch_phot import synthphot_files, read_spectrum
+from .catalog_stream import iter_catalog_chunks, write_catalog_chunks, convert_catalog, wise_fluxes
+from .color_correction import ColorCorrectionTable
+from .combine_measurements import combine_measurements, combine_measurements_grouped
 from .compute_hist_dens import compute_hist_dens
 from .coord_conversions import hours2deg, deg2hours
+from .cosmology import DistanceTable, get_distance_table, lum_dist
 from .create_alpha_colmap import create_alpha_colmap
 from .diffraction_limit import diffration_limit
-from .effective_wlen import effective_wlen
+from .disk_cache import DiskCache
+from .effective_wlen import effective_wlen, effective_wlen_table, effective_wlen_interp
+from .filter_bank import synthphot_bank, synthphot_tophat
+from .filter_curve import Filter, check_coverage
+from .filter_library import FilterLibrary, get_filter, set_default_library, write_filter_library
 from .flux_lum_conversions import lum2fnu, lum2flux, fnu2lum, flux2lum
-from .flux_conversions import jansky2erg, erg2jansky, convert_flux, get_zp, mag2jansky, jansky2mag
+from .flux_conversions import jansky2erg, erg2jansky, convert_flux, get_converter, get_zp, filter_codes, mag2jansky, jansky2mag
 from .freq_wave_conversions import micron2hertz, hertz2micron
-from .synthphot import synthphot, synthphot_freq
+from .kcorrection import synthphot_zgrid, KCorrTable
+from .parallel import parallel_apply, set_parallel_defaults, get_parallel_defaults
+from .phot_matrix import PhotMatrix
+from .phot_uncertainty import synthphot_mc
+from .rebin import Rebinner, rebin_spectra
+from .shared_spectra import SharedSpectralLibrary, SharedArrayHandle, synthphot_shared
+from .spectral_axis import SpectralAxis
+from .stream_phot import synthphot_stream, iter_spectrum_chunks
+from .synthphot import synthphot, synthphot_freq, synthphot_batch, synthphot_multi
 from .timestamp import timestamp
 from .toNEDname import toNEDname
 import miscellaneous.wise as wise
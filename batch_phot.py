@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: error messages of synthphot collected per file and printed
+                  by the calling process instead of being discarded
+
+
+NOTES:
+    - the filters are sent once to every worker process (pool initializer),
+      the tasks themselves only contain file names
+    - inside a worker, the files of a task are read by background threads
+      while the photometry of the previous files is computed
+    - the messages of synthphot (e.g., spectra not covering a filter) are
+      collected per file, each distinct message once, and printed with the
+      file name by the calling process
+
+TO-DO:
+    -
+"""
+
+
+import glob
+import io
+import os
+import contextlib
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
+
+import numpy as np
+
+from .filter_curve import Filter
+from .synthphot import synthphot, synthphot_freq
+
+
+# --- per worker state set by the pool initializer
+_worker_filters = None
+_worker_opts = None
+
+
+def read_spectrum(fname):
+    """
+    Default spectrum reader: returns the wavelength and flux density arrays
+    from a .npy file with the shape (2, n_wavelengths) or (n_wavelengths, 2)
+    or from the first two columns of an ASCII table
+    """
+
+    if fname.endswith(".npy"):
+        spec = np.load(fname)
+
+        if spec.shape[0] != 2:
+            spec = spec.T
+
+        return(spec[0], spec[1])
+
+    wavelen, fluxden = np.loadtxt(fname, usecols=(0, 1), unpack=True)
+
+    return(wavelen, fluxden)
+
+
+def _init_worker(filters, opts):
+    global _worker_filters, _worker_opts
+
+    _worker_filters = filters
+    _worker_opts = opts
+
+
+def _phot_files(fnames):
+    """
+    Worker task: read the files with background threads and return the
+    synthetic flux densities (n_files, n_filters), NaN where not available,
+    and the list of messages
+    """
+
+    opts = _worker_opts
+    fn = synthphot_freq if opts["freq"] else synthphot
+
+    synflux = np.full((len(fnames), len(_worker_filters)), np.nan)
+    messages = []
+
+    with ThreadPoolExecutor(max_workers=opts["io_threads"]) as iopool:
+
+        reads = [iopool.submit(opts["reader"], f) for f in fnames]
+
+        for i, read in enumerate(reads):
+
+            try:
+                wavelen, fluxden = read.result()
+            except Exception as e:
+                messages.append("SYNTHPHOT_FILES: WARNING could not read "
+                                + fnames[i] + ": " + str(e))
+                continue
+
+            # --- collect the per filter messages, each distinct one once
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                for j, filt in enumerate(_worker_filters):
+                    res = fn(wavelen, fluxden, filt,
+                             ignore_incomplete=opts["ignore_incomplete"],
+                             acceptable_hole=opts["acceptable_hole"])
+
+                    if not np.isscalar(res) or res != -1:
+                        synflux[i, j] = res
+
+            lines = [l.strip() for l in out.getvalue().splitlines()]
+            messages += ["SYNTHPHOT_FILES: " + fnames[i] + ": " + l
+                         for l in dict.fromkeys(lines) if l != ""]
+
+    return(synflux, messages)
+
+
+def synthphot_files(files, filters, pattern="*", reader=read_spectrum,
+                    workers=None, files_per_task=16, io_threads=2, freq=False,
+                    ignore_incomplete=False, acceptable_hole=0.7,
+                    progress=True):
+    """
+    Perform synthetic photometry for many spectrum files in a set of filters
+    using a pool of worker processes
+
+    Parameters
+    ----------
+    files : TYPE str or list of str
+        DESCRIPTION. Directory (combined with pattern) or list of file names
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters to evaluate. Tuples (fwlen, ftrans, ref_wlen[,
+        alpha]) are converted to Filter objects
+    pattern : TYPE str, optional
+        DESCRIPTION. The default is "*". File name pattern if files is a
+        directory
+    reader : TYPE function, optional
+        DESCRIPTION. The default is read_spectrum. Function (must be
+        picklable, i.e., defined at module level) returning wavelen, fluxden
+        for a file name
+    workers : TYPE int, optional
+        DESCRIPTION. The default is None. Number of worker processes (None:
+        number of cores, 0: everything in the calling process)
+    files_per_task : TYPE int, optional
+        DESCRIPTION. The default is 16. Number of files handed to a worker at
+        once
+    io_threads : TYPE int, optional
+        DESCRIPTION. The default is 2. Number of threads per worker reading
+        the files in the background
+    freq : TYPE bool, optional
+        DESCRIPTION. The default is False. Use synthphot_freq instead of
+        synthphot
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+    progress : TYPE bool, optional
+        DESCRIPTION. The default is True. Print the number of processed files
+
+    Returns
+    -------
+    structured array with the field 'file' and one field per filter name
+        containing the synthetic flux densities (NaN if not available)
+
+    """
+
+    if isinstance(files, str):
+        files = sorted(glob.glob(os.path.join(files, pattern)))
+
+    files = list(files)
+    nfiles = len(files)
+
+    filters = [f if isinstance(f, Filter) else Filter(*f) for f in filters]
+    names = [f.name if f.name is not None else str(i)
+             for i, f in enumerate(filters)]
+
+    opts = {"freq": freq, "ignore_incomplete": ignore_incomplete,
+            "acceptable_hole": acceptable_hole, "reader": reader,
+            "io_threads": io_threads}
+
+    dtype = ([("file", "U{:d}".format(max([len(f) for f in files] + [1])))]
+             + [(n, float) for n in names])
+    result = np.zeros(nfiles, dtype=dtype)
+    result["file"] = files
+
+    tasks = [(i, files[i:i+files_per_task])
+             for i in range(0, nfiles, files_per_task)]
+
+    ndone = 0
+
+    def _store(i, res):
+        synflux, messages = res
+
+        for j, n in enumerate(names):
+            result[n][i:i+len(synflux)] = synflux[:, j]
+
+        for message in messages:
+            print(message)
+
+    # --- serial execution in the calling process
+    if workers == 0:
+        _init_worker(filters, opts)
+
+        for i, fnames in tasks:
+            _store(i, _phot_files(fnames))
+            ndone += len(fnames)
+
+            if progress:
+                print("SYNTHPHOT_FILES: {:d}/{:d} files done".format(ndone,
+                                                                     nfiles))
+
+        return(result)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(filters, opts)) as pool:
+
+        futures = {pool.submit(_phot_files, fnames): (i, len(fnames))
+                   for i, fnames in tasks}
+
+        for fut in as_completed(futures):
+            i, n = futures[fut]
+            _store(i, fut.result())
+            ndone += n
+
+            if progress:
+                print("SYNTHPHOT_FILES: {:d}/{:d} files done".format(ndone,
+                                                                     nfiles))
+
+    return(result)
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.1.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: .npy header sized from the dtype, too long strings and
+                  inconsistent CSV rows raise errors, delimiter passed on
+    - 2026-10-18: non-ASCII text in CSV files read as unicode instead of
+                  failing in the conversion to bytes
+
+
+NOTES:
+    - catalogs are read chunk_size rows at a time, so the memory use only
+      depends on the chunk size and not on the size of the file
+    - IPAC tables are fixed-width: the rows of a chunk are put into one
+      byte array and every column is cut out as a whole and converted with
+      numpy, without a Python loop over the rows. The column boundaries are
+      given by the | of the header (like the default of astropy.io.ascii)
+    - CSV files need a header line with the column names; numeric columns
+      are detected from the first chunk
+    - null values (IPAC null definition, 'null', empty fields) become NaN in
+      numeric columns. A non-numeric value in a numeric column or a row with
+      the wrong number of fields raises an IOError naming the row
+    - write_catalog_chunks writes .npy files with a header that is sized for
+      the dtype and any number of rows (padded to a multiple of 64 bytes) and
+      updated with the final number of rows at the end, so the output can be
+      written incrementally and read with np.load. String columns have the
+      width they have in the first chunk (or str_width, if larger); longer
+      strings in later chunks raise a ValueError instead of being cut. CSV
+      output is several times slower because every float has to be formatted
+      as text
+
+TO-DO:
+    -
+"""
+
+
+import csv
+import itertools
+
+import numpy as np
+
+from .flux_conversions import filter_codes
+from .wise import mag2jansky_batch
+
+
+_IPAC_NULLS = (b"null", b"NULL", b"")
+
+# --- the header is aligned to this many bytes (like numpy's own files)
+_NPY_HEADER_ALIGN = 64
+
+# --- number of rows used to reserve the header space
+_NPY_MAX_ROWS = 10**18
+
+
+def _read_ipac_header(f):
+    """
+    Read the header of an IPAC table from the binary file f and return the
+    column names, the column boundaries, whether the columns are character
+    columns and the null values
+    """
+
+    bars = []
+
+    while True:
+        pos = f.tell()
+        line = f.readline()
+
+        if not line:
+            break
+
+        line = line.rstrip(b"\r\n")
+
+        if line.startswith(b"\\"):
+            continue
+        elif line.startswith(b"|"):
+            bars.append(line)
+        else:
+            f.seek(pos)
+            break
+
+    if len(bars) == 0:
+        raise IOError("CATALOG_STREAM: no IPAC column header found")
+
+    bounds = [i for i, c in enumerate(bars[0]) if c == ord("|")]
+
+    def _fields(line):
+        return([line[a+1:b].strip(b" -").decode()
+                for a, b in zip(bounds[:-1], bounds[1:])])
+
+    names = _fields(bars[0])
+    ncol = len(names)
+
+    types = _fields(bars[1]) if len(bars) > 1 else ["double"] * ncol
+    ischar = [t.lower().startswith(("c", "da")) for t in types]
+
+    if len(bars) > 3:
+        nulls = [bars[3][a+1:b].strip()
+                 for a, b in zip(bounds[:-1], bounds[1:])]
+    else:
+        nulls = [b"null"] * ncol
+
+    return(names, list(zip(bounds[:-1], bounds[1:])), ischar, nulls)
+
+
+def _to_float(vals, null=None):
+    """
+    Convert an array of byte or unicode strings to float, null values to NaN
+    """
+
+    # --- fast path for columns without null values
+    try:
+        return(vals.astype(float))
+    except ValueError:
+        pass
+
+    vals = np.char.strip(vals)
+    nulls = _IPAC_NULLS + ((null,) if null is not None else ())
+
+    if vals.dtype.kind == "U":
+        nulls = tuple(n.decode() for n in nulls)
+
+    bad = np.isin(vals, nulls)
+
+    if np.any(bad):
+        vals = np.where(bad, "nan" if vals.dtype.kind == "U" else b"nan",
+                        vals)
+
+    return(vals.astype(float))
+
+
+def _iter_ipac(fname, columns, chunk_size):
+
+    with open(fname, "rb") as f:
+
+        names, bounds, ischar, nulls = _read_ipac_header(f)
+
+        if columns is None:
+            columns = names
+
+        idx = []
+        for col in columns:
+            if col not in names:
+                raise KeyError("CATALOG_STREAM: unknown column " + str(col))
+            idx.append(names.index(col))
+
+        width = bounds[-1][1]
+
+        while True:
+            lines = [l.rstrip(b"\r\n") for l in itertools.islice(f,
+                                                                 chunk_size)]
+            if len(lines) == 0:
+                break
+
+            # --- all rows of the chunk as one (n_rows, width) byte array
+            block = np.array(lines, dtype="S" + str(width))
+            raw = block.view(np.uint8).reshape(len(lines), width)
+
+            chunk = {}
+
+            for col, i in zip(columns, idx):
+                a, b = bounds[i]
+                field = np.ascontiguousarray(raw[:, a+1:b]).view(
+                    "S" + str(b - a - 1)).ravel()
+
+                if ischar[i]:
+                    chunk[col] = np.char.strip(field).astype(str)
+                else:
+                    chunk[col] = _to_float(field, nulls[i])
+
+            yield(chunk)
+
+
+def _raise_not_numeric(vals, col, nread):
+    """
+    Raise an IOError naming the first row of vals that is not a number
+    (after the rows already read)
+    """
+
+    for j, val in enumerate(vals):
+        try:
+            _to_float(np.array([val]))
+        except ValueError:
+            raise IOError("CATALOG_STREAM: row " + str(nread + j + 1)
+                          + ": value " + repr(str(val)) + " of numeric "
+                          + "column " + str(col) + " is not a number")
+
+    raise IOError("CATALOG_STREAM: numeric column " + str(col) + " has "
+                  + "values that are not numbers")
+
+
+def _iter_csv(fname, columns, chunk_size, delimiter):
+
+    with open(fname, "r", newline="") as f:
+
+        reader = csv.reader(f, delimiter=delimiter)
+        names = [n.strip() for n in next(reader)]
+
+        if columns is None:
+            columns = names
+
+        idx = []
+        for col in columns:
+            if col not in names:
+                raise KeyError("CATALOG_STREAM: unknown column " + str(col))
+            idx.append(names.index(col))
+
+        numeric = None
+        nread = 0
+
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+
+            if len(rows) == 0:
+                break
+
+            # --- rows are counted from 1 for the first row after the header
+            for j, row in enumerate(rows):
+                if len(row) != len(names):
+                    raise IOError("CATALOG_STREAM: row " + str(nread + j + 1)
+                                  + " has " + str(len(row)) + " fields, "
+                                  + "expected " + str(len(names)))
+
+            fields = list(zip(*rows))
+            chunk = {}
+
+            # --- decide once from the first chunk which columns are numeric
+            first = numeric is None
+            if first:
+                numeric = []
+
+            for k, (col, i) in enumerate(zip(columns, idx)):
+                # --- unicode, the csv module already decoded the text
+                vals = np.array(fields[i], dtype=str)
+
+                if first or numeric[k]:
+                    try:
+                        chunk[col] = _to_float(vals)
+                    except ValueError:
+                        if not first:
+                            _raise_not_numeric(vals, col, nread)
+                        chunk[col] = vals
+                    if first:
+                        numeric.append(chunk[col].dtype.kind == "f")
+                else:
+                    chunk[col] = vals
+
+            nread += len(rows)
+
+            yield(chunk)
+
+
+def iter_catalog_chunks(fname, columns=None, chunk_size=100000, fmt=None,
+                        codes=None, delimiter=","):
+    """
+    Read a catalog (IPAC table or CSV) chunk by chunk
+
+    Parameters
+    ----------
+    fname : TYPE str
+        DESCRIPTION. Catalog file
+    columns : TYPE list of str, optional
+        DESCRIPTION. The default is None. Columns to read (default: all)
+    chunk_size : TYPE int, optional
+        DESCRIPTION. The default is 100000. Number of rows per chunk
+    fmt : TYPE str, optional
+        DESCRIPTION. The default is None. 'ipac' or 'csv'. By default from
+        the file extension (.csv is CSV, everything else IPAC)
+    codes : TYPE list of str, optional
+        DESCRIPTION. The default is None. Columns with filter names that are
+        returned as integer filter codes (see flux_conversions.filter_codes)
+    delimiter : TYPE str, optional
+        DESCRIPTION. The default is ",". Delimiter of CSV files
+
+    Yields
+    ------
+    dict: column name: array with up to chunk_size rows, float for numeric
+        columns (NaN for null values), str for character columns
+
+    """
+
+    if fmt is None:
+        fmt = "csv" if fname.lower().endswith(".csv") else "ipac"
+
+    if fmt == "csv":
+        chunks = _iter_csv(fname, columns, chunk_size, delimiter)
+    else:
+        chunks = _iter_ipac(fname, columns, chunk_size)
+
+    for chunk in chunks:
+        for col in codes if codes is not None else []:
+            chunk[col] = filter_codes(chunk[col])
+
+        yield(chunk)
+
+
+def _npy_header(dtype, nrows, size=None):
+    """
+    Return the .npy (version 1.0) header for nrows records of dtype. By
+    default it is padded to a multiple of 64 bytes large enough for any
+    number of rows, so that it can be rewritten in place with the same size
+    """
+
+    def _dict(n):
+        return(repr({"descr": np.lib.format.dtype_to_descr(dtype),
+                     "fortran_order": False, "shape": (n,)}))
+
+    if size is None:
+        size = 10 + len(_dict(_NPY_MAX_ROWS)) + 1
+        size = -(-size // _NPY_HEADER_ALIGN) * _NPY_HEADER_ALIGN
+
+    header = _dict(nrows)
+    hlen = size - 10
+
+    if len(header) + 1 > hlen or hlen > 65535:
+        raise ValueError("CATALOG_STREAM: the .npy header of the dtype "
+                         + "does not fit into " + str(size) + " bytes")
+
+    header = header.ljust(hlen - 1) + "\n"
+
+    return(b"\x93NUMPY\x01\x00" + np.uint16(hlen).astype("<u2").tobytes()
+           + header.encode("latin1"))
+
+
+def _str_dtype(dtype, str_width):
+    """
+    Return the string dtype dtype widened to at least str_width characters
+    """
+
+    if dtype.kind not in "SU" or str_width is None:
+        return(dtype)
+
+    nchar = dtype.itemsize // (4 if dtype.kind == "U" else 1)
+
+    return(np.dtype(dtype.kind + str(max(nchar, str_width))))
+
+
+def _check_width(col, dtype, name, nrows):
+    """
+    Raise a ValueError if the strings of col do not fit into dtype
+    """
+
+    if col.dtype.kind not in "SU" or dtype.kind not in "SU":
+        return
+
+    width = dtype.itemsize // (4 if dtype.kind == "U" else 1)
+    lens = np.char.str_len(col)
+
+    if np.any(lens > width):
+        j = int(np.argmax(lens > width))
+        raise ValueError("CATALOG_STREAM: string in column " + name
+                         + ", row " + str(nrows + j + 1) + " is longer than "
+                         + "the column width " + str(width)
+                         + " (set str_width)")
+
+
+def write_catalog_chunks(chunks, outname, delimiter=",", str_width=None):
+    """
+    Write chunks (dicts of columns of equal length) incrementally into a .npy
+    file (as a structured array) or a CSV file (by the extension of outname)
+
+    Parameters
+    ----------
+    chunks : TYPE iterable of dict
+        DESCRIPTION. Chunks, e.g., from iter_catalog_chunks
+    outname : TYPE str
+        DESCRIPTION. Output file (.npy or .csv)
+    delimiter : TYPE str, optional
+        DESCRIPTION. The default is ",". Delimiter of CSV files
+    str_width : TYPE int, optional
+        DESCRIPTION. The default is None. Minimum width of the string columns
+        of .npy files (default: the width in the first chunk). Longer strings
+        in later chunks raise a ValueError
+
+    Returns
+    -------
+    int: number of rows written
+
+    """
+
+    tocsv = outname.lower().endswith(".csv")
+    nrows = 0
+    dtype = None
+
+    with open(outname, "w" if tocsv else "wb",
+              **({"newline": ""} if tocsv else {})) as f:
+
+        for chunk in chunks:
+
+            names = list(chunk.keys())
+            cols = [np.asarray(chunk[n]) for n in names]
+
+            if tocsv:
+                if nrows == 0:
+                    f.write(delimiter.join(names) + "\n")
+
+                strcols = [c.astype(str) for c in cols]
+
+                # --- quoting is only needed for strings with delimiters
+                if any(c.dtype.kind == "U" and np.any(np.char.find(
+                        c, delimiter) >= 0) for c in cols):
+                    csv.writer(f, delimiter=delimiter).writerows(
+                        zip(*strcols))
+                else:
+                    f.write("\n".join(delimiter.join(row)
+                                       for row in zip(*strcols)) + "\n")
+
+            else:
+                if dtype is None:
+                    dtype = np.dtype([(n, _str_dtype(c.dtype, str_width))
+                                      for n, c in zip(names, cols)])
+                    header = _npy_header(dtype, 0)
+                    f.write(header)
+
+                rec = np.empty(len(cols[0]), dtype=dtype)
+                for n, c in zip(names, cols):
+                    _check_width(c, dtype[n], n, nrows)
+                    rec[n] = c
+
+                f.write(rec.tobytes())
+
+            nrows += len(cols[0])
+
+        # --- now that the number of rows is known, complete the header
+        if not tocsv and dtype is not None:
+            f.seek(0)
+            f.write(_npy_header(dtype, nrows, size=len(header)))
+
+    return(nrows)
+
+
+def wise_fluxes(chunk, mags=("w1mpro", "w2mpro", "w3mpro", "w4mpro"),
+                errs=("w1sigmpro", "w2sigmpro", "w3sigmpro", "w4sigmpro"),
+                keep=(), cc=False, w4cor=True):
+    """
+    Convert the WISE magnitudes of a catalog chunk into flux densities [Jy]
+    with wise.mag2jansky_batch. Returns a chunk with the columns in keep
+    and W1..W4 and W1_err..W4_err (if errs is not None)
+    """
+
+    m = np.column_stack([chunk[c] for c in mags])
+
+    out = {c: chunk[c] for c in keep}
+
+    if errs is None:
+        flux = mag2jansky_batch(m, cc=cc, w4cor=w4cor)
+    else:
+        e = np.column_stack([chunk[c] for c in errs])
+        flux, ferr = mag2jansky_batch(m, e, cc=cc, w4cor=w4cor)
+
+    for i in range(4):
+        out["W" + str(i+1)] = flux[:, i]
+
+    if errs is not None:
+        for i in range(4):
+            out["W" + str(i+1) + "_err"] = ferr[:, i]
+
+    return(out)
+
+
+def convert_catalog(fname, outname, func=wise_fluxes, columns=None,
+                    chunk_size=100000, fmt=None, codes=None, delimiter=",",
+                    str_width=None, **kwargs):
+    """
+    Stream a catalog through a conversion function into an output file with
+    flat memory use: read a chunk, convert it with func(chunk, **kwargs)
+    (returning a dict of output columns) and append it to outname (.npy or
+    .csv). See iter_catalog_chunks for the reading and write_catalog_chunks
+    for the writing parameters (delimiter is used for both)
+
+    Returns
+    -------
+    int: number of rows written
+
+    """
+
+    chunks = iter_catalog_chunks(fname, columns=columns,
+                                 chunk_size=chunk_size, fmt=fmt, codes=codes,
+                                 delimiter=delimiter)
+
+    return(write_catalog_chunks((func(c, **kwargs) for c in chunks),
+                                outname, delimiter=delimiter,
+                                str_width=str_width))
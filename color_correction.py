@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.2"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: unevenly spaced slope grids interpolated correctly,
+                  alpha_from_ratio returns NaN for unknown filters
+    - 2026-10-18: filter names resolved in a user library (library or the
+                  one set with filter_library.set_default_library)
+
+
+NOTES:
+    - the color correction of a filter for a power law source spectrum
+      snu = wlen**(-1*alpha) (same convention as the alpha of synthphot) is
+      K(alpha) = synthphot(source) / snu(ref_wlen), i.e., the ratio of the
+      synthetic (quoted) flux density to the true monochromatic flux density
+      at the reference wavelength. The true flux density is flux / K. K = 1
+      for the power law the filter is calibrated on (its own alpha)
+    - the factors are computed once per filter on a dense grid of slopes with
+      synthphot_batch (all power laws of a filter in one call) and stored as
+      a table; catalogs with a slope and a filter per row are corrected with
+      one vectorized linear interpolation in that table (np.searchsorted,
+      so the slope grid does not need to be evenly spaced)
+    - the slope of a source can be derived from the ratio of the quoted flux
+      densities in two filters (like the colors in wise.mag2jansky) by
+      inverting the tabulated model flux ratio
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+
+from .filter_curve import Filter
+from .filter_library import FilterLibrary, get_filter
+from .synthphot import synthphot_batch
+
+
+class ColorCorrectionTable:
+    """
+    Color correction factors of a set of filters tabulated on a grid of
+    power law slopes
+
+    Parameters
+    ----------
+    filters : TYPE list of Filter or str
+        DESCRIPTION. Filters as Filter objects, (fwlen, ftrans, ref_wlen[,
+        alpha]) tuples or names in library
+    alphas : TYPE float array, optional
+        DESCRIPTION. The default is None (np.linspace(-5, 5, 401)). Slopes of
+        the power law source spectra snu = wlen**(-1*alpha), sorted and
+        without duplicates
+    npts : TYPE int, optional
+        DESCRIPTION. The default is 2001. Number of wavelengths of the power
+        law spectra across each filter
+    library : TYPE str or FilterLibrary, optional
+        DESCRIPTION. The default is None (the library set with
+        filter_library.set_default_library). Filter library written with
+        write_filter_library in which filter names are looked up
+
+    """
+
+    def __init__(self, filters=None, alphas=None, npts=2001, library=None):
+
+        if filters is None:
+            return
+
+        if alphas is None:
+            alphas = np.linspace(-5, 5, 401)
+
+        if library is None:
+            lookup = get_filter
+        elif isinstance(library, FilterLibrary):
+            lookup = library.get
+        else:
+            lookup = FilterLibrary(library).get
+
+        filters = [lookup(f) if isinstance(f, str)
+                   else f if isinstance(f, Filter) else Filter(*f)
+                   for f in filters]
+
+        self.alphas = np.unique(np.asarray(alphas, dtype=float))
+        self.names = np.array([f.name if f.name is not None else str(i)
+                               for i, f in enumerate(filters)], dtype=str)
+        self.ref_wlen = np.array([f.ref_wlen for f in filters], dtype=float)
+
+        self.kfac = np.full((len(filters), len(self.alphas)), np.nan)
+
+        for i, filt in enumerate(filters):
+
+            # --- all power laws on one grid across the filter
+            wlen = np.linspace(filt.fwlen[0], filt.fwlen[-1], npts)
+            spectra = (wlen[None, :]
+                       / filt.ref_wlen)**(-1*self.alphas[:, None])
+
+            synflux = synthphot_batch(wlen, spectra, filt)
+
+            if np.isscalar(synflux) and synflux == -1:
+                print("COLOR_CORRECTION: ERROR filter " + self.names[i]
+                      + " could not be evaluated. Its factors are NaN")
+                continue
+
+            # --- the power laws are normalized to 1 at ref_wlen
+            self.kfac[i] = synflux
+
+    def __repr__(self):
+        return("ColorCorrectionTable(filters={}, alpha={}..{}, n_alpha={})"
+               .format(list(self.names), self.alphas[0], self.alphas[-1],
+                       len(self.alphas)))
+
+    def _index(self, filt):
+        """
+        Return the table row(s) of filter name(s) or index(es) filt, -1 for
+        unknown names
+        """
+
+        filt = np.asarray(filt)
+
+        if filt.dtype.kind in "iu":
+            return(filt.astype(int))
+
+        rows = {n: i for i, n in enumerate(self.names)}
+        uniq, inverse = np.unique(filt.astype(str), return_inverse=True)
+        idx = np.array([rows.get(u, -1) for u in uniq], dtype=int)
+
+        if np.any(idx == -1):
+            print("COLOR_CORRECTION: ERROR unknown filter(s): "
+                  + ", ".join(uniq[idx == -1]) + ". Returning NaN for them")
+
+        return(idx[inverse].reshape(filt.shape))
+
+    def factor(self, alpha, filt):
+        """
+        Return the color correction factor(s) K for the slope(s) alpha and
+        the filter(s) filt (names or indices), broadcast against each other.
+        NaN outside the slope grid or for unknown filters
+        """
+
+        alpha = np.asarray(alpha, dtype=float)
+        row = self._index(filt)
+
+        alpha, row = np.broadcast_arrays(alpha, row)
+
+        # --- interval of the slope grid
+        na = len(self.alphas)
+
+        bad = ~((alpha >= self.alphas[0]) & (alpha <= self.alphas[-1])) \
+            | (row < 0) | (row >= len(self.names))
+
+        alpha = np.where(bad, self.alphas[0], alpha)
+        row = np.where(bad, 0, row)
+
+        i0 = np.clip(np.searchsorted(self.alphas, alpha, side="right") - 1,
+                     0, na - 2)
+        t = (alpha - self.alphas[i0]) / (self.alphas[i0+1] - self.alphas[i0])
+
+        kfac = (1 - t) * self.kfac[row, i0] + t * self.kfac[row, i0 + 1]
+
+        return(np.where(bad, np.nan, kfac))
+
+    def correct(self, flux, alpha, filt):
+        """
+        Return the color corrected flux densities flux / K(alpha) for the
+        quoted flux densities flux in the filter(s) filt of sources with the
+        power law slope(s) alpha
+        """
+
+        return(np.asarray(flux) / self.factor(alpha, filt))
+
+    __call__ = correct
+
+    def alpha_from_ratio(self, ratio, filt1, filt2):
+        """
+        Return the power law slope(s) of sources with the quoted flux density
+        ratio(s) ratio = flux1 / flux2 in the filters filt1 and filt2 (one
+        name or index each). NaN outside the range of the slope grid or for
+        unknown filters
+        """
+
+        i1 = int(self._index(filt1))
+        i2 = int(self._index(filt2))
+
+        if min(i1, i2) < 0 or max(i1, i2) >= len(self.names):
+            return(np.full(np.shape(ratio), np.nan)[()])
+
+        # --- quoted flux ratio of the power laws over the slope grid
+        model = self.kfac[i1] / self.kfac[i2] \
+            * (self.ref_wlen[i1] / self.ref_wlen[i2])**(-1*self.alphas)
+
+        id = np.argsort(model)
+
+        return(np.interp(ratio, model[id], self.alphas[id], left=np.nan,
+                         right=np.nan))
+
+    def save(self, fname):
+        """
+        Store the table in an .npz file
+        """
+
+        np.savez(fname, alphas=self.alphas, names=self.names,
+                 ref_wlen=self.ref_wlen, kfac=self.kfac)
+
+    @classmethod
+    def load(cls, fname):
+        """
+        Load a table stored with save
+        """
+
+        ct = cls()
+
+        with np.load(fname, allow_pickle=False) as f:
+            ct.alphas = f["alphas"]
+            ct.names = f["names"]
+            ct.ref_wlen = f["ref_wlen"]
+            ct.kfac = f["kfac"]
+
+        return(ct)
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.1.1"
 
 """
 HISTORY:
     - 2020-01-15: created by Daniel Asmus
+    - 2026-10-18: grouped, vectorized version combine_measurements_grouped
+    - 2026-10-18: empty input returns empty arrays
 
 
 NOTES:
-    -
+    - combine_measurements_grouped sorts the measurements by group once and
+      evaluates all groups with segment reductions (np.add.reduceat etc.)
+      following the same rules as combine_measurements
 
 TO-DO:
     -
@@ -169,3 +173,165 @@ def combine_measurements(vals, errs=None, flags=None):
 
 
 
+def combine_measurements_grouped(vals, errs=None, flags=None, groups=None):
+
+    """
+    Combine the measurements of many quantities at once. The measurements are
+    given as flat arrays together with the group (quantity, object, ...) each
+    one belongs to and every group is combined like combine_measurements
+    combines one quantity: upper (flag=1), lower (flag=2) limits and "not
+    measured" (flag -1) with detections (flag=0)
+
+    Parameters
+    ----------
+    vals : TYPE float array
+        DESCRIPTION. Measured values
+    errs : TYPE float array, optional
+        DESCRIPTION. The default is None (all 0). Errors of the values
+    flags : TYPE int array, optional
+        DESCRIPTION. The default is None (all 0). Flags of the values
+    groups : TYPE array, optional
+        DESCRIPTION. The default is None (one group). Group id of every
+        measurement
+
+    Returns
+    -------
+    array: sorted unique group ids
+    float array: combined value per group
+    float array: combined error per group
+    array: combined flag per group
+    int array: warning code per group: 0 none, 1 non-valid errors set to
+        zero, 2 weighted mean of detections larger than upper limit,
+        3 weighted mean of detections smaller than lower limit, -1 no valid
+        measurement (value 0, error 0, flag -1), -2 only "not measured" and
+        invalid measurements (value and error NaN, flag -1; here
+        combine_measurements returns None)
+
+    """
+
+    vals = np.asarray(vals, dtype=float)
+    nm = len(vals)
+
+    errs = np.zeros(nm) if errs is None else np.asarray(errs, dtype=float)
+    flags = np.zeros(nm, dtype=int) if flags is None else np.asarray(flags)
+    groups = np.zeros(nm, dtype=int) if groups is None \
+        else np.asarray(groups)
+
+    # --- no measurements: no groups
+    if nm == 0:
+        return(groups[:0], np.zeros(0), np.zeros(0),
+               np.zeros(0, dtype=np.result_type(flags.dtype, int)),
+               np.zeros(0, dtype=int))
+
+    # --- sort by group and find the segments
+    order = np.argsort(groups, kind="stable")
+    g = groups[order]
+    v = vals[order]
+    e = errs[order]
+    f = flags[order]
+
+    starts = np.flatnonzero(np.concatenate([[True], g[1:] != g[:-1]]))
+    ids = g[starts]
+    counts = np.diff(np.append(starts, nm))
+    ng = len(starts)
+    seg = np.repeat(np.arange(ng), counts)
+
+    def _sum(x):
+        return(np.add.reduceat(x, starts))
+
+    # --- replace invalid (non-present errors with 0):
+    ebad = ~np.isfinite(e)
+    anyebad = _sum(ebad.astype(int)) > 0
+    e = np.where(ebad, 0, e)
+
+    # --- valid measurements per category
+    valid = np.isfinite(v) & (f >= -1) & (f <= 2)
+    det = valid & (f == 0)
+    upp = valid & (f == 1)
+    low = valid & (f == 2)
+
+    nvalid = _sum(valid.astype(int))
+    nd = _sum(det.astype(int))
+    nu = _sum(upp.astype(int))
+    nl = _sum(low.astype(int))
+    nn = _sum((valid & (f == -1)).astype(int))
+
+    # --- most constraining upper (lowest) and lower (highest) limits
+    minval = np.minimum.reduceat(np.where(upp, v, np.inf), starts)
+    maxval = np.maximum.reduceat(np.where(low, v, -np.inf), starts)
+
+    # --- weighted mean and STDDEV of the detections, unit weights if any
+    #     detection has a zero error
+    unit = np.minimum.reduceat(np.where(det, e, np.inf), starts) == 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(det, np.where(unit[seg], 1.0, 1.0 / e**2), 0)
+        vd = np.where(det, v, 0)
+
+        sw = _sum(w)
+        mean = _sum(w * vd) / sw
+        std = np.sqrt(_sum(w * (vd - mean[seg])**2) / sw)
+
+    # --- a single detection is taken as it is
+    last = np.maximum.reduceat(np.where(det, np.arange(nm), -1), starts)
+    one = nd == 1
+    mean[one] = v[last[one]]
+    std[one] = e[last[one]]
+
+    # --- now the cases of combine_measurements
+    val = np.full(ng, np.nan)
+    err = np.full(ng, np.nan)
+    flag = np.full(ng, -1, dtype=np.result_type(flags.dtype, int))
+    warn = np.full(ng, -2, dtype=int)
+
+    hasdet = nd > 0
+    val[hasdet] = mean[hasdet]
+    err[hasdet] = std[hasdet]
+    flag[hasdet] = 0
+
+    with np.errstate(invalid="ignore"):
+        above = hasdet & (nu > 0) & (mean - std > minval)
+        below = hasdet & (nl > 0) & (mean + std < maxval)
+
+    code = np.where(below, 3, np.where(above, 2, np.where(anyebad, 1, 0)))
+    warn[hasdet] = code[hasdet]
+
+    onlyup = ~hasdet & (nu > 0)
+    val[onlyup] = minval[onlyup]
+    err[onlyup] = 0
+    flag[onlyup] = 1
+    warn[onlyup] = 0
+
+    onlylow = ~hasdet & (nu == 0) & (nl > 0)
+    val[onlylow] = maxval[onlylow]
+    err[onlylow] = 0
+    flag[onlylow] = 2
+    warn[onlylow] = 0
+
+    # --- 1. all not measured: retun 0,0,-1
+    allnm = nn == counts
+    val[allnm] = 0
+    err[allnm] = 0
+    flag[allnm] = -1
+    warn[allnm] = 0
+
+    # --- no valid measurement at all
+    novalid = nvalid == 0
+    val[novalid] = 0
+    err[novalid] = 0
+    flag[novalid] = -1
+    warn[novalid] = -1
+
+    if np.any(novalid & (counts > 1)):
+        print("COMBINE_MEASUREMENTS: ERROR no valid measurement provided "
+              + "for " + str(np.sum(novalid & (counts > 1))) + " group(s)")
+
+    # --- single measurements are returned as they are
+    single = counts == 1
+    val[single] = v[starts[single]]
+    err[single] = errs[order][starts[single]]
+    flag[single] = f[starts[single]]
+    warn[single] = 0
+
+    return(ids, val, err, flag, warn)
+
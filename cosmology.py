@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+
+
+NOTES:
+    - the comoving distance is integrated once on a dense grid in ln(1+z)
+      (Simpson per interval, i.e., with the integrand also evaluated at the
+      interval centres) and tabulated as D_C(z) / z, which is smooth and
+      finite at z = 0, so that linear interpolation stays accurate down to
+      very small redshifts
+    - matter, curvature and dark energy (cosmological constant) are
+      included, radiation is neglected (like astropy for Tcmb0 = 0)
+    - on construction the table is compared to the exact integral
+      (scipy.integrate.quad) at a set of redshifts; the largest relative
+      deviation is stored in max_rel_error
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+from scipy.integrate import quad
+
+
+SPEED_OF_LIGHT_KMS = 2.99792458e5  # km/s
+
+
+class DistanceTable:
+    """
+    Tabulated luminosity distance d_L(z) in [Mpc] for a Lambda-CDM cosmology.
+    Use get_distance_table to get the (cached) table for a cosmology and
+    lum_dist to evaluate it for arrays of redshifts
+
+    Parameters
+    ----------
+    H0 : TYPE float, optional
+        DESCRIPTION. The default is 70. Hubble constant in [km/s/Mpc]
+    Om0 : TYPE float, optional
+        DESCRIPTION. The default is 0.3. Matter density parameter
+    Ode0 : TYPE float, optional
+        DESCRIPTION. The default is None. Dark energy density parameter. By
+        default 1 - Om0 (flat)
+    zmax : TYPE float, optional
+        DESCRIPTION. The default is 20. Largest redshift of the table
+    npts : TYPE int, optional
+        DESCRIPTION. The default is 4097. Number of grid points
+
+    """
+
+    def __init__(self, H0=70.0, Om0=0.3, Ode0=None, zmax=20.0, npts=4097):
+
+        if Ode0 is None:
+            Ode0 = 1.0 - Om0
+
+        self.H0 = float(H0)
+        self.Om0 = float(Om0)
+        self.Ode0 = float(Ode0)
+        self.Ok0 = 1.0 - self.Om0 - self.Ode0
+        self.zmax = float(zmax)
+
+        # --- grid in u = ln(1+z); dz / E(z) = (1+z) du / E(z)
+        u = np.linspace(0, np.log1p(self.zmax), npts)
+        h = u[1] - u[0]
+
+        f = self._integrand(u)
+        fmid = self._integrand(u[:-1] + 0.5 * h)
+
+        dc = np.concatenate([[0], np.cumsum(h / 6 * (f[:-1] + 4 * fmid
+                                                     + f[1:]))])
+
+        z = np.expm1(u)
+
+        # --- D_C / z in units of the Hubble distance; 1 / E(0) = 1 at z = 0
+        ratio = np.ones(npts)
+        ratio[1:] = dc[1:] / z[1:]
+
+        self.u = u
+        self.ratio = ratio
+
+        self.max_rel_error = self.check_accuracy()
+
+    def __repr__(self):
+        return("DistanceTable(H0={}, Om0={}, Ode0={}, zmax={})".format(
+            self.H0, self.Om0, self.Ode0, self.zmax))
+
+    @property
+    def hubble_dist(self):
+        """
+        Hubble distance c / H0 in [Mpc]
+        """
+        return(SPEED_OF_LIGHT_KMS / self.H0)
+
+    def _efunc(self, z):
+        zp1 = 1.0 + z
+        return(np.sqrt(self.Om0 * zp1**3 + self.Ok0 * zp1**2 + self.Ode0))
+
+    def _integrand(self, u):
+        z = np.expm1(u)
+        return((1.0 + z) / self._efunc(z))
+
+    def _transverse(self, dc):
+        """
+        Transverse comoving distance for the comoving distance dc, both in
+        units of the Hubble distance
+        """
+
+        if self.Ok0 > 0:
+            sk = np.sqrt(self.Ok0)
+            return(np.sinh(sk * dc) / sk)
+        elif self.Ok0 < 0:
+            sk = np.sqrt(-self.Ok0)
+            return(np.sin(sk * dc) / sk)
+
+        return(dc)
+
+    def lum_dist(self, z):
+        """
+        Return the luminosity distance in [Mpc] for the redshift(s) z. NaN is
+        returned for redshifts outside 0 <= z <= zmax
+        """
+
+        z = np.asarray(z, dtype=float)
+
+        outside = (z < 0) | (z > self.zmax)
+
+        if np.any(outside):
+            print("DISTANCE_TABLE: ERROR redshift(s) outside 0 <= z <= "
+                  + str(self.zmax) + ". Returning NaN for them")
+
+        dc = z * np.interp(np.log1p(np.where(outside, 0, z)), self.u,
+                           self.ratio)
+
+        dl = (1.0 + z) * self._transverse(dc) * self.hubble_dist
+
+        return(np.where(outside, np.nan, dl))
+
+    def lum_dist_exact(self, z):
+        """
+        Return the luminosity distance in [Mpc] for the redshift(s) z from the
+        numerical integration of every redshift (slow, for reference)
+        """
+
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+
+        dc = np.array([quad(lambda x: 1.0 / self._efunc(x), 0, zi,
+                            epsabs=0, epsrel=1e-12)[0] for zi in z])
+
+        return((1.0 + z) * self._transverse(dc) * self.hubble_dist)
+
+    def check_accuracy(self, z=None):
+        """
+        Return the largest relative deviation of the table from the exact
+        integral at the redshifts z (default: 64 redshifts spread
+        logarithmically from 1e-5 to zmax)
+        """
+
+        if z is None:
+            z = np.geomspace(1e-5, self.zmax, 64)
+
+        exact = self.lum_dist_exact(z)
+
+        return(np.max(np.abs(self.lum_dist(z) / exact - 1)))
+
+    def save(self, fname):
+        """
+        Store the table in an .npz file
+        """
+
+        np.savez(fname, H0=self.H0, Om0=self.Om0, Ode0=self.Ode0,
+                 zmax=self.zmax, u=self.u, ratio=self.ratio,
+                 max_rel_error=self.max_rel_error)
+
+    @classmethod
+    def load(cls, fname):
+        """
+        Load a table stored with save
+        """
+
+        dt = cls.__new__(cls)
+
+        with np.load(fname, allow_pickle=False) as f:
+            dt.H0 = float(f["H0"])
+            dt.Om0 = float(f["Om0"])
+            dt.Ode0 = float(f["Ode0"])
+            dt.zmax = float(f["zmax"])
+            dt.u = f["u"]
+            dt.ratio = f["ratio"]
+            dt.max_rel_error = float(f["max_rel_error"])
+
+        dt.Ok0 = 1.0 - dt.Om0 - dt.Ode0
+
+        _tables[dt._key()] = dt
+
+        return(dt)
+
+    def _key(self):
+        return((self.H0, self.Om0, self.Ode0, self.zmax))
+
+
+# --- tables already built in this session, one per cosmology
+_tables = {}
+
+
+def get_distance_table(H0=70.0, Om0=0.3, Ode0=None, zmax=20.0):
+    """
+    Return the DistanceTable for the given cosmology, built on first use and
+    reused afterwards (tables loaded with DistanceTable.load are reused as
+    well). See DistanceTable for the parameters
+    """
+
+    if Ode0 is None:
+        Ode0 = 1.0 - Om0
+
+    key = (float(H0), float(Om0), float(Ode0), float(zmax))
+
+    if key not in _tables:
+        _tables[key] = DistanceTable(H0=H0, Om0=Om0, Ode0=Ode0, zmax=zmax)
+
+    return(_tables[key])
+
+
+def lum_dist(z, cosmo=None):
+    """
+    Return the luminosity distance in [Mpc] for the redshift(s) z in the
+    cosmology cosmo (a DistanceTable, default: flat with H0=70, Om0=0.3)
+    """
+
+    if cosmo is None:
+        cosmo = get_distance_table()
+
+    return(cosmo.lum_dist(z))
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.2.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: faster hits (signature computed once per function, sha256
+                  keys, memoized .npy headers); total size tracked instead
+                  of scanning the directory on every write
+    - 2026-10-18: keys include the versions of all modules of the package,
+                  sha256 also for the checksums (new entry format)
+
+
+NOTES:
+    - results are keyed by a sha256 hash (the fastest hashlib hash on CPUs
+      with SHA extensions) over the function name, the versions of all
+      loaded modules of this package and of the package of the function, and
+      the content of all (default-completed) arguments, so changed inputs or
+      a new version of any of the photometry code (e.g., synthphot or the
+      Filter interpolation it calls) never hit old entries. Hashing the
+      inputs is most of the cost of a hit; wavelength grids given as
+      SpectralAxis are hashed only once (their cached digest is used)
+    - every entry is one small file: an 8 byte magic string, the payload
+      length (uint64), a sha256 checksum of the payload (first 16 bytes) and
+      the result in .npy format. Truncated or corrupt entries fail the
+      checksum, are deleted and recomputed
+    - the modification time of an entry is updated on every hit; when the
+      cache grows beyond max_bytes the least recently used entries are
+      removed. The total size is counted by the cache object itself and the
+      directory is only scanned when that count exceeds max_bytes (which
+      also takes entries written by other processes into account)
+    - error messages of the wrapped functions are only printed when the
+      result is computed, a cached -1 is returned silently
+
+TO-DO:
+    -
+"""
+
+
+import functools
+import hashlib
+import inspect
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from .effective_wlen import effective_wlen
+from .filter_curve import Filter
+from .spectral_axis import SpectralAxis
+from .synthphot import synthphot, synthphot_freq
+
+
+_MAGIC = b"MISCDC02"
+_HEADER_SIZE = len(_MAGIC) + 8 + 16
+
+# --- parsed .npy headers of the payloads: header bytes: (dtype, shape, order)
+_npy_headers = {}
+_MAX_NPY_HEADERS = 1024
+
+
+def _load_payload(payload):
+    """
+    Return the array stored in the .npy bytes payload. The header is only
+    parsed once for every dtype and shape
+    """
+
+    if payload[6:8] != b"\x01\x00":
+        return(np.load(io.BytesIO(payload), allow_pickle=False))
+
+    hlen = int.from_bytes(payload[8:10], "little")
+    header = payload[10:10+hlen]
+
+    if header not in _npy_headers:
+        f = io.BytesIO(payload)
+        np.lib.format.read_magic(f)
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+
+        if dtype.hasobject:
+            raise ValueError("DISK_CACHE: object arrays are not supported")
+
+        if len(_npy_headers) >= _MAX_NPY_HEADERS:
+            _npy_headers.clear()
+
+        _npy_headers[header] = (dtype, shape, "F" if fortran else "C")
+
+    dtype, shape, order = _npy_headers[header]
+
+    count = int(np.prod(shape))
+    if len(payload) != 10 + hlen + count * dtype.itemsize:
+        raise ValueError("DISK_CACHE: payload size does not match header")
+
+    return(np.frombuffer(payload, dtype=dtype, count=count,
+                         offset=10+hlen).reshape(shape, order=order).copy())
+
+
+def _checksum(payload):
+    """
+    Return the 16 byte checksum of the payload of an entry
+    """
+
+    return(hashlib.sha256(payload).digest()[:16])
+
+
+def _package_versions(modname):
+    """
+    Return the sorted (name, __version__) of all loaded modules of the
+    package of the module modname and of this package
+    """
+
+    pkgs = {modname.partition(".")[0], __name__.partition(".")[0]}
+
+    return(sorted((name, str(getattr(mod, "__version__", "")))
+                  for name, mod in list(sys.modules.items())
+                  if mod is not None and name.partition(".")[0] in pkgs))
+
+
+def _update_hash(h, value):
+    """
+    Feed the content of an argument into the hash h. Returns False for
+    arguments whose content cannot be hashed reliably
+    """
+
+    if isinstance(value, SpectralAxis):
+        h.update(repr(value.digest).encode())
+
+    elif isinstance(value, Filter):
+        for v in (value.fwlen, value.ftrans, value.ref_wlen, value.alpha):
+            _update_hash(h, v)
+
+    elif isinstance(value, np.ndarray) or np.isscalar(value) \
+            or value is None:
+
+        if isinstance(value, str) or value is None:
+            h.update(repr(value).encode())
+        else:
+            value = np.ascontiguousarray(value)
+
+            if value.dtype.hasobject:
+                return(False)
+
+            h.update(repr((value.dtype.str, value.shape)).encode())
+            h.update(value.view(np.uint8))
+
+    elif isinstance(value, (list, tuple)):
+        h.update(repr((type(value).__name__, len(value))).encode())
+
+        for v in value:
+            if not _update_hash(h, v):
+                return(False)
+
+    else:
+        return(False)
+
+    return(True)
+
+
+class DiskCache:
+    """
+    Persistent, size-bounded result cache for expensive photometry calls.
+    The memoized versions of synthphot, synthphot_freq and effective_wlen
+    are available as attributes, e.g.,
+
+        cache = DiskCache("~/.cache/miscellaneous")
+        flux = cache.synthphot(wavelen, fluxden, fwlen, ftrans, ref_wlen)
+
+    and other functions returning numbers or arrays can be wrapped with
+    memoize
+
+    Parameters
+    ----------
+    directory : TYPE str
+        DESCRIPTION. Directory of the cache files (created if necessary)
+    max_bytes : TYPE int, optional
+        DESCRIPTION. The default is 256 MB. Maximum total size of the cache
+        files
+
+    """
+
+    def __init__(self, directory, max_bytes=256*1024**2):
+
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # --- signature and hash of name and version of the memoized
+        #     functions
+        self._funcs = {}
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._size = int(self._entries()[1].sum())
+
+        self.synthphot = self.memoize(synthphot)
+        self.synthphot_freq = self.memoize(synthphot_freq)
+        self.effective_wlen = self.memoize(effective_wlen)
+
+    def __repr__(self):
+        return("DiskCache({}, max_bytes={})".format(self.directory,
+                                                   self.max_bytes))
+
+    def _path(self, key):
+        return(os.path.join(self.directory, key + ".bin"))
+
+    def _entries(self):
+        """
+        Return the paths, sizes and modification times of all entries
+        """
+
+        paths = []
+        sizes = []
+        mtimes = []
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bin"):
+                st = entry.stat()
+                paths.append(entry.path)
+                sizes.append(st.st_size)
+                mtimes.append(st.st_mtime)
+
+        return(paths, np.array(sizes, dtype=np.int64), np.array(mtimes))
+
+    def size(self):
+        """
+        Return the total size of the cache files in bytes
+        """
+
+        self._size = int(self._entries()[1].sum())
+
+        return(self._size)
+
+    def __len__(self):
+        return(len(self._entries()[0]))
+
+    def _func_info(self, func):
+        """
+        Return the signature of func and the hash of its name and the
+        versions of the modules of its package, computed once per function
+        """
+
+        if func not in self._funcs:
+            h = hashlib.sha256()
+            h.update(repr((func.__module__, func.__qualname__,
+                           _package_versions(func.__module__))).encode())
+
+            self._funcs[func] = (inspect.signature(func), h)
+
+        return(self._funcs[func])
+
+    def key(self, func, args, kwargs):
+        """
+        Return the cache key of the call func(*args, **kwargs), or None if
+        the arguments cannot be hashed
+        """
+
+        sig, h = self._func_info(func)
+
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        h = h.copy()
+
+        for name, value in bound.arguments.items():
+            h.update(name.encode())
+
+            if not _update_hash(h, value):
+                return(None)
+
+        return(h.hexdigest())
+
+    def get(self, key):
+        """
+        Return the (result,) stored under key, or None if there is no valid
+        entry. Corrupt entries are deleted
+        """
+
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return(None)
+
+        magic = data[:len(_MAGIC)]
+        payload = data[_HEADER_SIZE:]
+
+        valid = (len(data) >= _HEADER_SIZE and magic == _MAGIC
+                 and int(np.frombuffer(data[len(_MAGIC):len(_MAGIC)+8],
+                                       dtype="<u8")[0]) == len(payload)
+                 and _checksum(payload) == data[len(_MAGIC)+8:_HEADER_SIZE])
+
+        if valid:
+            try:
+                res = _load_payload(payload)
+            except ValueError:
+                valid = False
+
+        if not valid:
+            print("DISK_CACHE: corrupt entry " + key + " removed")
+            self._remove(path)
+            return(None)
+
+        # --- mark as recently used for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        if res.ndim == 0:
+            res = res[()]
+
+        return((res,))
+
+    def put(self, key, value):
+        """
+        Store the result value under key and evict old entries if the cache
+        is too large
+        """
+
+        buf = io.BytesIO()
+        np.save(buf, np.asarray(value), allow_pickle=False)
+        payload = buf.getvalue()
+
+        data = (_MAGIC + np.uint64(len(payload)).astype("<u8").tobytes()
+                + _checksum(payload) + payload)
+
+        # --- write to a temporary file first so that readers never see a
+        #     partially written entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        path = self._path(key)
+
+        try:
+            self._size -= os.path.getsize(path)
+        except OSError:
+            pass
+
+        os.replace(tmp, path)
+        self._size += len(data)
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is not larger
+        than max_bytes
+        """
+
+        paths, sizes, mtimes = self._entries()
+
+        self._size = int(sizes.sum())
+        excess = self._size - self.max_bytes
+
+        if excess <= 0:
+            return
+
+        id = np.argsort(mtimes)
+        nremove = np.searchsorted(np.cumsum(sizes[id]), excess) + 1
+
+        for i in id[:nremove]:
+            self._remove(paths[i], sizes[i])
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+
+        paths, sizes, _ = self._entries()
+
+        for path, size in zip(paths, sizes):
+            self._remove(path, size)
+
+    def _remove(self, path, size=None):
+        try:
+            if size is None:
+                size = os.path.getsize(path)
+            os.remove(path)
+            self._size -= int(size)
+        except OSError:
+            pass
+
+    def memoize(self, func):
+        """
+        Return a version of func whose results are stored in the cache.
+        Calls with arguments that cannot be hashed are passed through
+        """
+
+        self._func_info(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            key = self.key(func, args, kwargs)
+
+            if key is None:
+                return(func(*args, **kwargs))
+
+            res = self.get(key)
+
+            if res is not None:
+                self.hits += 1
+                return(res[0])
+
+            self.misses += 1
+
+            value = func(*args, **kwargs)
+            self.put(key, value)
+
+            return(value)
+
+        return(wrapper)
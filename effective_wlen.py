@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.3.1"
 
 """
 HISTORY:
     - 2020-01-17: created by Daniel Asmus
+    - 2026-10-18: Filter objects accepted, results cached per alpha
+    - 2026-10-18: batched tables over many filters and alphas added
+    - 2026-10-18: array alphas for Filter objects, NaN outside of the table
+                  in effective_wlen_interp, table rebuilt for other alphas
+    - 2026-10-18: cached tables sorted by alpha (without duplicates), so
+                  effective_wlen_interp also works for unsorted alphas
 
 
 NOTES:
@@ -16,18 +22,126 @@ TO-DO:
 """
 
 
-
+import numpy as np
 from scipy.integrate import simps
 
+from .filter_curve import Filter
+from .spectral_axis import _simpson_weights
+
 
-def effective_wlen(fwlen, ftrans, alpha=0):
+def effective_wlen(fwlen, ftrans=None, alpha=0):
     """
     Compute the effective wavelength for a given filter transfer function and a
-    reference spectrum with the power law slope alpha
+    reference spectrum with the power law slope alpha. fwlen can also be a
+    Filter object, in which case the result is cached in the filter (for
+    scalar alpha; arrays of alpha are evaluated with effective_wlen_table)
 
     """
 
+    if isinstance(fwlen, Filter):
+        filt = fwlen
+
+        if np.ndim(alpha) > 0:
+            alpha = np.asarray(alpha, dtype=float)
+            return(effective_wlen_table([(filt.fwlen, filt.ftrans)],
+                                        alpha.ravel())[0].reshape(alpha.shape))
+
+        if alpha not in filt._eff_wlen_cache:
+            filt._eff_wlen_cache[alpha] = effective_wlen(filt.fwlen,
+                                                         filt.ftrans,
+                                                         alpha=alpha)
+
+        return(filt._eff_wlen_cache[alpha])
+
     eff_wlen = (simps(ftrans*fwlen*fwlen**(-1*alpha-1),fwlen)
                  / simps(ftrans*fwlen**(-1*alpha-1),fwlen))
 
-    return(eff_wlen)
\ No newline at end of file
+    return(eff_wlen)
+
+
+
+#%%
+def effective_wlen_table(filters, alphas):
+    """
+    Compute the effective wavelengths of many filters for many power law
+    slopes alpha in one vectorized evaluation. For Filter objects the table
+    is cached in the filter for later lookups with effective_wlen_interp,
+    sorted by alpha and without duplicate slopes
+
+    Parameters
+    ----------
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters, or (fwlen, ftrans) tuples (which are not cached)
+    alphas : TYPE float array
+        DESCRIPTION. Power law slopes of the reference spectrum
+
+    Returns
+    -------
+    float array: effective wavelengths with the shape (n_filters, n_alphas),
+        the columns in the order of alphas
+
+    """
+
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+
+    fwlens = []
+    ftranss = []
+
+    for filt in filters:
+        if isinstance(filt, Filter):
+            fwlens.append(filt.fwlen)
+            ftranss.append(filt.ftrans)
+        else:
+            id = np.argsort(filt[0])
+            fwlens.append(np.asarray(filt[0], dtype=float)[id])
+            ftranss.append(np.asarray(filt[1], dtype=float)[id])
+
+    # --- all curves concatenated with their Simpson weights, so that the
+    #     integrals of all filters and alphas are segment sums of one array
+    starts = np.cumsum([0] + [len(f) for f in fwlens[:-1]])
+    fwlen = np.concatenate(fwlens)
+    weights = np.concatenate([_simpson_weights(f) for f in fwlens])
+    wtrans = np.concatenate(ftranss) * weights
+
+    snu = fwlen[None, :]**(-1*alphas[:, None]-1)
+
+    num = np.add.reduceat(wtrans * fwlen * snu, starts, axis=1)
+    den = np.add.reduceat(wtrans * snu, starts, axis=1)
+
+    table = (num / den).T
+
+    # --- np.interp needs increasing slopes in the cached tables
+    ualphas, id = np.unique(alphas, return_index=True)
+
+    for filt, row in zip(filters, table):
+        if isinstance(filt, Filter):
+            filt._eff_wlen_table = (ualphas, row[id])
+
+    return(table)
+
+
+def effective_wlen_interp(filt, alpha, alphas=None):
+    """
+    Return the effective wavelength of a Filter for the power law slope(s)
+    alpha by interpolation in its cached table (see effective_wlen_table),
+    NaN outside of the range of the table. If the filter has no table yet,
+    or a table on other slopes than alphas, one is computed on the grid
+    alphas (default: np.linspace(-5, 5, 201))
+    """
+
+    table = getattr(filt, "_eff_wlen_table", None)
+
+    if alphas is not None:
+        alphas = np.unique(np.asarray(alphas, dtype=float))
+
+        if table is not None and not np.array_equal(table[0], alphas):
+            table = None
+
+    if table is None:
+        effective_wlen_table([filt], alphas if alphas is not None
+                             else np.linspace(-5, 5, 201))
+
+    table_alphas, table = filt._eff_wlen_table
+
+    return(np.interp(alpha, table_alphas, table, left=np.nan,
+                     right=np.nan))
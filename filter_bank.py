@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: agreement with synthphot documented and tested
+
+
+NOTES:
+    - one cumulative integral of the spectrum is built and every window of
+      the bank is evaluated from it at its knots only, so the cost is
+      O(N + M log N) for N spectral points and M knots in total instead of a
+      full pass over the spectrum per window
+    - the window normalizations are computed analytically for the piecewise
+      linear curves and the spectrum is integrated exactly up to the window
+      edges. synthphot instead drops the partial spectral intervals at the
+      filter edges, so the two differ by about 1e-3 (relative) for spectra
+      sampled every 0.01 micron across micron wide windows, roughly
+      proportional to the spectral step (7e-3 at 0.05 micron, 2e-4 at
+      0.002 micron). Most of that is the error of synthphot: against a
+      densely sampled reference synthphot_bank is accurate to about 1e-4
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+
+from .filter_curve import Filter, _cumulative_integrals, _eval_cumulative
+
+
+def _power_integral(a, b, q):
+    """
+    Return the integral of x**q from a to b (elementwise)
+    """
+
+    q = np.broadcast_to(q, np.shape(a))
+    islog = q == -1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = np.where(islog, np.log(b / a),
+                       (b**(q + 1) - a**(q + 1)) / np.where(islog, 1, q + 1))
+
+    return(res)
+
+
+def synthphot_bank(wavelen, fluxden, windows, alpha=-2,
+                   ignore_incomplete=False, acceptable_hole=0.7):
+    """
+    Perform synthetic photometry on one spectrum for a bank of (many, narrow)
+    piecewise linear windows, e.g., spectral indices or band windows. The
+    results differ from synthphot by about 1e-3 (relative) for a spectral
+    step of 0.01 micron, see the NOTES
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array of the spectrum
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density, fnu, array of the spectrum
+    windows : TYPE list
+        DESCRIPTION. Windows as (fwlen, ftrans, ref_wlen) tuples or Filter
+        objects (whose alpha is used)
+    alpha : TYPE int or float array, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum snu = fwlen**(-1*alpha), either one for all windows or one
+        per window
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering whole windows, which are then cut at the spectrum edges
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+
+    Returns
+    -------
+    float array: synthetic flux densities in input units, one per window. -1
+        for windows that are not (properly) covered unless ignore_incomplete
+    bool array: coverage flags, True where the spectrum covers the window
+        without holes larger than acceptable_hole
+
+    """
+
+    nw = len(windows)
+    alphas = np.broadcast_to(np.asarray(alpha, dtype=float), (nw,)).copy()
+
+    # --- concatenate the knots of all windows
+    knots = []
+    trans = []
+    ref_wlen = np.zeros(nw)
+
+    for i, win in enumerate(windows):
+        if isinstance(win, Filter):
+            knots.append(win.fwlen)
+            trans.append(win.ftrans)
+            ref_wlen[i] = win.ref_wlen
+            alphas[i] = win.alpha
+        else:
+            id = np.argsort(win[0])
+            knots.append(np.asarray(win[0], dtype=float)[id])
+            trans.append(np.asarray(win[1], dtype=float)[id])
+            ref_wlen[i] = win[2]
+
+    nknots = np.array([len(k) for k in knots])
+    starts = np.concatenate([[0], np.cumsum(nknots)[:-1]])
+    ends = starts + nknots - 1
+    win = np.repeat(np.arange(nw), nknots)
+    knots = np.concatenate(knots)
+    trans = np.concatenate(trans)
+
+    # ---- first exclude invalid data points and sort the spectrum once
+    wavelen = np.asarray(wavelen)
+    fluxden = np.asarray(fluxden)
+
+    id = wavelen != 0
+    wlen = wavelen[id]
+    inten = fluxden[id]
+
+    id = np.argsort(wlen)
+    wlen = wlen[id]
+    inten = inten[id]
+
+    # --- coverage and largest hole of all windows at once
+    wlo = knots[starts]
+    whi = knots[ends]
+
+    covered = (wlo >= wlen[0]) & (whi <= wlen[-1])
+
+    lo = np.maximum(np.searchsorted(wlen, wlo, side="left"), 1) - 1
+    hi = np.searchsorted(wlen, whi, side="right") - 1
+
+    wdiffs = np.append(np.diff(wlen), 0)
+    bounds = np.ravel(np.column_stack([lo, np.maximum(hi, lo)]))
+    max_hole = np.maximum.reduceat(wdiffs, bounds)[::2]
+    max_hole[hi <= lo] = 0
+
+    covered &= max_hole <= acceptable_hole
+
+    # --- cumulative integrals of fnu/wlen and of fnu over the spectrum
+    g = inten / wlen
+    c0, c1 = _cumulative_integrals(wlen, g)
+
+    # --- line segments between consecutive knots of the same window, cut at
+    #     the spectrum edges
+    same = win[:-1] == win[1:]
+    a = knots[:-1]
+    b = knots[1:]
+    dk = b - a
+
+    slope = np.divide(np.diff(trans), dk, out=np.zeros(len(dk)),
+                      where=same & (dk != 0))
+    offset = trans[:-1] - slope * a
+
+    ac = np.clip(a, wlen[0], wlen[-1])
+    bc = np.clip(b, wlen[0], wlen[-1])
+
+    ct0a, ct1a = _eval_cumulative(wlen, g, c0, c1, ac)
+    ct0b, ct1b = _eval_cumulative(wlen, g, c0, c1, bc)
+
+    contrib = np.where(same, offset * (ct0b - ct0a) + slope * (ct1b - ct1a),
+                       0)
+
+    # --- analytic normalization of the windows over the same range
+    q = -1 * alphas[win[:-1]] - 1
+    normc = np.where(same & (bc > ac),
+                     offset * _power_integral(ac, bc, q)
+                     + slope * _power_integral(ac, bc, q + 1), 0)
+
+    num = np.bincount(win[:-1], weights=contrib, minlength=nw)
+    norm = np.bincount(win[:-1], weights=normc, minlength=nw)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        synflux = num / norm * ref_wlen**(-1*alphas)
+
+    if ignore_incomplete:
+        synflux[norm == 0] = -1
+    else:
+        synflux[~covered] = -1
+
+    return(synflux, covered)
+
+
+def synthphot_tophat(wavelen, fluxden, wlo, whi, ref_wlen=None, alpha=-2,
+                     ignore_incomplete=False, acceptable_hole=0.7):
+    """
+    Perform synthetic photometry on one spectrum for many top-hat windows
+    [wlo, whi], e.g., the WISE bands approximated by wise.wlens -/+
+    wise.hwidths. ref_wlen defaults to the window centres. See synthphot_bank
+    for the other parameters and the return values
+    """
+
+    wlo = np.atleast_1d(np.asarray(wlo, dtype=float))
+    whi = np.atleast_1d(np.asarray(whi, dtype=float))
+
+    if ref_wlen is None:
+        ref_wlen = 0.5 * (wlo + whi)
+
+    ref_wlen = np.broadcast_to(ref_wlen, wlo.shape)
+
+    windows = [(np.array([l, h]), np.ones(2), r)
+               for l, h, r in zip(wlo, whi, ref_wlen)]
+
+    return(synthphot_bank(wavelen, fluxden, windows, alpha=alpha,
+                          ignore_incomplete=ignore_incomplete,
+                          acceptable_hole=acceptable_hole))
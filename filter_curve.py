@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.1.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: Filter.approximate marks curves that are not official
+
+
+NOTES:
+    - the filter normalization and the interpolation weights of a Filter
+      are cached per spectral grid, so that repeated synthetic photometry
+      on the same grid only costs the final integral
+
+TO-DO:
+    -
+"""
+
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from scipy.integrate import simps
+
+from .freq_wave_conversions import micron2hertz as _micron2hertz
+from .spectral_axis import SpectralAxis, _simpson_weights
+
+
+#%%
+def _cumulative_integrals(x, g):
+    """
+    Return the cumulative integrals of g and of x*g over the sorted grid x at
+    the grid points, treating g as linear between the grid points
+    """
+
+    h = np.diff(x)
+    s = np.divide(np.diff(g), h, out=np.zeros(len(h)), where=h != 0)
+
+    c0 = np.zeros(len(x))
+    c1 = np.zeros(len(x))
+
+    c0[1:] = np.cumsum(g[:-1] * h + s * h**2 / 2)
+    c1[1:] = np.cumsum(x[:-1] * g[:-1] * h + (x[:-1] * s + g[:-1]) * h**2 / 2
+                       + s * h**3 / 3)
+
+    return(c0, c1)
+
+
+def _eval_cumulative(x, g, c0, c1, t):
+    """
+    Evaluate the cumulative integrals c0, c1 from _cumulative_integrals at
+    arbitrary positions t inside the grid x (exact for g linear between the
+    grid points)
+    """
+
+    i = np.clip(np.searchsorted(x, t, side="right") - 1, 0, len(x) - 2)
+
+    xi = x[i]
+    gi = g[i]
+    h = x[i+1] - xi
+    s = np.divide(g[i+1] - gi, h, out=np.zeros(h.shape), where=h != 0)
+    d = t - xi
+
+    ct0 = c0[i] + gi * d + s * d**2 / 2
+    ct1 = c1[i] + xi * gi * d + (xi * s + gi) * d**2 / 2 + s * d**3 / 3
+
+    return(ct0, ct1)
+
+
+def _integrate_piecewise_linear(x, g, c0, c1, knots, trans):
+    """
+    Integrate the product of g (sampled on x, cumulative integrals c0, c1) and
+    the piecewise linear curve trans given on the sorted knots. knots can also
+    be 2D (one set of knots per row with the same trans values), in which case
+    one integral per row is returned
+    """
+
+    knots = np.asarray(knots)
+
+    if knots.shape[-1] < 2:
+        return(np.zeros(knots.shape[:-1]))
+
+    ct0, ct1 = _eval_cumulative(x, g, c0, c1, knots)
+
+    dk = np.diff(knots, axis=-1)
+    dt = np.broadcast_to(np.diff(trans), dk.shape)
+    slope = np.divide(dt, dk, out=np.zeros(dk.shape), where=dk != 0)
+    offset = trans[:-1] - slope * knots[..., :-1]
+
+    return(np.sum(offset * np.diff(ct0, axis=-1)
+                  + slope * np.diff(ct1, axis=-1), axis=-1))
+
+
+def check_coverage(wavelen, fwlen, acceptable_hole=0.7, is_sorted=False):
+    """
+    Vectorized test of how well a spectrum covers a filter transfer function,
+    e.g., to pre-screen spectra before synthetic photometry
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array of the spectrum (0 entries are ignored)
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or Filter
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+    is_sorted : TYPE bool, optional
+        DESCRIPTION. The default is False. Set if wavelen is already sorted
+        and free of invalid (0) entries to skip that step
+
+    Returns
+    -------
+    dict with the keys
+        'covered': whether the spectrum extends over the whole filter curve
+        'coverage': fraction of the filter wavelength range inside the
+            spectrum wavelength range
+        'max_hole': largest spacing between spectrum points inside the filter
+            range
+        'hole_start', 'hole_end': wavelengths enclosing that largest hole
+        'npix': number of spectrum points inside the filter range
+        'valid': whether synthphot accepts the spectrum for this filter,
+            i.e., covered and max_hole <= acceptable_hole
+
+    """
+
+    if isinstance(fwlen, Filter):
+        fwlen = fwlen.fwlen
+
+    wlen = np.asarray(wavelen)
+
+    if not is_sorted:
+        wlen = np.sort(wlen[wlen != 0])
+
+    fmin = np.nanmin(fwlen)
+    fmax = np.nanmax(fwlen)
+
+    # --- fraction of the filter range that the spectrum range overlaps
+    if len(wlen) > 0 and fmax > fmin:
+        overlap = min(fmax, wlen[-1]) - max(fmin, wlen[0])
+        coverage = min(max(overlap / (fmax - fmin), 0.0), 1.0)
+    else:
+        coverage = 0.0
+
+    covered = (len(wlen) > 0) and (fmin >= wlen[0]) and (fmax <= wlen[-1])
+
+    # --- largest spacing ending on a spectrum point inside the filter range
+    lo = np.searchsorted(wlen, fmin, side="left")
+    hi = np.searchsorted(wlen, fmax, side="right")
+    npix = hi - lo
+
+    max_hole = 0.0
+    hole_start = np.nan
+    hole_end = np.nan
+
+    jlo = max(lo, 1)
+
+    if hi > jlo:
+        wdiffs = wlen[jlo:hi] - wlen[jlo-1:hi-1]
+        ids = np.argmax(wdiffs)
+        max_hole = wdiffs[ids]
+        hole_start = wlen[jlo-1+ids]
+        hole_end = wlen[jlo+ids]
+
+    report = {"covered": bool(covered),
+              "coverage": coverage,
+              "max_hole": max_hole,
+              "hole_start": hole_start,
+              "hole_end": hole_end,
+              "npix": int(npix),
+              "valid": bool(covered and max_hole <= acceptable_hole)}
+
+    return(report)
+
+
+def _check_coverage(wlen, fwlen, acceptable_hole=0.7):
+    """
+    Test whether the sorted spectrum wavelengths wlen cover the filter curve
+    fwlen without any holes larger than acceptable_hole. Prints the reason and
+    returns False if not
+    """
+
+    report = check_coverage(wlen, fwlen, acceptable_hole=acceptable_hole,
+                            is_sorted=True)
+
+    if not report["covered"]:
+
+        print("ERROR: spectrum not covering whole filter curve. Abort...")
+        return(False)
+
+    if not report["valid"]:
+
+        print("ERROR: spectrum has a hole larger than allowed. Abort...")
+        print(report["max_hole"], report["hole_end"])
+        return(False)
+
+    return(True)
+
+
+def _grid_weights(wavelen, fwlen, ftrans, ref_wlen, ignore_incomplete=False,
+                  acceptable_hole=0.7, alpha=-2, norm=None):
+    """
+    Compute the indices idv into wavelen and the weights such that
+    fluxden[idv] @ weights is the synthetic flux density of fluxden sampled on
+    wavelen. The filter curve fwlen, ftrans has to be sorted. norm is the
+    filter normalization over the whole curve if already known.
+    Returns -1 if the spectrum does not cover the filter curve (properly)
+    """
+
+    # ---- first exclude invalid data points and sort the grid
+    if isinstance(wavelen, SpectralAxis):
+        axis = wavelen
+        idv = axis.sort_index
+        wlen = axis.wlen
+    else:
+        axis = None
+        wavelen = np.asarray(wavelen)
+        idv = np.where(wavelen != 0)[0]
+        idv = idv[np.argsort(wavelen[idv])]
+        wlen = wavelen[idv]
+
+    npix = len(wlen)
+
+    # --- test whether the grid covers the filter curve without any holes
+    if ignore_incomplete is False:
+        if not _check_coverage(wlen, fwlen, acceptable_hole):
+            return(-1)
+
+    # --- normalize the filter function for the overlapping region
+    id = np.where((fwlen >= wlen[0]) & (fwlen <= wlen[npix-1]))[0]
+
+    if norm is None or len(id) != len(fwlen):
+        norm = simps(ftrans[id]/fwlen[id]*fwlen[id]**(-1*alpha), fwlen[id])
+
+    ftrans = ftrans[id] / norm
+    fwlen = fwlen[id]
+
+    n = len(fwlen)
+
+    snu_ref = ref_wlen**(-1*alpha)
+
+    # --- fold interpolated filter, 1/wlen and the Simpson weights into one
+    #     weight vector on the grid
+    i0 = np.searchsorted(wlen, fwlen[0], side="left")
+    i1 = np.searchsorted(wlen, fwlen[n-1], side="right")
+
+    idv = idv[i0:i1]
+    wlen = wlen[i0:i1]
+
+    if axis is not None:
+        sweights = axis.simpson_weights(i0, i1)
+    else:
+        sweights = _simpson_weights(wlen)
+
+    weights = np.interp(wlen, fwlen, ftrans) / wlen * sweights * snu_ref
+
+    return(idv, weights)
+
+
+def _grid_weights_freq(wavelen, fwlen, ftrans, ref_wlen,
+                       ignore_incomplete=False, acceptable_hole=0.7, alpha=-2,
+                       norm=None):
+    """
+    Same as _grid_weights but with the integration carried out in frequency
+    space as in synthphot_freq. The filter curve fwlen, ftrans has to be
+    sorted. norm is the filter normalization in frequency space over the
+    whole curve if already known.
+    """
+
+    if isinstance(wavelen, SpectralAxis):
+        axis = wavelen
+    else:
+        axis = SpectralAxis(wavelen)
+
+    # --- test whether the grid covers the filter curve without any holes
+    if ignore_incomplete is False:
+        if not _check_coverage(axis.wlen, fwlen, acceptable_hole):
+            return(-1)
+
+    # --- valid data points sorted in frequency space
+    idv = axis.freq_sort_index
+    freq = axis.freq
+    npix = len(freq)
+
+    ffreq = _micron2hertz(fwlen[::-1])
+    ftrans = ftrans[::-1]
+
+    # --- normalize the filter function for the overlapping region
+    id = np.where((ffreq >= freq[0]) & (ffreq <= freq[npix-1]))[0]
+
+    if norm is None or len(id) != len(ffreq):
+        norm = simps(ftrans[id]/ffreq[id]*ffreq[id]**(alpha), ffreq[id])
+
+    ftrans = ftrans[id] / norm
+    ffreq = ffreq[id]
+
+    n = len(ffreq)
+
+    snu_ref = _micron2hertz(ref_wlen)**(alpha)
+
+    # --- fold interpolated filter, 1/freq and the Simpson weights into one
+    #     weight vector on the grid
+    i0 = np.searchsorted(freq, ffreq[0], side="left")
+    i1 = np.searchsorted(freq, ffreq[n-1], side="right")
+
+    idv = idv[i0:i1]
+    freq = freq[i0:i1]
+
+    weights = (np.interp(freq, ffreq, ftrans) / freq
+               * axis.simpson_weights(i0, i1, freq=True) * snu_ref)
+
+    return(idv, weights)
+
+
+#%%
+class Filter:
+    """
+    Filter transfer function with a reference wavelength and reference power
+    law index alpha that can be passed to synthphot, synthphot_freq,
+    synthphot_batch and effective_wlen instead of the fwlen, ftrans arrays.
+
+    The curve is sorted once and its normalization computed once. The
+    interpolation weights for every spectral grid that the filter is applied
+    to are kept in a least-recently-used cache of size cache_size.
+
+    Parameters
+    ----------
+    fwlen : TYPE float array
+        DESCRIPTION. filter transfer function wavelength array
+    ftrans : TYPE float array
+        DESCRIPTION. filter transfer function transmission
+    ref_wlen : TYPE float
+        DESCRIPTION. Reference wavelength (should normally be the effective
+        wavelength of the filter)
+    alpha : TYPE int, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum snu = fwlen**(-1*alpha)
+    name : TYPE str, optional
+        DESCRIPTION. The default is None. Name of the filter
+    zp : TYPE float, optional
+        DESCRIPTION. The default is None. Zero point of the filter in Jy
+    approximate : TYPE bool, optional
+        DESCRIPTION. The default is False. Set if the curve is only an
+        approximation of the official transmission curve
+    cache_size : TYPE int, optional
+        DESCRIPTION. The default is 32. Maximum number of spectral grids for
+        which the interpolation weights are kept
+
+    """
+
+    def __init__(self, fwlen, ftrans, ref_wlen, alpha=-2, name=None, zp=None,
+                 approximate=False, cache_size=32):
+
+        fwlen = np.asarray(fwlen, dtype=float)
+        ftrans = np.asarray(ftrans, dtype=float)
+
+        id = np.argsort(fwlen)
+        self.fwlen = fwlen[id]
+        self.ftrans = ftrans[id]
+        self.ref_wlen = ref_wlen
+        self.alpha = alpha
+        self.name = name
+        self.zp = zp
+        self.approximate = approximate
+        self.cache_size = cache_size
+
+        self.norm = simps(self.ftrans / self.fwlen
+                          * self.fwlen**(-1*alpha), self.fwlen)
+
+        ffreq = _micron2hertz(self.fwlen[::-1])
+        self.norm_freq = simps(self.ftrans[::-1] / ffreq * ffreq**(alpha),
+                               ffreq)
+
+        self._grid_cache = OrderedDict()
+        self._eff_wlen_cache = {}
+        self._eff_wlen_table = None
+
+    def __repr__(self):
+        return("Filter(name={}, ref_wlen={}, alpha={}{})".format(
+            self.name, self.ref_wlen, self.alpha,
+            ", approximate=True" if self.approximate else ""))
+
+    def grid_weights(self, wavelen, ignore_incomplete=False,
+                     acceptable_hole=0.7, freq=False):
+        """
+        Return the indices idv into wavelen (array or SpectralAxis) and the
+        weights such that fluxden[idv] @ weights is the synthetic flux
+        density, or -1 if the grid does not cover the filter. With freq=True
+        the weights correspond to the integration in frequency space
+        (synthphot_freq). Results are cached per grid.
+        """
+
+        if isinstance(wavelen, SpectralAxis):
+            digest = wavelen.digest
+        else:
+            wavelen = np.ascontiguousarray(wavelen)
+            digest = (hashlib.blake2b(wavelen.view(np.uint8),
+                                      digest_size=16).hexdigest(),
+                      wavelen.dtype.str, wavelen.shape)
+
+        key = digest + (bool(ignore_incomplete), acceptable_hole, bool(freq))
+
+        if key in self._grid_cache:
+            self._grid_cache.move_to_end(key)
+            return(self._grid_cache[key])
+
+        if freq:
+            res = _grid_weights_freq(wavelen, self.fwlen, self.ftrans,
+                                     self.ref_wlen,
+                                     ignore_incomplete=ignore_incomplete,
+                                     acceptable_hole=acceptable_hole,
+                                     alpha=self.alpha, norm=self.norm_freq)
+        else:
+            res = _grid_weights(wavelen, self.fwlen, self.ftrans,
+                                self.ref_wlen,
+                                ignore_incomplete=ignore_incomplete,
+                                acceptable_hole=acceptable_hole,
+                                alpha=self.alpha, norm=self.norm)
+
+        # --- failed grids are not cached so that the error is always shown
+        if not isinstance(res, tuple):
+            return(res)
+
+        self._grid_cache[key] = res
+
+        while len(self._grid_cache) > self.cache_size:
+            self._grid_cache.popitem(last=False)
+
+        return(res)
+
+    def clear_cache(self):
+        """
+        Drop all cached grid weights and effective wavelengths
+        """
+
+        self._grid_cache.clear()
+        self._eff_wlen_cache.clear()
+        self._eff_wlen_table = None
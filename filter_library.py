@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.2.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: approximate curves flagged (Filter.approximate) with a
+                  warning on load; zero points taken from flux_conversions
+    - 2026-10-18: bundled nominal top-hat library removed; get_filter needs
+                  a user library set with set_default_library
+
+
+NOTES:
+    - all filter curves are stored in one binary file: an 8 byte magic
+      string, the length of a JSON header (uint64), the JSON header with the
+      names, zero points, effective wavelengths and positions of the curves,
+      and finally the wavelength and transmission arrays as float32
+    - the data part is memory-mapped and a curve is only turned into a Filter
+      object when it is requested for the first time
+    - no filter curves are bundled. Write a library from the official
+      transmission curves with write_filter_library, open it with
+      FilterLibrary(fname) or register it for get_filter with
+      set_default_library(fname). Curves flagged as approximate in the
+      library return Filter objects with approximate=True and print a
+      warning when they are loaded
+
+TO-DO:
+    -
+"""
+
+
+import json
+
+import numpy as np
+
+from .effective_wlen import effective_wlen
+from .filter_curve import Filter
+
+
+_MAGIC = b"MISCFLT1"
+
+
+def write_filter_library(fname, curves, aliases=None, alpha=-2):
+    """
+    Write filter curves into a single binary library file
+
+    Parameters
+    ----------
+    fname : TYPE str
+        DESCRIPTION. Output file name
+    curves : TYPE dict
+        DESCRIPTION. name: dict with the keys 'fwlen', 'ftrans' and optionally
+        'zp' (Jy), 'description' and 'approximate' (True for curves that are
+        not the official ones)
+    aliases : TYPE dict, optional
+        DESCRIPTION. The default is None. Alternative names, alias: name
+    alpha : TYPE int, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum for which the effective wavelengths are computed
+
+    Returns
+    -------
+    None.
+
+    """
+
+    header = {"dtype": "<f4", "alpha": alpha, "filters": {},
+              "aliases": aliases if aliases is not None else {}}
+
+    data = []
+    offset = 0
+
+    for name, curve in curves.items():
+
+        fwlen = np.asarray(curve["fwlen"], dtype=float)
+        ftrans = np.asarray(curve["ftrans"], dtype=float)
+
+        # --- sort and round to the storage precision before computing the
+        #     effective wavelength
+        id = np.argsort(fwlen)
+        fwlen = fwlen[id].astype("<f4").astype(float)
+        ftrans = ftrans[id].astype("<f4").astype(float)
+        npts = len(fwlen)
+
+        header["filters"][name] = {
+            "offset": offset, "npts": npts,
+            "zp": curve.get("zp"),
+            "eff_wlen": float(effective_wlen(fwlen, ftrans, alpha=alpha)),
+            "description": curve.get("description", ""),
+            "approximate": bool(curve.get("approximate", False))}
+
+        data += [fwlen, ftrans]
+        offset += 2 * npts
+
+    hbytes = json.dumps(header).encode("utf-8")
+
+    # --- pad the header so that the data part is aligned
+    hbytes += b" " * (-(len(_MAGIC) + 8 + len(hbytes)) % 16)
+
+    with open(fname, "wb") as f:
+        f.write(_MAGIC)
+        f.write(np.uint64(len(hbytes)).tobytes())
+        f.write(hbytes)
+        f.write(np.concatenate(data).astype("<f4").tobytes())
+
+
+class FilterLibrary:
+    """
+    Registry of filter curves stored in a binary library file. Filters are
+    looked up by name (or alias) and returned as Filter objects with the
+    zero point (zp) and the precomputed effective wavelength as ref_wlen.
+    Curves flagged as approximate in the library print a warning when they
+    are loaded
+
+    Parameters
+    ----------
+    fname : TYPE str
+        DESCRIPTION. Library file written with write_filter_library
+
+    """
+
+    def __init__(self, fname):
+
+        self.fname = fname
+
+        with open(fname, "rb") as f:
+            magic = f.read(len(_MAGIC))
+
+            if magic != _MAGIC:
+                raise IOError("FILTER_LIBRARY: " + fname
+                              + " is not a filter library file")
+
+            hlen = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(hlen).decode("utf-8"))
+
+        self._header = header
+        self._offset = len(_MAGIC) + 8 + hlen
+        self._data = None
+        self._filters = {}
+
+        self.alpha = header["alpha"]
+        self.aliases = header["aliases"]
+        self.names = list(header["filters"].keys())
+
+    def __repr__(self):
+        return("FilterLibrary({}, filters={})".format(self.fname, self.names))
+
+    def __contains__(self, name):
+        return(name in self._header["filters"] or name in self.aliases)
+
+    def __len__(self):
+        return(len(self.names))
+
+    def _resolve(self, name):
+
+        name = self.aliases.get(name, name)
+
+        if name not in self._header["filters"]:
+            raise KeyError("FILTER_LIBRARY: unknown filter " + str(name))
+
+        return(name)
+
+    def info(self, name):
+        """
+        Return the zero point, effective wavelength and description of a
+        filter without loading its curve
+        """
+
+        return(dict(self._header["filters"][self._resolve(name)]))
+
+    def __getitem__(self, name):
+        """
+        Return the Filter object for name, materialized on first request
+        """
+
+        name = self._resolve(name)
+
+        if name not in self._filters:
+
+            # --- memory-map the data part on first access only
+            if self._data is None:
+                self._data = np.memmap(self.fname, dtype=self._header["dtype"],
+                                       mode="r", offset=self._offset)
+
+            info = self._header["filters"][name]
+            i0 = info["offset"]
+            npts = info["npts"]
+
+            approximate = info.get("approximate", False)
+
+            if approximate:
+                print("FILTER_LIBRARY: WARNING " + name + " is an "
+                      + "approximation (" + info["description"] + "), not "
+                      + "the official transmission curve")
+
+            filt = Filter(self._data[i0:i0+npts], self._data[i0+npts:i0+2*npts],
+                          info["eff_wlen"], alpha=self.alpha, name=name,
+                          zp=info["zp"], approximate=approximate)
+
+            filt._eff_wlen_cache[self.alpha] = info["eff_wlen"]
+
+            self._filters[name] = filt
+
+        return(self._filters[name])
+
+    get = __getitem__
+
+
+_default_library = None
+
+
+def set_default_library(library):
+    """
+    Set the filter library used by get_filter
+
+    Parameters
+    ----------
+    library : TYPE str or FilterLibrary
+        DESCRIPTION. Library file written with write_filter_library or an
+        opened FilterLibrary. None unsets the default library
+
+    Returns
+    -------
+    None.
+
+    """
+
+    global _default_library
+
+    if library is not None and not isinstance(library, FilterLibrary):
+        library = FilterLibrary(library)
+
+    _default_library = library
+
+
+def get_filter(name):
+    """
+    Return a Filter object (with zp and effective wavelength as ref_wlen) by
+    name from the library set with set_default_library, e.g.,
+    get_filter("W3")
+    """
+
+    if _default_library is None:
+        raise IOError("FILTER_LIBRARY: no filter library set. Write one from "
+                      + "the official curves with write_filter_library and "
+                      + "register it with set_default_library(fname)")
+
+    return(_default_library[name])
@@ -1,21 +1,29 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.2.1"
 
 """
 HISTORY:
     - 2020-01-15: created by Daniel Asmus
+    - 2026-10-18: precompiled unit converters (get_converter) behind
+                  convert_flux
+    - 2026-10-18: zero point lookup table; get_zp, mag2jansky and
+                  jansky2mag accept arrays of filter names or codes
+    - 2026-10-18: unknown units reported on every get_converter call
 
 
 NOTES:
-    -
+    - only valid unit combinations are cached (_cached_converter), so that
+      the error for unknown units is printed on every call
 
 TO-DO:
     -
 """
 
 
+import functools
+
 import numpy as np
 
 
@@ -50,6 +58,44 @@ def erg2jansky(nufnu, wlen):
     return(fnu)
 
 
+# --- approximate Vega zero points in Jy, one entry per filter code
+ZP_FILTERS = np.array(["J", "H", "Ks",                # 2MASS
+                       "W1", "W2", "W3", "W4",        # WISE
+                       "L", "M_NB",                   # ISAAC
+                       "Lp", "Mp",                    # NACO
+                       "N", "Np", "Q"])               # VISIR/Michelle/T-ReCs
+ZP_JY = np.array([1594.0, 1024.0, 666.8,
+                  309.540, 171.787, 31.674, 8.363,
+                  247.2, 164.5,
+                  244.2, 159.7,
+                  37.0,     # Michelle/T-ReCs N
+                  30.0,     # approximate 12um
+                  10.0])    # median of VISIR/Michelle/T-ReCs
+
+_ZP_CODES = {name: i for i, name in enumerate(ZP_FILTERS)}
+_ZP_CODES.update({"K": _ZP_CODES["Ks"], "M": _ZP_CODES["M_NB"]})
+
+
+def filter_codes(filt):
+    """
+    Return the integer codes (indices into ZP_FILTERS and ZP_JY) for a
+    filter name or an array of filter names, -1 for unknown filters. The
+    lookup is done once per distinct name
+    """
+
+    names = np.asarray(filt)
+
+    if names.dtype.kind == "S":
+        names = np.char.decode(names)
+
+    names = np.char.strip(names.astype(str))
+
+    uniq, inverse = np.unique(names, return_inverse=True)
+    ucodes = np.array([_ZP_CODES.get(u, -1) for u in uniq], dtype=int)
+
+    return(ucodes[inverse].reshape(names.shape))
+
+
 def get_zp(filt):
     """
     Return the approximate zero point in Jy in Vega for a given filter name
@@ -59,46 +105,40 @@ def get_zp(filt):
         - WISE: 'W1', 'W2', 'W3', 'W4'
         - NACO: 'Lp', 'Mp', ISAAC: 'M_NB', 'L'
         - VISIR/T-ReCs: 'N', 'Np', 'Q'
+    filt can also be an array of filter names or of integer codes (see
+    filter_codes), in which case an array of zero points is returned.
+    Unknown filters are reported together and get NaN
     """
 
-    wise_zps = np.array([309.540, 171.787, 31.674, 8.363])  # Jy
-    tmass_zps = np.array([1594.0, 1024.0, 666.8]) # Jy
-    L_zp = 247.2    # ISAAC
-    M_NB_zp = 164.5    # ISAAC
-    Lp_zp = 244.2   # NACO
-    Mp_zp = 159.7   # NACO
-    N_zp = 37.0  # Michelle/T-ReCs N
-    Np_zp = 30.0   # approximate 12um
-    Q_zp = 10.0  # median of VISIR/Michelle/T-ReCs
-
-    if filt == "J":
-        zp_Jy = tmass_zps[0]
-    elif filt == "H":
-        zp_Jy = tmass_zps[1]
-    elif filt == "K" or filt == "Ks":
-        zp_Jy = tmass_zps[3]
-    elif filt == "W1":
-        zp_Jy = wise_zps[0]
-    elif filt == "W2":
-        zp_Jy = wise_zps[1]
-    elif filt == "W3":
-        zp_Jy = wise_zps[2]
-    elif filt == "W4":
-        zp_Jy = wise_zps[3]
-    elif filt == "L":
-        zp_Jy = L_zp
-    elif filt == "M" or filt == "M_NB":
-        zp_Jy = M_NB_zp
-    elif filt == "Lp":
-        zp_Jy = Lp_zp
-    elif filt == "Mp":
-        zp_Jy = Mp_zp
-    elif filt == "N":
-        zp_Jy = N_zp
-    elif filt == "Np":
-        zp_Jy = Np_zp
-    elif filt == "Q":
-        zp_Jy = Q_zp
+    # --- fast path for a single name
+    if isinstance(filt, str) and filt in _ZP_CODES:
+        return(ZP_JY[_ZP_CODES[filt]])
+
+    filt = np.asarray(filt)
+
+    if filt.dtype.kind in "iu":
+        codes = filt.astype(int)
+        bad = (codes < 0) | (codes >= len(ZP_JY))
+        unknown = np.unique(codes[bad])
+    else:
+        codes = filter_codes(filt)
+        bad = codes == -1
+        unknown = filt[bad]
+
+        if unknown.dtype.kind == "S":
+            unknown = np.char.decode(unknown)
+
+        unknown = np.unique(unknown)
+
+    if len(unknown) > 0:
+        print("GET_ZP: ERROR unknown filter(s): "
+              + ", ".join(str(u) for u in unknown) + ". Returning NaN for "
+              + str(np.sum(bad)) + " entries")
+
+    zp_Jy = np.where(bad, np.nan, ZP_JY[np.where(bad, 0, codes)])
+
+    if zp_Jy.ndim == 0:
+        zp_Jy = zp_Jy[()]
 
     return(zp_Jy)
 
@@ -108,12 +148,13 @@ def mag2jansky(mag, zp_Jy=None, filt=None):
 
     """
     convert a magnitude to a flux density either by a given zeropoint in Jy
-    or a filter name
+    or a filter name. mag, zp_Jy and filt can be arrays, e.g., a catalog
+    column with one filter name (or code) per row
     """
     if filt is not None:
         zp_Jy = get_zp(filt)
 
-    return(zp_Jy * 10 ** (-mag/2.5))
+    return(zp_Jy * 10 ** (-np.asarray(mag)/2.5))
 
 
 
@@ -121,7 +162,8 @@ def jansky2mag(jy, zp_Jy=None, filt=None):
 
     """
     convert a flux density to a magnitude for either given zeropoint in Jy
-    or a filte rname
+    or a filte rname. jy, zp_Jy and filt can be arrays, e.g., a catalog
+    column with one filter name (or code) per row
     """
     if filt is not None:
         zp_Jy = get_zp(filt)
@@ -129,74 +171,183 @@ def jansky2mag(jy, zp_Jy=None, filt=None):
     return(-2.5 * np.log10(jy/zp_Jy))
 
 
+# --- flux (density) units: (kind, factor to W/m^2/Hz or W/m^2)
+_FLUX_UNITS = {"mJy": ("fnu", 1.0e-29),
+               "Jy": ("fnu", 1.0e-26),
+               "W/m^2": ("nufnu", 1.0),
+               "erg/s/cm^2": ("nufnu", 1.0e-3)}
 
-def convert_flux(flux, inunit, outunit, inlog=False, outlog=False,
-                 wlen=None, freq=None, wunit="micron",
-                 wlog=False, flog=False):
+# --- wavelength units: factor to m
+_WLEN_UNITS = {"micron": 1e-6, "nm": 1e-9, "angstr": 1e-10, "cm": 1e-2,
+               "m": 1.0}
 
+
+class FluxConverter:
     """
-    Convert a flux or flux density into a flux or flux density of a different
-    unit.
-    allowed input/output units are 'mJy', 'Jy', 'W/m^2' or erg/s/cm^2' and for
-    wavelength either 'micron', 'nm', 'angstr', 'cm', 'm'. For frequency, the
-    unit has to be 'Hertz'
+    Precompiled conversion between two flux or flux density units. The
+    scale factor and the power of the frequency are resolved once by
+    get_converter, so a call only performs the arithmetic.
+
+    Parameters
+    ----------
+    scale : TYPE float
+        DESCRIPTION. Constant factor of the conversion (including the
+        wavelength unit and the speed of light if needed)
+    power : TYPE int
+        DESCRIPTION. Power of the frequency in the conversion (-1, 0 or 1)
+    inlog, outlog, wlog, flog : TYPE bool
+        DESCRIPTION. Flags for logarithmic input, output, wavelength and
+        frequency
+    wscale : TYPE float
+        DESCRIPTION. Factor from the wavelength unit to m
+
     """
 
-    if inlog == True:
-        flux = 10.0**flux
+    def __init__(self, scale, power, inlog=False, outlog=False, wlog=False,
+                 flog=False, wscale=1.0):
+
+        self.scale = scale
+        self.power = power
+        self.inlog = inlog
+        self.outlog = outlog
+        self.wlog = wlog
+        self.flog = flog
+        self.wscale = wscale
+
+    def __repr__(self):
+        return("FluxConverter(scale={}, power={})".format(self.scale,
+                                                          self.power))
+
+    def __call__(self, flux, wlen=None, freq=None, out=None):
+        """
+        Convert flux, using the wavelength wlen (in the unit of the
+        converter) or the frequency freq [Hz] if the units require it. The
+        result is written into out if given
+        """
+
+        if self.inlog:
+            flux = np.power(10.0, flux, out=out)
+
+        if self.power == 0:
+            res = np.multiply(flux, self.scale, out=out)
+
+        # --- with a frequency the conversion is scale * freq**power
+        elif freq is not None:
+            if self.flog:
+                freq = 10.0**freq
+
+            res = np.multiply(flux, self.scale, out=out)
+
+            if self.power == 1:
+                res = np.multiply(res, freq, out=out)
+            else:
+                res = np.divide(res, freq, out=out)
+
+        # --- with a wavelength freq**power = (c / wlen)**power
+        elif wlen is not None:
+            if self.wlog:
+                wlen = 10.0**wlen
+
+            if self.power == 1:
+                res = np.multiply(flux, SPEED_OF_LIGHT / self.wscale
+                                  * self.scale, out=out)
+                res = np.divide(res, wlen, out=out)
+            else:
+                res = np.multiply(flux, self.wscale / SPEED_OF_LIGHT
+                                  * self.scale, out=out)
+                res = np.multiply(res, wlen, out=out)
+
+        else:
+            print("CONVERT_FLUX: ERROR wavelength or frequency required for "
+                  + "this conversion. Returning -1")
+            return(-1)
+
+        if self.outlog:
+            res = np.log10(res, out=out)
 
-    # --- simple cases
-    if inunit == "mJy" and outunit == "Jy":
-        flux = flux * 1e-3
+        return(res)
 
-    elif inunit == "Jy" and outunit == "mJy":
-        flux = flux * 1e-3
 
-    elif inunit == "W/m^2" and outunit == "erg/s/cm^2":
-        flux = flux * 1e3
+@functools.lru_cache(maxsize=None)
+def _cached_converter(inunit, outunit, wunit, inlog, outlog, wlog, flog):
+    """
+    Return the FluxConverter for valid units, cached per combination
+    """
 
-    elif inunit == "erg/s/cm^2" and outunit == "W/m^2":
-        flux = flux * 1e-3
+    inkind, infac = _FLUX_UNITS[inunit]
+    outkind, outfac = _FLUX_UNITS[outunit]
 
-    # --- ok now the cross-overs
+    # --- fnu to nufnu needs * freq, nufnu to fnu / freq
+    if inkind == outkind:
+        power = 0
+    elif inkind == "fnu":
+        power = 1
     else:
+        power = -1
 
-        if freq is None:
-            if wlog:
-                wlen == 10.0**wlen
+    return(FluxConverter(infac / outfac, power, inlog=inlog, outlog=outlog,
+                         wlog=wlog, flog=flog, wscale=_WLEN_UNITS[wunit]))
 
-            if wunit == "micron":
-                wlen = 1e-6 * wlen
-            elif wunit == "nm":
-                wlen = 1e-9 * wlen
-            elif wunit == "angstr":
-                wlen = 1e-10 * wlen
-            elif wunit == "cm":
-                wlen = 1e-2 * wlen
 
-            freq = SPEED_OF_LIGHT/wlen
-        else:
-            if flog:
-                freq = 10.0**freq
-#            if funit is not "hertz":
-#                print("CONVERT_FLUX: ERROR not implemented frequency unit supplied! Returning -1")
-#                return(-1)
+def get_converter(inunit, outunit, wunit="micron", inlog=False, outlog=False,
+                  wlog=False, flog=False):
+    """
+    Return a FluxConverter for the given combination of units and flags.
+    The converters are cached, so this is cheap to call repeatedly.
+
+    Parameters
+    ----------
+    inunit : TYPE str
+        DESCRIPTION. Input unit: 'mJy', 'Jy', 'W/m^2' or 'erg/s/cm^2'
+    outunit : TYPE str
+        DESCRIPTION. Output unit: 'mJy', 'Jy', 'W/m^2' or 'erg/s/cm^2'
+    wunit : TYPE str, optional
+        DESCRIPTION. The default is "micron". Wavelength unit: 'micron',
+        'nm', 'angstr', 'cm' or 'm'
+    inlog : TYPE bool, optional
+        DESCRIPTION. The default is False. Input flux is log10
+    outlog : TYPE bool, optional
+        DESCRIPTION. The default is False. Return log10 of the flux
+    wlog : TYPE bool, optional
+        DESCRIPTION. The default is False. Wavelength is log10
+    flog : TYPE bool, optional
+        DESCRIPTION. The default is False. Frequency is log10
+
+    Returns
+    -------
+    FluxConverter, or -1 for unknown units
 
-        # --- now convert to nufnu with W/m^2 or Jy
-        if inunit == "mJy":
-            flux = flux * 1.0e-29 * freq
-        elif inunit == "Jy":
-            flux = flux * 1.0e-26 * freq
-        elif inunit == "W/m^2":
-            flux = flux * 1.0e26 / freq
-        elif inunit == "erg/s/cm^2":
-            flux = flux * 1.0e23 / freq
+    """
+
+    if inunit not in _FLUX_UNITS or outunit not in _FLUX_UNITS:
+        print("CONVERT_FLUX: ERROR unknown flux unit supplied! Returning -1")
+        return(-1)
+
+    if wunit not in _WLEN_UNITS:
+        print("CONVERT_FLUX: ERROR unknown wavelength unit supplied! "
+              + "Returning -1")
+        return(-1)
+
+    return(_cached_converter(inunit, outunit, wunit, bool(inlog),
+                             bool(outlog), bool(wlog), bool(flog)))
+
+
+def convert_flux(flux, inunit, outunit, inlog=False, outlog=False,
+                 wlen=None, freq=None, wunit="micron",
+                 wlog=False, flog=False, out=None):
 
-        if outunit == "erg/s/cm^2" or outunit == "mJy":
-            flux = flux * 1e3
+    """
+    Convert a flux or flux density into a flux or flux density of a different
+    unit.
+    allowed input/output units are 'mJy', 'Jy', 'W/m^2' or erg/s/cm^2' and for
+    wavelength either 'micron', 'nm', 'angstr', 'cm', 'm'. For frequency, the
+    unit has to be 'Hertz'. The result is written into the array out if
+    given. For many calls with the same units, use get_converter directly
+    """
 
-    if outlog == True:
-        flux == np.log10(flux)
+    conv = get_converter(inunit, outunit, wunit, inlog, outlog, wlog, flog)
 
-    return(flux)
+    if conv == -1:
+        return(-1)
 
+    return(conv(flux, wlen=wlen, freq=freq, out=out))
@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.2.2"
 
 """
 HISTORY:
     - 2020-01-15: created by Daniel Asmus
+    - 2026-10-18: redshift input (z, cosmo) through tabulated d_L(z)
+    - 2026-10-18: fused single pass kernels with out= and dtype=; lum2flux
+                  with flux_unit='W/m^2' and lum2fnu with fnu_unit='mJy'
+                  fixed (both were off by a factor 1e6)
+    - 2026-10-18: out= aliasing an input that is read more than once fixed
+    - 2026-10-18: dist optional when z is given
 
 
 NOTES:
-    -
+    - all conversions are products of powers of the inputs and a constant,
+      e.g., L = 4 pi (3.086e24 dist)^2 * 1e-23 fnu * c / wlen. The constant
+      is folded once and the result is accumulated in the output array in
+      place (in log space if any input or the output is logarithmic), so no
+      temporary arrays of the input size are created
+    - with dtype=np.float32 the memory is halved; linear luminosities in
+      erg/s exceed the float32 range, so use log_lum=True in this case
 
 TO-DO:
     -
@@ -18,131 +30,206 @@ TO-DO:
 
 import numpy as np
 
+from .cosmology import lum_dist as _lum_dist
+
 
 SPEED_OF_LIGHT = 2.99792458e8  # m/s
 
-def lum2fnu(lum, dist, wlen, log_fnu=False, log_dist=False, log_lum=True,
-            fnu_unit='Jy', log_wlen=False):
+# --- constants of the conversions as used since the first version
+_LOG_4PI_MPC2 = np.log10(4.0 * np.pi) + 2*np.log10(3.086e24)
+_LOG_NU_MICRON = np.log10(2.99792e8) + 6
+
+
+def _resolve_dist(dist, z, cosmo, log_dist, name):
+    """
+    Return the distance (and its log flag) either as given or, if redshifts
+    z are given, from the tabulated luminosity distance of cosmo. Prints an
+    error and returns None if neither is given
     """
-    Convert a luminosity into flux density in Jy (or in 'mJy') for a given
-    distance in Mpc and wavelength in [micron]
 
+    if z is None:
+        if dist is None:
+            print("MISC." + name + ": ERROR: neither dist nor z given. "
+                  + "Return -1! ")
+        return(dist, log_dist)
+
+    return(_lum_dist(z, cosmo=cosmo), False)
+
+
+def _fused_product(terms, logconst, log_out, out=None, dtype=None):
+    """
+    Return 10**logconst * prod(x**p) (or its log10 if log_out) for the terms
+    (x, p, x_is_log) with p in (-2, -1, 1, 2), computed in place in out
     """
 
+    if out is None:
+        shape = np.broadcast_shapes(*[np.shape(x) for x, _, _ in terms])
+        out = np.empty(shape, dtype=dtype if dtype is not None else float)
 
-    if log_wlen == False:
-        wlen = np.log10(wlen)
+    lin = [(x, p) for x, p, islog in terms if not islog]
+    logs = [(x, p) for x, p, islog in terms if islog]
 
-    freq = np.log10(2.99792e8) - wlen + 6
+    # --- out may be one of the inputs. Only the first linear input read
+    #     exactly once (|p| == 1) is safe, it is consumed in the first
+    #     elementwise step; all other aliased inputs are copied
+    lin = [(x.copy() if (i > 0 or abs(p) != 1) and np.shares_memory(out, x)
+            else x, p) for i, (x, p) in enumerate(lin)]
+    logs = [(x.copy() if np.shares_memory(out, x) else x, p)
+            for x, p in logs]
 
-    if log_dist == False:
-        dist = np.log10(dist)
+    # --- product of the linear inputs
+    if len(lin) > 0:
+        x, p = lin[0]
 
+        if p > 0:
+            np.copyto(out, x, casting="unsafe")
+        else:
+            np.divide(1.0, x, out=out, casting="unsafe")
 
-    if log_lum == False:
-        lum = np.log10(lum)
+        if abs(p) == 2:
+            (np.multiply if p > 0 else np.divide)(out, x, out=out,
+                                                  casting="unsafe")
 
-    nufnu  = lum - np.log10(4.0 * np.pi) - 2*dist - 2*np.log10(3.086e24)
+        for x, p in lin[1:]:
+            for i in range(abs(p)):
+                (np.multiply if p > 0 else np.divide)(out, x, out=out,
+                                                      casting="unsafe")
 
-    fnu = nufnu - freq + 23
+        # --- purely linear: only the constant is left
+        if len(logs) == 0 and not log_out:
+            np.multiply(out, 10.0**logconst, out=out, casting="unsafe")
+            return(out if out.ndim > 0 else out[()])
 
-    if fnu_unit == 'mJy':
-        fnu = fnu - 3
+        np.log10(out, out=out)
+
+    else:
+        out.fill(0)
 
-    if log_fnu == False:
-        fnu = 10.0**fnu
+    # --- sum of the logarithmic inputs
+    for x, p in logs:
+        for i in range(abs(p)):
+            (np.add if p > 0 else np.subtract)(out, x, out=out,
+                                               casting="unsafe")
 
-    return(fnu)
+    np.add(out, logconst, out=out, casting="unsafe")
 
+    if not log_out:
+        np.power(10.0, out, out=out)
 
+    return(out if out.ndim > 0 else out[()])
 
-def lum2flux(lum, dist, log_flux=False, log_dist=False, log_lum=True,
-            flux_unit='erg/s/cm^2'):
+
+def lum2fnu(lum, dist=None, wlen=None, log_fnu=False, log_dist=False,
+            log_lum=True, fnu_unit='Jy', log_wlen=False, z=None, cosmo=None,
+            out=None, dtype=None):
     """
-    Convert a given luminosity into flux for a given distance in [Mpc]
+    Convert a luminosity into flux density in Jy (or in 'mJy') for a given
+    distance in Mpc and wavelength in [micron]. Instead of dist, redshifts z
+    can be given, which are converted with the luminosity distance of cosmo
+    (cosmology.DistanceTable, default: flat with H0=70, Om0=0.3); one of
+    dist or z must be given, otherwise -1 is returned. The result is written
+    into out if given, otherwise into a new array of dtype (default float64)
+
     """
 
+    dist, log_dist = _resolve_dist(dist, z, cosmo, log_dist, "LUM2FNU")
 
-    if log_dist == False:
-        dist = np.log10(dist)
+    if dist is None:
+        return(-1)
 
-    if log_lum == False:
-        lum = np.log10(lum)
+    if wlen is None:
+        print("MISC.LUM2FNU: ERROR: no wlen given. Return -1! ")
+        return(-1)
 
-    flux  = lum - np.log10(4.0 * np.pi) - 2*dist - 2*np.log10(3.086e24)
+    # --- fnu = lum * wlen / (4 pi dist^2 nu_micron) * 1e23
+    logconst = -_LOG_4PI_MPC2 - _LOG_NU_MICRON + 23
+
+    if fnu_unit == 'mJy':
+        logconst = logconst + 3
+
+    return(_fused_product([(lum, 1, log_lum), (wlen, 1, log_wlen),
+                           (dist, -2, log_dist)], logconst, log_fnu,
+                          out=out, dtype=dtype))
+
+
+
+def lum2flux(lum, dist=None, log_flux=False, log_dist=False, log_lum=True,
+            flux_unit='erg/s/cm^2', z=None, cosmo=None, out=None,
+            dtype=None):
+    """
+    Convert a given luminosity into flux for a given distance in [Mpc] or
+    redshift z (see lum2fnu)
+    """
+
+    dist, log_dist = _resolve_dist(dist, z, cosmo, log_dist, "LUM2FLUX")
+
+    if dist is None:
+        return(-1)
+
+    logconst = -_LOG_4PI_MPC2
 
     if flux_unit == 'W/m^2':
-        flux = flux + 3
+        logconst = logconst - 3
     elif flux_unit != 'erg/s/cm^2':
         print("MISC.FLUX2LUM: ERROR: flux_unit not understood: "+ flux_unit +
               " Return -1! ")
         return(-1)
 
-    if log_flux == False:
-        flux = 10.0**flux
+    return(_fused_product([(lum, 1, log_lum), (dist, -2, log_dist)],
+                          logconst, log_flux, out=out, dtype=dtype))
 
-    return(flux)
 
 
-
-def fnu2lum(fnu, dist, wlen, log_fnu=False, log_dist=False, log_lum=True,
-            fnu_unit='Jy', log_wlen=False):
+def fnu2lum(fnu, dist=None, wlen=None, log_fnu=False, log_dist=False,
+            log_lum=True, fnu_unit='Jy', log_wlen=False, z=None, cosmo=None,
+            out=None, dtype=None):
     """
     Convert a flux density in Jy (or in 'mJy') into luminosity for a given
-    distance in Mpc and wavelength in [micron]
+    distance in Mpc or redshift z (see lum2fnu) and wavelength in [micron]
     """
 
+    dist, log_dist = _resolve_dist(dist, z, cosmo, log_dist, "FNU2LUM")
 
-    if log_wlen == False:
-        wlen = np.log10(wlen)
+    if dist is None:
+        return(-1)
 
-    freq = np.log10(2.99792e8) - wlen + 6
+    if wlen is None:
+        print("MISC.FNU2LUM: ERROR: no wlen given. Return -1! ")
+        return(-1)
 
-    if log_fnu == False:
-        fnu = np.log10(fnu)
+    # --- lum = 4 pi dist^2 * fnu * 1e-23 * nu_micron / wlen
+    logconst = _LOG_4PI_MPC2 + _LOG_NU_MICRON - 23
 
     if fnu_unit == 'mJy':
-        fnu = fnu - 3
-
-    nufnu = fnu + freq - 23
-
-    if log_dist == False:
-        dist = np.log10(dist)
+        logconst = logconst - 3
 
-    lum = nufnu + np.log10(4.0 * np.pi) + 2*dist + 2*np.log10(3.086e24)
+    return(_fused_product([(fnu, 1, log_fnu), (dist, 2, log_dist),
+                           (wlen, -1, log_wlen)], logconst, log_lum,
+                          out=out, dtype=dtype))
 
-    if log_lum == False:
 
-        lum = 10.0**lum
 
-    return(lum)
-
-
-
-def flux2lum(flux, dist, log_flux=False, log_dist=False, log_lum=True,
-            flux_unit='erg/s/cm^2', log_wlen=False):
+def flux2lum(flux, dist=None, log_flux=False, log_dist=False, log_lum=True,
+            flux_unit='erg/s/cm^2', log_wlen=False, z=None, cosmo=None,
+            out=None, dtype=None):
     """
-    Convert a given flux into luminosity for a given distance in [Mpc]
+    Convert a given flux into luminosity for a given distance in [Mpc] or
+    redshift z (see lum2fnu)
     """
 
-    if log_flux == False:
-        flux = np.log10(flux)
+    dist, log_dist = _resolve_dist(dist, z, cosmo, log_dist, "FLUX2LUM")
+
+    if dist is None:
+        return(-1)
+
+    logconst = _LOG_4PI_MPC2
 
     if flux_unit == 'W/m^2':
-        flux = flux + 3
+        logconst = logconst + 3
     elif flux_unit != 'erg/s/cm^2':
         print("MISC.FLUX2LUM: ERROR: flux_unit not understood: "+ flux_unit +
               " Return -1! ")
         return(-1)
 
-    if log_dist == False:
-        dist = np.log10(dist)
-
-    lum = flux + np.log10(4.0 * np.pi) + 2*dist + 2*np.log10(3.086e24)
-
-    if log_lum == False:
-
-        lum = 10.0**lum
-
-    return(lum)
-
+    return(_fused_product([(flux, 1, log_flux), (dist, 2, log_dist)],
+                          logconst, log_lum, out=out, dtype=dtype))
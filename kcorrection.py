@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.2"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: coverage test for the whole redshift grid at once
+    - 2026-10-18: redshift grid sorted, KeyError for unknown filter names,
+                  all arguments but rest_filters and acceptable_hole required
+
+
+NOTES:
+    - a rest-frame template fnu(wlen_rest) is observed at redshift z as
+      (1+z) * fnu(wlen_obs/(1+z)) (distance dimming not included), so that
+      the K-correction of Hogg et al. (2002) for a filter is
+      K(z) = -2.5 log10(S(z) / S_rest), where S(z) is the synthetic flux
+      density of the redshifted template and S_rest the one of the template
+      at rest in the rest-frame filter
+    - the filter curve is shifted onto the template instead of the other way
+      round, so the cumulative integral of the template is built only once
+      for all redshifts and filters
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+
+from .filter_curve import (Filter, _cumulative_integrals,
+                           _integrate_piecewise_linear)
+
+
+def _coverage_zgrid(wlen, fwlen, zfac, acceptable_hole):
+    """
+    Return for every redshift factor zfac whether the sorted template wlen
+    covers the filter curve fwlen / zfac without holes larger than
+    acceptable_hole / zfac, like check_coverage(...)["valid"] for every z
+    """
+
+    fmin = np.nanmin(fwlen) / zfac
+    fmax = np.nanmax(fwlen) / zfac
+
+    if len(wlen) == 0:
+        return(np.zeros(len(zfac), dtype=bool))
+
+    covered = (fmin >= wlen[0]) & (fmax <= wlen[-1])
+
+    # --- largest spacing ending on a template point inside each filter
+    #     range: maxima of the spacings over the index ranges [jlo-1, hi-1)
+    lo = np.searchsorted(wlen, fmin, side="left")
+    hi = np.searchsorted(wlen, fmax, side="right")
+    jlo = np.maximum(lo, 1)
+
+    nonempty = hi > jlo
+
+    # --- a trailing 0 so that the range ends are valid reduceat indices
+    wdiffs = np.append(np.diff(wlen), 0.0)
+
+    bounds = np.column_stack([jlo - 1, hi - 1]).ravel()
+    bounds = np.where(np.repeat(nonempty, 2), bounds, 0)
+
+    max_hole = np.maximum.reduceat(wdiffs, bounds)[::2]
+    max_hole = np.where(nonempty, max_hole, 0.0)
+
+    return(covered & (max_hole <= acceptable_hole / zfac))
+
+
+def synthphot_zgrid(wavelen, fluxden, filters, zgrid, acceptable_hole=0.7):
+    """
+    Perform synthetic photometry of a rest-frame template wavelen, fluxden
+    redshifted to every redshift in zgrid, for a set of filters at once.
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Rest-frame wavelength array of the template
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density, fnu, array of the template
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters to evaluate. Tuples (fwlen, ftrans, ref_wlen[,
+        alpha]) are converted to Filter objects
+    zgrid : TYPE float array
+        DESCRIPTION. Redshifts
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the redshifted template in wavelength direction (in input
+        units)
+
+    Returns
+    -------
+    float array: synthetic flux densities (n_filters, n_redshifts) of the
+        redshifted template, NaN where the template does not (properly) cover
+        the filter
+
+    """
+
+    filters = [f if isinstance(f, Filter) else Filter(*f) for f in filters]
+    zgrid = np.atleast_1d(np.asarray(zgrid, dtype=float))
+
+    # ---- first exclude invalid data points and sort the template once
+    wavelen = np.asarray(wavelen)
+    fluxden = np.asarray(fluxden)
+
+    id = wavelen != 0
+    wlen = wavelen[id]
+    inten = fluxden[id]
+
+    id = np.argsort(wlen)
+    wlen = wlen[id]
+    inten = inten[id]
+
+    g = inten / wlen
+    c0, c1 = _cumulative_integrals(wlen, g)
+
+    zfac = 1 + zgrid
+
+    synflux = np.full((len(filters), len(zgrid)), np.nan)
+
+    for i, filt in enumerate(filters):
+
+        # --- the filter curve in the rest frame of the template for every z
+        knots = filt.fwlen[None, :] / zfac[:, None]
+
+        # --- coverage and hole test: holes scale with (1+z) in the observed
+        #     frame
+        valid = _coverage_zgrid(wlen, filt.fwlen, zfac, acceptable_hole)
+
+        if not valid.any():
+            continue
+
+        snu_ref = filt.ref_wlen**(-1*filt.alpha)
+
+        synflux[i, valid] = (zfac[valid] * snu_ref
+                             * _integrate_piecewise_linear(
+                                 wlen, g, c0, c1, knots[valid],
+                                 filt.ftrans / filt.norm))
+
+    return(synflux)
+
+
+#%%
+class KCorrTable:
+    """
+    Table of synthetic photometry and K-corrections of a rest-frame template
+    through a set of filters over a redshift grid, which can be queried at
+    arbitrary redshifts by linear interpolation
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Rest-frame wavelength array of the template
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density, fnu, array of the template
+    filters : TYPE list of Filter
+        DESCRIPTION. Observed-frame filters
+    zgrid : TYPE float array
+        DESCRIPTION. Redshift grid of the table (sorted and without duplicates
+        before use)
+    rest_filters : TYPE list of Filter, optional
+        DESCRIPTION. The default is None. Rest-frame filters, one per
+        observed-frame filter. By default the same filters are used
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the redshifted template in wavelength direction (in input
+        units)
+
+    """
+
+    def __init__(self, wavelen, fluxden, filters, zgrid, rest_filters=None,
+                 acceptable_hole=0.7):
+
+        filters = [f if isinstance(f, Filter) else Filter(*f)
+                   for f in filters]
+
+        if rest_filters is None:
+            rest_filters = filters
+
+        # --- the queries interpolate with np.interp
+        self.zgrid = np.unique(np.asarray(zgrid, dtype=float))
+        self.names = np.array([f.name if f.name is not None else str(i)
+                               for i, f in enumerate(filters)], dtype=str)
+
+        self.synflux = synthphot_zgrid(wavelen, fluxden, filters, self.zgrid,
+                                       acceptable_hole=acceptable_hole)
+
+        rest = synthphot_zgrid(wavelen, fluxden, rest_filters, [0.0],
+                               acceptable_hole=acceptable_hole)
+
+        self.restflux = rest[:, 0]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.kcorr = -2.5 * np.log10(self.synflux
+                                         / self.restflux[:, None])
+
+    def __repr__(self):
+        return("KCorrTable(filters={}, z={}..{}, n_z={})".format(
+            list(self.names), self.zgrid[0], self.zgrid[-1],
+            len(self.zgrid)))
+
+    @classmethod
+    def _empty(cls):
+        """
+        Return a table without any content, to be filled by load
+        """
+
+        return(cls.__new__(cls))
+
+    def _index(self, filt):
+        if isinstance(filt, str):
+            id = np.where(self.names == filt)[0]
+
+            if len(id) == 0:
+                raise KeyError("KCORRECTION: unknown filter " + filt)
+
+            return(id[0])
+
+        return(filt)
+
+    def kcorrection(self, z, filt=None):
+        """
+        Return the K-correction at the redshift(s) z for the filter filt (name
+        or index) or for all filters (n_filters, n_z) if filt is None. NaN is
+        returned outside the table or where the template does not cover the
+        filter
+        """
+
+        return(self._query(self.kcorr, z, filt))
+
+    def flux(self, z, filt=None):
+        """
+        Return the synthetic flux density of the redshifted template at the
+        redshift(s) z for the filter filt (name or index) or for all filters
+        """
+
+        return(self._query(self.synflux, z, filt))
+
+    __call__ = kcorrection
+
+    def _query(self, table, z, filt):
+
+        if filt is not None:
+            return(np.interp(z, self.zgrid, table[self._index(filt)],
+                             left=np.nan, right=np.nan))
+
+        return(np.array([np.interp(z, self.zgrid, t, left=np.nan,
+                                   right=np.nan) for t in table]))
+
+    def save(self, fname):
+        """
+        Store the table in an .npz file
+        """
+
+        np.savez(fname, zgrid=self.zgrid, names=self.names,
+                 synflux=self.synflux, restflux=self.restflux,
+                 kcorr=self.kcorr)
+
+    @classmethod
+    def load(cls, fname):
+        """
+        Load a table stored with save
+        """
+
+        kt = cls._empty()
+
+        with np.load(fname, allow_pickle=False) as f:
+            kt.zgrid = f["zgrid"]
+            kt.names = f["names"]
+            kt.synflux = f["synflux"]
+            kt.restflux = f["restflux"]
+            kt.kcorr = f["kcorr"]
+
+        return(kt)
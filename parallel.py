@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: stop at the first failing chunk and report once
+
+
+NOTES:
+    - parallel_apply evaluates an elementwise function (convert_flux,
+      jansky2erg, micron2hertz, diffration_limit, fnu2lum, ...) chunk by
+      chunk along the first axis of the broadcast inputs. The chunks are
+      handed to a thread pool (numpy releases the GIL in the ufunc loops)
+      and every result is written into one preallocated output array, so the
+      temporaries of the function only have the size of a chunk
+    - functions with an out= parameter write directly into the output
+    - inputs smaller than one chunk are evaluated directly without a pool
+    - the first chunk is always evaluated before the pool is started, so
+      errors that do not depend on the data (e.g., an unknown unit) are
+      reported once by func. If a later chunk fails, the chunks that have
+      not started yet are cancelled
+
+TO-DO:
+    -
+"""
+
+
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# --- default settings, see set_parallel_defaults
+_defaults = {"workers": None, "chunk_size": 65536}
+
+
+def set_parallel_defaults(workers=None, chunk_size=None):
+    """
+    Set the default number of threads (None: number of cores) and the chunk
+    size (number of elements) of parallel_apply
+    """
+
+    _defaults["workers"] = workers
+
+    if chunk_size is not None:
+        _defaults["chunk_size"] = int(chunk_size)
+
+
+def get_parallel_defaults():
+    """
+    Return the default number of threads and chunk size of parallel_apply
+    """
+
+    return(dict(_defaults))
+
+
+def _accepts_out(func):
+    try:
+        return("out" in inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return(False)
+
+
+def parallel_apply(func, *args, out=None, dtype=None, workers=None,
+                   chunk_size=None, **kwargs):
+    """
+    Evaluate the elementwise function func(*args, **kwargs) on large arrays
+    in chunks on a pool of threads, writing into one output array
+
+    Parameters
+    ----------
+    func : TYPE function
+        DESCRIPTION. Elementwise function, e.g., convert_flux or fnu2lum
+    *args, **kwargs : TYPE
+        DESCRIPTION. Arguments of func. Arrays (and lists) are broadcast
+        against each other and split into chunks, all other arguments (unit
+        strings, flags, scalars) are passed on unchanged
+    out : TYPE float array, optional
+        DESCRIPTION. The default is None. Output array with the broadcast
+        shape of the array arguments
+    dtype : TYPE dtype, optional
+        DESCRIPTION. The default is None. dtype of the output array if out is
+        not given (default: the dtype of the first chunk result)
+    workers : TYPE int, optional
+        DESCRIPTION. The default is None. Number of threads (default: see
+        set_parallel_defaults)
+    chunk_size : TYPE int, optional
+        DESCRIPTION. The default is None. Number of elements per chunk
+        (default: see set_parallel_defaults)
+
+    Returns
+    -------
+    float array: the result of func for the whole input, or -1 if func
+        returns -1 (error)
+
+    """
+
+    if workers is None:
+        workers = _defaults["workers"] or os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = _defaults["chunk_size"]
+
+    # --- find the array arguments and their common shape
+    args = [np.asarray(a) if isinstance(a, list) else a for a in args]
+    kwargs = {k: np.asarray(v) if isinstance(v, list) else v
+              for k, v in kwargs.items()}
+
+    isarr = [isinstance(a, np.ndarray) and a.ndim > 0 for a in args]
+    kisarr = {k: isinstance(v, np.ndarray) and v.ndim > 0
+              for k, v in kwargs.items()}
+
+    shapes = [a.shape for a, i in zip(args, isarr) if i] \
+        + [v.shape for k, v in kwargs.items() if kisarr[k]]
+
+    if len(shapes) == 0:
+        return(func(*args, out=out, **kwargs) if out is not None
+               else func(*args, **kwargs))
+
+    shape = np.broadcast_shapes(*shapes)
+
+    args = [np.broadcast_to(a, shape) if i else a
+            for a, i in zip(args, isarr)]
+    kwargs = {k: np.broadcast_to(v, shape) if kisarr[k] else v
+              for k, v in kwargs.items()}
+
+    # --- chunks along the first axis
+    nrow = shape[0]
+    rowsize = int(np.prod(shape[1:]))
+    step = max(1, chunk_size // max(rowsize, 1))
+
+    bounds = [(i, min(i + step, nrow)) for i in range(0, nrow, step)]
+
+    use_out = _accepts_out(func)
+
+    def _chunk_args(i0, i1):
+        cargs = [a[i0:i1] if i else a for a, i in zip(args, isarr)]
+        ckwargs = {k: v[i0:i1] if kisarr[k] else v
+                   for k, v in kwargs.items()}
+        return(cargs, ckwargs)
+
+    # --- chunks that failed; the remaining chunks are skipped
+    failed = []
+
+    def _run(i0, i1):
+        if len(failed) > 0:
+            return(0)
+
+        cargs, ckwargs = _chunk_args(i0, i1)
+
+        if use_out:
+            res = func(*cargs, out=out[i0:i1], **ckwargs)
+        else:
+            res = func(*cargs, **ckwargs)
+            if not (np.isscalar(res) and res == -1):
+                out[i0:i1] = res
+
+        if np.isscalar(res) and res == -1:
+            failed.append((i0, i1))
+            return(-1)
+
+        return(0)
+
+    # --- the first chunk fixes the output dtype if nothing is given
+    if out is None and dtype is None and not use_out:
+        cargs, ckwargs = _chunk_args(*bounds[0])
+        res = func(*cargs, **ckwargs)
+
+        if np.isscalar(res) and res == -1:
+            failed.append(bounds[0])
+        else:
+            res = np.asarray(res)
+            out = np.empty(shape, dtype=res.dtype)
+            out[bounds[0][0]:bounds[0][1]] = res
+
+    else:
+        if out is None:
+            out = np.empty(shape, dtype=dtype if dtype is not None
+                           else float)
+
+        # --- otherwise the first chunk alone, so that errors that do not
+        #     depend on the data stop before the pool is started
+        _run(*bounds[0])
+
+    bounds = bounds[1:]
+
+    if workers <= 1 or len(bounds) <= 1:
+        for i0, i1 in bounds:
+            if _run(i0, i1) == -1:
+                break
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run, i0, i1) for i0, i1 in bounds]
+
+            for fut in futures:
+                if fut.result() == -1:
+                    for f in futures:
+                        f.cancel()
+                    break
+
+    if len(failed) > 0:
+        print("PARALLEL_APPLY: ERROR " + getattr(func, "__name__", "func")
+              + " failed on the rows " + str(failed[0][0]) + " to "
+              + str(failed[0][1] - 1) + ". Returning -1")
+        return(-1)
+
+    return(out)
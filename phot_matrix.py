@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+
+
+NOTES:
+    - for a fixed spectral wavelength grid synthetic photometry is linear in
+      the flux densities, so a set of filters can be written as a sparse
+      (n_filters, n_wavelengths) matrix and applied to a whole model library
+      with a single matrix product
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+from scipy import sparse
+
+from .filter_curve import Filter
+
+
+class PhotMatrix:
+    """
+    Sparse synthetic photometry operator for a fixed spectral wavelength grid.
+    Filters that are not (properly) covered by the grid get an empty row and
+    return -1 like synthphot.
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array of the spectra the matrix is built for
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters to include, one matrix row per filter. Tuples
+        (fwlen, ftrans, ref_wlen[, alpha]) are converted to Filter objects
+    freq : TYPE bool, optional
+        DESCRIPTION. The default is False. Integrate in frequency space like
+        synthphot_freq instead of in wavelength space like synthphot
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+
+    """
+
+    def __init__(self, wavelen, filters=None, freq=False,
+                 ignore_incomplete=False, acceptable_hole=0.7):
+
+        self.wavelen = np.asarray(wavelen, dtype=float)
+        self.freq = freq
+
+        if filters is None:
+            filters = []
+
+        filters = [f if isinstance(f, Filter) else Filter(*f)
+                   for f in filters]
+
+        nw = len(self.wavelen)
+        nf = len(filters)
+
+        self.names = np.array([f.name if f.name is not None else str(i)
+                               for i, f in enumerate(filters)], dtype=str)
+        self.valid = np.zeros(nf, dtype=bool)
+
+        rows = []
+        cols = []
+        vals = []
+
+        for i, filt in enumerate(filters):
+
+            res = filt.grid_weights(self.wavelen,
+                                    ignore_incomplete=ignore_incomplete,
+                                    acceptable_hole=acceptable_hole,
+                                    freq=freq)
+
+            if not isinstance(res, tuple):
+                print("PHOT_MATRIX: filter " + self.names[i]
+                      + " not covered by the grid. Its row is left empty")
+                continue
+
+            idv, weights = res
+
+            self.valid[i] = True
+            rows.append(np.full(len(idv), i))
+            cols.append(idv)
+            vals.append(weights)
+
+        if nf > 0 and len(rows) > 0:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            vals = np.concatenate(vals)
+        else:
+            rows = cols = np.zeros(0, dtype=int)
+            vals = np.zeros(0)
+
+        self.matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(nf, nw))
+
+    def __repr__(self):
+        return("PhotMatrix(n_filters={}, n_wavelengths={}, freq={})".format(
+            self.matrix.shape[0], self.matrix.shape[1], self.freq))
+
+    def __call__(self, fluxden):
+        """
+        Return the synthetic flux densities for a spectrum (n_wavelengths) or
+        a stack of spectra (n_spectra, n_wavelengths) on the grid of the
+        matrix. The result has the shape (n_filters) or (n_spectra, n_filters)
+        """
+
+        fluxden = np.asarray(fluxden)
+
+        if fluxden.shape[-1] != self.matrix.shape[1]:
+            print("PHOT_MATRIX: ERROR flux array does not match the "
+                  + "wavelength grid of the matrix. Returning -1")
+            return(-1)
+
+        synflux = (self.matrix @ fluxden.T).T
+
+        synflux[..., ~self.valid] = -1
+
+        return(synflux)
+
+    def save(self, fname):
+        """
+        Store the matrix together with its wavelength grid in an .npz file
+        """
+
+        m = self.matrix
+        np.savez(fname, data=m.data, indices=m.indices, indptr=m.indptr,
+                 shape=np.array(m.shape), wavelen=self.wavelen,
+                 names=self.names, valid=self.valid,
+                 freq=np.array(self.freq))
+
+    @classmethod
+    def load(cls, fname, wavelen=None):
+        """
+        Load a matrix stored with save. If wavelen is given, it is verified
+        that the matrix was built for this wavelength grid (returns -1 if not)
+        """
+
+        with np.load(fname, allow_pickle=False) as f:
+
+            if wavelen is not None and not np.array_equal(
+                    np.asarray(wavelen, dtype=float), f["wavelen"]):
+                print("PHOT_MATRIX: ERROR stored matrix was built for a "
+                      + "different wavelength grid. Returning -1")
+                return(-1)
+
+            pm = cls(f["wavelen"], freq=bool(f["freq"]))
+            pm.names = f["names"]
+            pm.valid = f["valid"]
+            pm.matrix = sparse.csr_matrix((f["data"], f["indices"],
+                                           f["indptr"]),
+                                          shape=tuple(f["shape"]))
+
+        return(pm)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+
+
+NOTES:
+    - the filter weights on the spectral grid are computed once; the noise
+      realizations are drawn only for the pixels inside the filter, block by
+      block, and integrated with one matrix product per block
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+
+from .filter_curve import Filter, _grid_weights, _grid_weights_freq
+
+
+def synthphot_mc(wavelen, fluxden, fluxerr, fwlen, ftrans=None, ref_wlen=None,
+                 nreal=1000, percentiles=(16, 50, 84), block_size=1000,
+                 seed=None, freq=False, ignore_incomplete=False,
+                 acceptable_hole=0.7, alpha=-2):
+    """
+    Perform synthetic photometry like synthphot (or synthphot_freq) and
+    estimate its uncertainty from Monte Carlo realizations of the spectrum
+    with Gaussian per-pixel errors
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array of the spectrum
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density, fnu, array of the spectrum
+    fluxerr : TYPE float array
+        DESCRIPTION. 1 sigma uncertainty of the flux density per pixel
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or a Filter
+        object, in which case ftrans, ref_wlen and alpha are taken from it
+    ftrans : TYPE float array
+        DESCRIPTION. filter transfer function transmission
+    ref_wlen : TYPE float
+        DESCRIPTION. Reference wavelength (should normally be the effective
+        wavelength of the filter)
+    nreal : TYPE int, optional
+        DESCRIPTION. The default is 1000. Number of realizations
+    percentiles : TYPE tuple, optional
+        DESCRIPTION. The default is (16, 50, 84). Percentiles of the
+        realizations to return
+    block_size : TYPE int, optional
+        DESCRIPTION. The default is 1000. Maximum number of realizations held
+        in memory at once
+    seed : TYPE int, optional
+        DESCRIPTION. The default is None. Seed of the random number generator
+    freq : TYPE bool, optional
+        DESCRIPTION. The default is False. Integrate in frequency space like
+        synthphot_freq
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+    alpha : TYPE int, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum snu = fwlen**(-1*alpha)
+
+    Returns
+    -------
+    dict with the keys 'flux' (synthetic flux density of the spectrum
+        itself), 'mean', 'std', 'percentiles' (array) of the realizations and
+        'samples' (all realizations), or -1 if the spectrum does not cover the
+        filter
+
+    """
+
+    fluxden = np.asarray(fluxden, dtype=float)
+    fluxerr = np.asarray(fluxerr, dtype=float)
+
+    # --- filter weights on the spectral grid, computed only once
+    if isinstance(fwlen, Filter):
+        res = fwlen.grid_weights(wavelen, ignore_incomplete=ignore_incomplete,
+                                 acceptable_hole=acceptable_hole, freq=freq)
+    else:
+        fn = _grid_weights_freq if freq else _grid_weights
+        id = np.argsort(fwlen)
+        res = fn(wavelen, np.asarray(fwlen)[id], np.asarray(ftrans)[id],
+                 ref_wlen, ignore_incomplete=ignore_incomplete,
+                 acceptable_hole=acceptable_hole, alpha=alpha)
+
+    if not isinstance(res, tuple):
+        return(-1)
+
+    idv, weights = res
+
+    inten = fluxden[idv]
+    ierr = fluxerr[idv]
+
+    rng = np.random.default_rng(seed)
+
+    samples = np.zeros(nreal)
+
+    # --- draw and integrate the realizations block by block
+    for i in range(0, nreal, block_size):
+        nb = min(block_size, nreal - i)
+
+        real = rng.standard_normal((nb, len(idv)))
+        real *= ierr
+        real += inten
+
+        samples[i:i+nb] = real @ weights
+
+    result = {"flux": inten @ weights,
+              "mean": np.mean(samples),
+              "std": np.std(samples, ddof=1) if nreal > 1 else 0.0,
+              "percentiles": np.percentile(samples, percentiles),
+              "samples": samples}
+
+    return(result)
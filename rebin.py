@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: fill given per call, the cached operators of rebin_spectra
+                  are no longer modified
+
+
+NOTES:
+    - every wavelength point stands for a bin reaching half way to its
+      neighbours (the outermost bins are symmetric around their point). The
+      rebinned flux density of a target bin is the overlap weighted mean of
+      the source flux densities, so the integral of the flux density over
+      wavelength is conserved
+    - the overlaps only depend on the two grids; they are computed once as a
+      sparse (n_target, n_source) matrix and applied to any number of
+      spectra with one matrix product
+    - target bins that are not completely covered by the source grid are set
+      to fill
+
+TO-DO:
+    -
+"""
+
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+from .spectral_axis import SpectralAxis
+
+
+def _bin_edges(wlen):
+    """
+    Return the bin edges (n+1) for the sorted bin centres wlen (n)
+    """
+
+    wlen = np.asarray(wlen, dtype=float)
+
+    if len(wlen) == 1:
+        return(np.array([wlen[0], wlen[0]]))
+
+    mid = 0.5 * (wlen[1:] + wlen[:-1])
+
+    return(np.concatenate([[2 * wlen[0] - mid[0]], mid,
+                           [2 * wlen[-1] - mid[-1]]]))
+
+
+class Rebinner:
+    """
+    Flux-conserving resampling operator from a source wavelength grid onto a
+    target wavelength grid. The overlap weights are computed once and can be
+    applied to any spectrum (or stack of spectra) on the source grid, e.g.,
+    before synthphot_batch or a PhotMatrix on the target grid
+
+    Parameters
+    ----------
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array of the source spectra. Points with
+        wavelen = 0 are ignored like in synthphot
+    new_wlen : TYPE float array
+        DESCRIPTION. Wavelength array of the target grid in the same units
+    fill : TYPE float, optional
+        DESCRIPTION. The default is np.nan. Value of the target bins that are
+        not completely covered by the source grid
+
+    """
+
+    def __init__(self, wavelen, new_wlen, fill=np.nan):
+
+        axis = wavelen if isinstance(wavelen, SpectralAxis) \
+            else SpectralAxis(wavelen)
+
+        self.wavelen = axis.wavelen
+        self.new_wlen = np.asarray(new_wlen, dtype=float)
+        self.fill = fill
+
+        ns = len(self.wavelen)
+        nt = len(self.new_wlen)
+
+        # --- bin edges of both grids in increasing wavelength order
+        sid = axis.sort_index
+        tid = np.argsort(self.new_wlen)
+
+        sedges = _bin_edges(axis.wlen)
+        tedges = _bin_edges(self.new_wlen[tid])
+
+        # --- split the wavelength range at all edges of both grids; every
+        #     piece lies in exactly one source and one target bin
+        breaks = np.union1d(sedges, tedges)
+        lo = breaks[:-1]
+        hi = breaks[1:]
+        mid = 0.5 * (lo + hi)
+
+        si = np.searchsorted(sedges, mid) - 1
+        ti = np.searchsorted(tedges, mid) - 1
+
+        use = (si >= 0) & (si < len(sid)) & (ti >= 0) & (ti < nt)
+
+        # --- overlap fraction of the target bin width per source bin
+        twidth = np.diff(tedges)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vals = (hi - lo)[use] / twidth[ti[use]]
+
+        rows = tid[ti[use]]
+        cols = sid[si[use]]
+
+        self.matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(nt, ns))
+
+        # --- target bins completely inside the source grid
+        self.valid = np.zeros(nt, dtype=bool)
+
+        if len(sid) > 0:
+            self.valid[tid] = ((tedges[:-1] >= sedges[0])
+                               & (tedges[1:] <= sedges[-1]) & (twidth > 0))
+
+    def __repr__(self):
+        return("Rebinner(n_source={}, n_target={})".format(
+            self.matrix.shape[1], self.matrix.shape[0]))
+
+    def __call__(self, fluxden, fluxerr=None, fill=None):
+        """
+        Return the flux densities of a spectrum (n_source) or a stack of
+        spectra (n_spectra, n_source) on the target grid, i.e., with the
+        shape (n_target) or (n_spectra, n_target). If fluxerr is given, the
+        propagated (uncorrelated) uncertainties are returned as well. fill
+        overrides the fill value of the Rebinner for this call
+        """
+
+        if fill is None:
+            fill = self.fill
+
+        fluxden = np.asarray(fluxden, dtype=float)
+
+        if fluxden.shape[-1] != self.matrix.shape[1]:
+            print("REBIN: ERROR flux array does not match the source "
+                  + "wavelength grid. Returning -1")
+            return(-1)
+
+        newflux = (self.matrix @ fluxden.T).T
+        newflux[..., ~self.valid] = fill
+
+        if fluxerr is None:
+            return(newflux)
+
+        fluxerr = np.asarray(fluxerr, dtype=float)
+
+        newerr = np.sqrt((self.matrix.power(2) @ (fluxerr**2).T).T)
+        newerr[..., ~self.valid] = fill
+
+        return(newflux, newerr)
+
+
+# --- recently used operators of rebin_spectra, keyed by both grids
+_rebinner_cache = OrderedDict()
+_REBINNER_CACHE_SIZE = 16
+
+
+def rebin_spectra(wavelen, fluxden, new_wlen, fluxerr=None, fill=np.nan):
+    """
+    Resample one spectrum or a stack of spectra that share one wavelength
+    grid onto new_wlen, conserving the flux. The overlap weights of the
+    most recently used grid pairs are kept, so repeated calls for the same
+    grids only perform the matrix product
+
+    Parameters
+    ----------
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array of the spectra
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density of the spectrum (n_wavelengths) or the
+        spectra (n_spectra, n_wavelengths)
+    new_wlen : TYPE float array
+        DESCRIPTION. Wavelength array of the target grid in the same units
+    fluxerr : TYPE float array, optional
+        DESCRIPTION. The default is None. 1 sigma uncertainties of fluxden to
+        propagate
+    fill : TYPE float, optional
+        DESCRIPTION. The default is np.nan. Value of the target bins that are
+        not completely covered by the spectrum
+
+    Returns
+    -------
+    float array: flux densities on the target grid, (and their
+        uncertainties if fluxerr is given), -1 if fluxden does not match
+        wavelen
+
+    """
+
+    axis = wavelen if isinstance(wavelen, SpectralAxis) \
+        else SpectralAxis(wavelen)
+    new_axis = SpectralAxis(new_wlen)
+
+    key = axis.digest + new_axis.digest
+
+    if key in _rebinner_cache:
+        _rebinner_cache.move_to_end(key)
+        rebinner = _rebinner_cache[key]
+    else:
+        rebinner = Rebinner(axis, new_wlen)
+        _rebinner_cache[key] = rebinner
+
+        if len(_rebinner_cache) > _REBINNER_CACHE_SIZE:
+            _rebinner_cache.popitem(last=False)
+
+    return(rebinner(fluxden, fluxerr=fluxerr, fill=fill))
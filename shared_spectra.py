@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.1"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+    - 2026-10-18: error messages of synthphot collected per spectrum and
+                  printed by the calling process, shared wavelength grid
+                  wrapped in a SpectralAxis once per worker
+
+
+NOTES:
+    - the spectra are copied once into shared memory segments; worker
+      processes only receive small picklable handles and attach to the
+      segments once (pool initializer), so the photometry runs on views of
+      the shared arrays without any copies of the spectra
+    - the segments live as long as the SharedSpectralLibrary is open; use it
+      as a context manager or call close() to release them
+    - a wavelength grid shared by all spectra is wrapped in a SpectralAxis
+      once per worker, so its preprocessing and digest are computed once
+      and not for every spectrum
+    - the messages of synthphot are collected per spectrum, each distinct
+      message once, and printed with the spectrum index by the calling
+      process
+
+TO-DO:
+    -
+"""
+
+
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .filter_curve import Filter
+from .spectral_axis import SpectralAxis
+from .synthphot import synthphot, synthphot_freq
+
+
+class SharedArrayHandle:
+    """
+    Picklable reference to a numpy array in a shared memory segment
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+
+    def __repr__(self):
+        return("SharedArrayHandle(name={}, shape={}, dtype={})".format(
+            self.name, self.shape, self.dtype))
+
+    def attach(self):
+        """
+        Attach to the segment and return it together with a numpy view on it.
+        The segment has to be kept referenced as long as the view is used
+        """
+
+        shm = shared_memory.SharedMemory(name=self.name)
+        arr = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+        return(shm, arr)
+
+
+class SharedSpectralLibrary:
+    """
+    Library of spectra published in shared memory for parallel photometry
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array common to all spectra (n_wavelengths)
+        or one per spectrum (n_spectra, n_wavelengths)
+    fluxden : TYPE 2D float array
+        DESCRIPTION. Flux densities, fnu, of the spectra with the shape
+        (n_spectra, n_wavelengths)
+
+    """
+
+    def __init__(self, wavelen, fluxden):
+
+        self._shms = []
+        self.wavelen, self.wavelen_handle = self._publish(wavelen)
+        self.fluxden, self.fluxden_handle = self._publish(
+            np.atleast_2d(fluxden))
+
+    def _publish(self, arr):
+
+        arr = np.ascontiguousarray(arr)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        self._shms.append(shm)
+
+        view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        view[...] = arr
+
+        return(view, SharedArrayHandle(shm.name, arr.shape, arr.dtype))
+
+    def __len__(self):
+        return(self.fluxden_handle.shape[0])
+
+    def __repr__(self):
+        return("SharedSpectralLibrary(n_spectra={}, n_wavelengths={})".format(
+            len(self), self.fluxden_handle.shape[-1]))
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def handles(self):
+        """
+        Picklable handles (wavelen, fluxden) to pass to worker processes
+        """
+
+        return(self.wavelen_handle, self.fluxden_handle)
+
+    def close(self):
+        """
+        Release and remove the shared memory segments
+        """
+
+        # --- the views have to be dropped before the segments can be closed
+        self.wavelen = None
+        self.fluxden = None
+
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+        self._shms = []
+
+
+# --- per worker state set by the pool initializer
+_worker_state = {}
+
+
+def _init_worker(handles, filters, opts):
+
+    shm_w, wavelen = handles[0].attach()
+    shm_f, fluxden = handles[1].attach()
+
+    # --- one axis for the shared grid, its weights are cached in the filters
+    if wavelen.ndim == 1:
+        wavelen = SpectralAxis(wavelen)
+
+    _worker_state.update({"shms": (shm_w, shm_f), "wavelen": wavelen,
+                          "fluxden": fluxden, "filters": filters,
+                          "opts": opts})
+
+
+def _phot_range(start, stop):
+    """
+    Worker task: photometry of the spectra start to stop of the attached
+    library, NaN where not available, and the list of messages
+    """
+
+    wavelen = _worker_state["wavelen"]
+    fluxden = _worker_state["fluxden"]
+    filters = _worker_state["filters"]
+    opts = _worker_state["opts"]
+
+    fn = synthphot_freq if opts["freq"] else synthphot
+
+    synflux = np.full((stop - start, len(filters)), np.nan)
+    messages = []
+
+    for i in range(start, stop):
+
+        wlen = wavelen if isinstance(wavelen, SpectralAxis) else wavelen[i]
+
+        # --- collect the per filter messages, each distinct one once
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for j, filt in enumerate(filters):
+                res = fn(wlen, fluxden[i], filt,
+                         ignore_incomplete=opts["ignore_incomplete"],
+                         acceptable_hole=opts["acceptable_hole"])
+
+                if not np.isscalar(res) or res != -1:
+                    synflux[i-start, j] = res
+
+        lines = [l.strip() for l in out.getvalue().splitlines()]
+        messages += ["SYNTHPHOT_SHARED: spectrum " + str(i) + ": " + l
+                     for l in dict.fromkeys(lines) if l != ""]
+
+    return(synflux, messages)
+
+
+def synthphot_shared(library, filters, workers=None, spectra_per_task=256,
+                     freq=False, ignore_incomplete=False, acceptable_hole=0.7):
+    """
+    Perform synthetic photometry for all spectra of a SharedSpectralLibrary
+    in a set of filters using a pool of worker processes
+
+    Parameters
+    ----------
+    library : TYPE SharedSpectralLibrary
+        DESCRIPTION. The published spectra
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters to evaluate. Tuples (fwlen, ftrans, ref_wlen[,
+        alpha]) are converted to Filter objects
+    workers : TYPE int, optional
+        DESCRIPTION. The default is None. Number of worker processes (None:
+        number of cores)
+    spectra_per_task : TYPE int, optional
+        DESCRIPTION. The default is 256. Number of spectra handed to a worker
+        at once
+    freq : TYPE bool, optional
+        DESCRIPTION. The default is False. Use synthphot_freq instead of
+        synthphot
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+
+    Returns
+    -------
+    float array: synthetic flux densities (n_spectra, n_filters), NaN where
+        not available
+
+    """
+
+    filters = [f if isinstance(f, Filter) else Filter(*f) for f in filters]
+
+    opts = {"freq": freq, "ignore_incomplete": ignore_incomplete,
+            "acceptable_hole": acceptable_hole}
+
+    nspec = len(library)
+    synflux = np.full((nspec, len(filters)), np.nan)
+
+    starts = list(range(0, nspec, spectra_per_task))
+    stops = [min(s + spectra_per_task, nspec) for s in starts]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(library.handles, filters,
+                                       opts)) as pool:
+
+        for start, stop, (res, messages) in zip(
+                starts, stops, pool.map(_phot_range, starts, stops)):
+            synflux[start:stop] = res
+
+            for message in messages:
+                print(message)
+
+    return(synflux)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+
+
+NOTES:
+    - a SpectralAxis assumes that its wavelength array is not changed after
+      creation; all derived quantities are computed on first use and cached
+
+TO-DO:
+    -
+"""
+
+
+import hashlib
+
+import numpy as np
+
+from .freq_wave_conversions import micron2hertz as _micron2hertz
+
+
+def _simpson_weights(x):
+    """
+    Return the weights w of the composite Simpson rule on the (sorted) grid x,
+    so that w @ y reproduces simps(y, x) for any y sampled on x
+    """
+
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    w = np.zeros(n)
+
+    if n < 2:
+        return(w)
+
+    h = np.diff(x)
+
+    if n == 2:
+        w[:] = 0.5 * h[0]
+        return(w)
+
+    # --- composite Simpson over the largest odd number of points
+    m = n if n % 2 == 1 else n - 1
+
+    h0 = h[0:m-1:2]
+    h1 = h[1:m-1:2]
+    hsum = h0 + h1
+
+    w[0:m-2:2] += hsum / 6.0 * (2.0 - h1 / h0)
+    w[1:m-1:2] += hsum / 6.0 * hsum**2 / (h0 * h1)
+    w[2:m:2] += hsum / 6.0 * (2.0 - h0 / h1)
+
+    # --- for an even number of points correct the last interval like scipy
+    if n % 2 == 0:
+        h0 = h[-2]
+        h1 = h[-1]
+        w[-1] += (2 * h1**2 + 3 * h0 * h1) / (6 * (h0 + h1))
+        w[-2] += (h1**2 + 3 * h0 * h1) / (6 * h0)
+        w[-3] -= h1**3 / (6 * h0 * (h0 + h1))
+
+    return(w)
+
+
+class SpectralAxis:
+    """
+    Wavelength axis of a spectrum in [micron] that caches the validity mask
+    (wavelen != 0), the sort order, the frequency view and the integration
+    weights. It can be passed to synthphot, synthphot_freq, synthphot_batch,
+    synthphot_multi and Filter.grid_weights instead of the wavelength array,
+    so that repeated photometry on the same axis skips that preprocessing
+
+    Parameters
+    ----------
+    wavelen : TYPE float array
+        DESCRIPTION. Wavelength array of the spectrum in [micron]
+
+    """
+
+    def __init__(self, wavelen):
+
+        self.wavelen = np.asarray(wavelen)
+        self._cache = {}
+
+    def __len__(self):
+        return(len(self.wavelen))
+
+    def __repr__(self):
+        return("SpectralAxis(n_wavelengths={})".format(len(self.wavelen)))
+
+    def _cached(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return(self._cache[key])
+
+    @property
+    def valid(self):
+        """
+        Mask of the valid (non-zero) wavelengths
+        """
+        return(self._cached("valid", lambda: self.wavelen != 0))
+
+    @property
+    def sort_index(self):
+        """
+        Indices of the valid wavelengths in increasing wavelength order
+        """
+        def _sort():
+            idv = np.where(self.valid)[0]
+            return(idv[np.argsort(self.wavelen[idv])])
+
+        return(self._cached("sort_index", _sort))
+
+    @property
+    def wlen(self):
+        """
+        Valid wavelengths in increasing order
+        """
+        return(self._cached("wlen", lambda: self.wavelen[self.sort_index]))
+
+    @property
+    def freq_sort_index(self):
+        """
+        Indices of the valid wavelengths in increasing frequency order
+        """
+        return(self._cached("freq_sort_index", lambda: self.sort_index[::-1]))
+
+    @property
+    def freq(self):
+        """
+        Frequencies [Hz] of the valid wavelengths in increasing order
+        """
+        return(self._cached("freq",
+                            lambda: _micron2hertz(self.wlen[::-1])))
+
+    @property
+    def digest(self):
+        """
+        Content hash of the wavelength array, e.g., for cache keys
+        """
+        def _digest():
+            wavelen = np.ascontiguousarray(self.wavelen)
+            return((hashlib.blake2b(wavelen.view(np.uint8),
+                                    digest_size=16).hexdigest(),
+                    wavelen.dtype.str, wavelen.shape))
+
+        return(self._cached("digest", _digest))
+
+    def simpson_weights(self, i0=0, i1=None, freq=False):
+        """
+        Simpson integration weights for the sorted valid wavelengths (or
+        frequencies if freq) with the indices i0 to i1
+        """
+
+        x = self.freq if freq else self.wlen
+
+        if i1 is None:
+            i1 = len(x)
+
+        return(self._cached(("simpson", i0, i1, freq),
+                            lambda: _simpson_weights(x[i0:i1])))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__version__ = "1.0.0"
+
+"""
+HISTORY:
+    - 2026-10-18: created
+
+
+NOTES:
+    - the spectrum has to be sorted in wavelength (across all chunks); only
+      one chunk plus a few carried-over points are held in memory at a time
+    - the Simpson integral is carried over chunk boundaries, so the result is
+      the same as from synthphot for a spectrum that covers the filter
+    - for an incomplete coverage (ignore_incomplete=True) the filter is cut at
+      the exact edges of the spectrum and not at the nearest filter curve
+      points as in synthphot, because the spectrum edges are only known at
+      the end
+
+TO-DO:
+    -
+"""
+
+
+import numpy as np
+
+from .filter_curve import Filter
+from .spectral_axis import _simpson_weights
+
+
+def iter_spectrum_chunks(spectrum, chunk_size=1000000):
+    """
+    Yield (wavelength, flux density) chunks of at most chunk_size points from
+    a spectrum given as
+        - a file name of a .npy file with the shape (2, n_wavelengths), i.e.,
+          wavelengths in the first and flux densities in the second row, which
+          is memory-mapped
+        - a tuple (wavelen, fluxden) of arrays, memory maps or .npy file names
+        - an iterator of (wavelen, fluxden) chunks, which is passed through
+    """
+
+    if isinstance(spectrum, str):
+        spectrum = np.load(spectrum, mmap_mode="r")
+        wavelen = spectrum[0]
+        fluxden = spectrum[1]
+
+    elif isinstance(spectrum, tuple) and len(spectrum) == 2:
+        wavelen, fluxden = spectrum
+
+        if isinstance(wavelen, str):
+            wavelen = np.load(wavelen, mmap_mode="r")
+
+        if isinstance(fluxden, str):
+            fluxden = np.load(fluxden, mmap_mode="r")
+
+    else:
+        for wlen, inten in spectrum:
+            yield(np.asarray(wlen), np.asarray(inten))
+
+        return
+
+    npix = len(wavelen)
+
+    for i in range(0, npix, chunk_size):
+        yield(np.asarray(wavelen[i:i+chunk_size]),
+              np.asarray(fluxden[i:i+chunk_size]))
+
+
+def synthphot_stream(spectrum, fwlen, ftrans=None, ref_wlen=None,
+                     chunk_size=1000000, ignore_incomplete=False,
+                     acceptable_hole=0.7, alpha=-2):
+    """
+    Perform synthetic photometry like synthphot on a spectrum that is read in
+    chunks, e.g., from a memory-mapped .npy file, so that the memory use is
+    bounded by the chunk size and not by the length of the spectrum
+
+    Parameters
+    ----------
+    spectrum : TYPE str, tuple or iterator
+        DESCRIPTION. Spectrum sorted in wavelength, given either as .npy file
+        name, (wavelen, fluxden) tuple or iterator of (wavelen, fluxden)
+        chunks (see iter_spectrum_chunks)
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or a Filter
+        object, in which case ftrans, ref_wlen and alpha are taken from it
+    ftrans : TYPE float array
+        DESCRIPTION. filter transfer function transmission
+    ref_wlen : TYPE float
+        DESCRIPTION. Reference wavelength (should normally be the effective
+        wavelength of the filter)
+    chunk_size : TYPE int, optional
+        DESCRIPTION. The default is 1000000. Number of spectral points read at
+        once from files and arrays
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function. In that case the filter
+        is normalized over the part covered by the spectrum
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+    alpha : TYPE int, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum snu = fwlen**(-1*alpha)
+
+    Returns
+    -------
+    float: synthetic flux density in input units
+
+    """
+
+    if isinstance(fwlen, Filter):
+        filt = fwlen
+    else:
+        filt = Filter(fwlen, ftrans, ref_wlen, alpha=alpha)
+
+    fwlen = filt.fwlen
+    ftrans = filt.ftrans
+    fmin = fwlen[0]
+    fmax = fwlen[-1]
+
+    snu_ref = filt.ref_wlen**(-1*filt.alpha)
+
+    wmin = None
+    wlast = None
+    max_hole = 0.0
+    hole_wlen = np.nan
+
+    # --- running Simpson integral: cx, cy are the points not yet integrated
+    #     (starting at a pair boundary), px, py the point before them
+    synflux = 0.0
+    cx = np.zeros(0)
+    cy = np.zeros(0)
+    px = None
+    py = None
+
+    for wlen, inten in iter_spectrum_chunks(spectrum, chunk_size=chunk_size):
+
+        # ---- exclude invalid data points
+        id = wlen != 0
+        wlen = wlen[id]
+        inten = inten[id]
+
+        if len(wlen) == 0:
+            continue
+
+        if (np.any(wlen[1:] < wlen[:-1])
+            or (wlast is not None and wlen[0] < wlast)):
+
+            print("SYNTHPHOT_STREAM: ERROR spectrum not sorted in wavelength. "
+                  + "Returning -1")
+            return(-1)
+
+        if wmin is None:
+            wmin = wlen[0]
+
+        # --- track the largest hole inside the filter range
+        if wlast is not None:
+            wdiffs = np.diff(wlen, prepend=wlast)
+        else:
+            wdiffs = np.concatenate([[0.0], np.diff(wlen)])
+
+        wdiffs[(wlen < fmin) | (wlen > fmax)] = 0
+
+        ids = np.argmax(wdiffs)
+
+        if wdiffs[ids] > max_hole:
+            max_hole = wdiffs[ids]
+            hole_wlen = wlen[ids]
+
+        wlast = wlen[-1]
+
+        # --- apply the (not yet normalized) filter to the chunk
+        id = (wlen >= fmin) & (wlen <= fmax)
+
+        if not id.any():
+            continue
+
+        wlen = wlen[id]
+        integrand = (inten[id] * np.interp(wlen, fwlen, ftrans) / wlen
+                     * snu_ref)
+
+        x = np.concatenate([cx, wlen])
+        y = np.concatenate([cy, integrand])
+
+        # --- integrate all complete Simpson pairs and carry the rest over
+        if len(x) >= 3:
+            m = len(x) if len(x) % 2 == 1 else len(x) - 1
+
+            synflux += _simpson_weights(x[:m]) @ y[:m]
+
+            px = x[m-2]
+            py = y[m-2]
+            cx = x[m-1:]
+            cy = y[m-1:]
+
+        else:
+            cx = x
+            cy = y
+
+    if wmin is None:
+        print("SYNTHPHOT_STREAM: ERROR empty spectrum. Returning -1")
+        return(-1)
+
+    # --- close the integral: trapezoid for only two points in total or the
+    #     correction for the last interval as for an even number of points
+    if len(cx) == 2:
+        if px is None:
+            synflux += 0.5 * (cx[1] - cx[0]) * (cy[0] + cy[1])
+        else:
+            h0 = cx[0] - px
+            h1 = cx[1] - cx[0]
+            synflux += ((2 * h1**2 + 3 * h0 * h1) / (6 * (h0 + h1)) * cy[1]
+                        + (h1**2 + 3 * h0 * h1) / (6 * h0) * cy[0]
+                        - h1**3 / (6 * h0 * (h0 + h1)) * py)
+
+    # --- test whether spectrum covered the filter curve without any holes
+    covered = (fmin >= wmin) and (fmax <= wlast)
+
+    if ignore_incomplete is False:
+
+        if not covered:
+            print("ERROR: spectrum not covering whole filter curve. Abort...")
+            return(-1)
+
+        if max_hole > acceptable_hole:
+            print("ERROR: spectrum has a hole larger than allowed. Abort...")
+            print(max_hole, hole_wlen)
+            return(-1)
+
+    # --- normalize the filter function for the overlapping region
+    if covered:
+        norm = filt.norm
+    else:
+        lo = max(fmin, wmin)
+        hi = min(fmax, wlast)
+
+        if hi <= lo:
+            return(0.0)
+
+        # --- cut the filter exactly at the edges of the spectrum
+        id = (fwlen > lo) & (fwlen < hi)
+        nwlen = np.concatenate([[lo], fwlen[id], [hi]])
+        ntrans = np.interp(nwlen, fwlen, ftrans)
+
+        norm = (_simpson_weights(nwlen)
+                @ (ntrans / nwlen * nwlen**(-1*filt.alpha)))
+
+    return(synflux / norm)
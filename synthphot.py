@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.5.1"
 
 """
 HISTORY:
     - 2020-01-17: created by Daniel Asmus
+    - 2026-10-18: batched synthetic photometry for a stack of spectra added
+    - 2026-10-18: Filter objects accepted instead of fwlen, ftrans
+    - 2026-10-18: single pass photometry of one spectrum in many filters added
+    - 2026-10-18: vectorized coverage and hole test (check_coverage)
+    - 2026-10-18: SpectralAxis accepted instead of the wavelength array
+    - 2026-10-18: agreement of synthphot_multi with synthphot documented
 
 
 NOTES:
@@ -19,10 +25,14 @@ TO-DO:
 import numpy as np
 from scipy.integrate import simps
 
+from .filter_curve import (Filter, check_coverage, _check_coverage,
+                           _grid_weights, _cumulative_integrals,
+                           _integrate_piecewise_linear)
 from .freq_wave_conversions import micron2hertz as _micron2hertz
+from .spectral_axis import SpectralAxis
 
 
-def synthphot(wavelen, fluxden, fwlen, ftrans, ref_wlen,
+def synthphot(wavelen, fluxden, fwlen, ftrans=None, ref_wlen=None,
               ignore_incomplete=False,
               acceptable_hole=0.7, alpha=-2):
     """
@@ -31,12 +41,14 @@ def synthphot(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
     Parameters
     ----------
-    wavelen : TYPE float array
-        DESCRIPTION. Wavelength array of the spectrum
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array of the spectrum. A SpectralAxis caches
+        the sorting (and frequency conversion) for repeated calls
     fluxden : TYPE float array
         DESCRIPTION. Flux density, fnu, array of the spectrum
-    fwlen : TYPE float array
-        DESCRIPTION. filter transfer function wavelength array
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or a Filter
+        object, in which case ftrans, ref_wlen and alpha are taken from it
     ftrans : TYPE float array
         DESCRIPTION. filter transfer function transmission
     ref_wlen : TYPE float
@@ -58,37 +70,39 @@ def synthphot(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
     """
 
-   # ---- first exclude invalid data points
-    id = wavelen != 0
-    wlen = wavelen[id]
-    inten = fluxden[id]
+    # --- precompiled filter: only the final integral is left to do
+    if isinstance(fwlen, Filter):
+        res = fwlen.grid_weights(wavelen, ignore_incomplete=ignore_incomplete,
+                                 acceptable_hole=acceptable_hole)
 
-    # --- sort wavelength
-    id = np.argsort(wlen)
-    wlen = wlen[id]
-    inten = inten[id]
-    npix = len(wlen)
-
-    # --- test whether spectrum covers filter curve without any holes
-    if ignore_incomplete is False:
+        if not isinstance(res, tuple):
+            return(-1)
 
-        if ((np.nanmin(fwlen) < np.nanmin(wlen))
-            or (np.nanmax(fwlen) > np.nanmax(wlen))):
+        idv, weights = res
 
-            print("ERROR: spectrum not covering whole filter curve. Abort...")
-            return(-1)
+        return(np.asarray(fluxden)[idv] @ weights)
 
-        wdiffs = np.zeros(npix)
+    # --- the axis already knows the valid points and their sort order
+    if isinstance(wavelen, SpectralAxis):
+        wlen = wavelen.wlen
+        inten = np.asarray(fluxden)[wavelen.sort_index]
+        npix = len(wlen)
 
-        for i in np.arange(1, npix):
-            if (wlen[i] >= np.nanmin(fwlen) and wlen[i] <= np.nanmax(fwlen)):
-                wdiffs[i] = wlen[i] - wlen[i-1]
+    else:
+        # ---- first exclude invalid data points
+        id = wavelen != 0
+        wlen = wavelen[id]
+        inten = fluxden[id]
 
-        if (np.nanmax(wdiffs) > acceptable_hole):
+        # --- sort wavelength
+        id = np.argsort(wlen)
+        wlen = wlen[id]
+        inten = inten[id]
+        npix = len(wlen)
 
-            print("ERROR: spectrum has a hole larger than allowed. Abort...")
-            ids = np.nanargmax(wdiffs)
-            print(wdiffs[ids], wlen[ids])
+    # --- test whether spectrum covers filter curve without any holes
+    if ignore_incomplete is False:
+        if not _check_coverage(wlen, fwlen, acceptable_hole):
             return(-1)
 
 
@@ -130,7 +144,7 @@ def synthphot(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
 
 #%%
-def synthphot_freq(wavelen, fluxden, fwlen, ftrans, ref_wlen,
+def synthphot_freq(wavelen, fluxden, fwlen, ftrans=None, ref_wlen=None,
               ignore_incomplete=False,
               acceptable_hole=0.7, alpha=-2):
 
@@ -140,12 +154,14 @@ def synthphot_freq(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
     Parameters
     ----------
-    wavelen : TYPE float array
-        DESCRIPTION. Wavelength array of the spectrum
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array of the spectrum. A SpectralAxis caches
+        the sorting (and frequency conversion) for repeated calls
     fluxden : TYPE float array
         DESCRIPTION. Flux density, fnu, array of the spectrum
-    fwlen : TYPE float array
-        DESCRIPTION. filter transfer function wavelength array
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or a Filter
+        object, in which case ftrans, ref_wlen and alpha are taken from it
     ftrans : TYPE float array
         DESCRIPTION. filter transfer function transmission
     ref_wlen : TYPE float
@@ -167,44 +183,49 @@ def synthphot_freq(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
     """
 
+    # --- precompiled filter: only the final integral is left to do
+    if isinstance(fwlen, Filter):
+        res = fwlen.grid_weights(wavelen, ignore_incomplete=ignore_incomplete,
+                                 acceptable_hole=acceptable_hole, freq=True)
 
-    # ---- first exclude invalid data points
-    id = wavelen != 0
-    wlen = wavelen[id]
-    inten = fluxden[id]
-
-     # --- convert to frequency space
-    freq = _micron2hertz(wlen)
-    ffreq = _micron2hertz(fwlen)
+        if not isinstance(res, tuple):
+            return(-1)
 
-    # --- sort wavelength
-    id = np.argsort(freq)
-    freq = freq[id]
-    inten = inten[id]
-    npix = len(wlen)
+        idv, weights = res
 
-    id = np.argsort(ffreq)
-    ffreq = ffreq[id]
-    ftrans = ftrans[id]
+        return(np.asarray(fluxden)[idv] @ weights)
 
-    # --- test whether spectrum covers filter curve without any holes
-    if ignore_incomplete is False:
+    # --- the axis already knows the valid points and the frequency grid
+    if isinstance(wavelen, SpectralAxis):
+        wlen = wavelen.wlen
+        freq = wavelen.freq
+        inten = np.asarray(fluxden)[wavelen.freq_sort_index]
+        npix = len(wlen)
 
-        if ((np.nanmin(fwlen) < np.nanmin(wlen))
-            or (np.nanmax(fwlen) > np.nanmax(wlen))):
+    else:
+        # ---- first exclude invalid data points
+        id = wavelen != 0
+        wlen = wavelen[id]
+        inten = fluxden[id]
 
-            print("ERROR: spectrum not covering whole filter curve. Abort...")
-            return(-1)
+        # --- convert to frequency space
+        freq = _micron2hertz(wlen)
 
-        wdiffs = np.zeros(npix)
+        # --- sort wavelength
+        id = np.argsort(freq)
+        freq = freq[id]
+        inten = inten[id]
+        npix = len(wlen)
 
-        for i in np.arange(1, npix):
-            if (wlen[i] >= np.nanmin(fwlen) and wlen[i] <= np.nanmax(fwlen)):
-                wdiffs[i] = wlen[i] - wlen[i-1]
+    ffreq = _micron2hertz(fwlen)
 
-        if (np.nanmax(wdiffs) > acceptable_hole):
+    id = np.argsort(ffreq)
+    ffreq = ffreq[id]
+    ftrans = ftrans[id]
 
-            print("ERROR: spectrum has a hole larger than allowed. Abort...")
+    # --- test whether spectrum covers filter curve without any holes
+    if ignore_incomplete is False:
+        if not _check_coverage(np.sort(wlen), fwlen, acceptable_hole):
             return(-1)
 
 
@@ -239,3 +260,156 @@ def synthphot_freq(wavelen, fluxden, fwlen, ftrans, ref_wlen,
 
     return(synflux)
 
+
+#%%
+def synthphot_batch(wavelen, fluxden, fwlen, ftrans=None, ref_wlen=None,
+                    ignore_incomplete=False,
+                    acceptable_hole=0.7, alpha=-2):
+    """
+    Perform synthetic photometry on a stack of spectra that share one
+    wavelength grid for a given filter transfer function and reference
+    wavelength. The sorting, coverage check, filter normalization and
+    interpolation are done only once for the whole stack.
+
+    Parameters
+    ----------
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array common to all spectra (n_wavelengths)
+    fluxden : TYPE 2D float array
+        DESCRIPTION. Flux densities, fnu, of the spectra with the shape
+        (n_spectra, n_wavelengths)
+    fwlen : TYPE float array or Filter
+        DESCRIPTION. filter transfer function wavelength array or a Filter
+        object, in which case ftrans, ref_wlen and alpha are taken from it
+    ftrans : TYPE float array
+        DESCRIPTION. filter transfer function transmission
+    ref_wlen : TYPE float
+        DESCRIPTION. Reference wavelength (should normally be the effective
+        wavelength of the filter)
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectra not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectra in wavelength direction (in input units)
+    alpha : TYPE int, optional
+        DESCRIPTION. The default is -2. Power law index of the reference
+        spectrum snu = fwlen**(-1*alpha)
+
+    Returns
+    -------
+    float array: synthetic flux densities in input units, one per spectrum
+
+    """
+
+    fluxden = np.atleast_2d(fluxden)
+
+    if isinstance(fwlen, Filter):
+        res = fwlen.grid_weights(wavelen, ignore_incomplete=ignore_incomplete,
+                                 acceptable_hole=acceptable_hole)
+    else:
+        id = np.argsort(fwlen)
+        res = _grid_weights(wavelen, fwlen[id], ftrans[id], ref_wlen,
+                            ignore_incomplete=ignore_incomplete,
+                            acceptable_hole=acceptable_hole, alpha=alpha)
+
+    if not isinstance(res, tuple):
+        return(-1)
+
+    idv, weights = res
+
+    synflux = fluxden[:, idv] @ weights
+
+    return(synflux)
+
+
+#%%
+def synthphot_multi(wavelen, fluxden, filters, ignore_incomplete=False,
+                    acceptable_hole=0.7):
+    """
+    Perform synthetic photometry on one spectrum wavelen, fluxden for many
+    filters at once. The spectrum is sorted and validated only once and a
+    cumulative integral of it is built once, against which every filter curve
+    is evaluated (exact for a spectrum and filter curve that are linear
+    between their sampling points). synthphot leaves out the partial
+    spectral intervals at the filter edges, so the two differ by about 1e-3
+    (relative) for spectra sampled every 0.01 micron across micron wide
+    filters, roughly proportional to the spectral step (7e-3 at 0.05 micron,
+    2e-4 at 0.002 micron). Against a densely sampled reference
+    synthphot_multi is accurate to about 1e-4.
+
+    Parameters
+    ----------
+    wavelen : TYPE float array or SpectralAxis
+        DESCRIPTION. Wavelength array of the spectrum. A SpectralAxis caches
+        the sorting (and frequency conversion) for repeated calls
+    fluxden : TYPE float array
+        DESCRIPTION. Flux density, fnu, array of the spectrum
+    filters : TYPE list of Filter
+        DESCRIPTION. Filters to evaluate. Tuples (fwlen, ftrans, ref_wlen[,
+        alpha]) are converted to Filter objects
+    ignore_incomplete : TYPE bool, optional
+        DESCRIPTION. The default is False. Flag to allow the spectrum not
+        covering the whole filter transfer function
+    acceptable_hole : TYPE float, optional
+        DESCRIPTION. The default is 0.7. Maximum allowed spacing between two
+        points in the spectrum in wavelength direction (in input units)
+
+    Returns
+    -------
+    float array: synthetic flux densities in input units, one per filter. -1
+        for filters that are not (properly) covered unless ignore_incomplete
+    bool array: coverage flags, True where the spectrum covers the filter
+        curve without holes larger than acceptable_hole
+
+    """
+
+    filters = [f if isinstance(f, Filter) else Filter(*f) for f in filters]
+    nf = len(filters)
+
+    # ---- first exclude invalid data points and sort the spectrum once
+    if not isinstance(wavelen, SpectralAxis):
+        wavelen = SpectralAxis(wavelen)
+
+    wlen = wavelen.wlen
+    inten = np.asarray(fluxden)[wavelen.sort_index]
+
+    # --- cumulative integrals of fnu/wlen and of fnu over the spectrum
+    g = inten / wlen
+    c0, c1 = _cumulative_integrals(wlen, g)
+
+    synflux = np.full(nf, -1.0)
+    covered = np.zeros(nf, dtype=bool)
+
+    for i, filt in enumerate(filters):
+
+        fwlen = filt.fwlen
+        ftrans = filt.ftrans
+
+        # --- coverage and hole test for this filter only
+        covered[i] = check_coverage(wlen, fwlen,
+                                    acceptable_hole=acceptable_hole,
+                                    is_sorted=True)["valid"]
+
+        if not covered[i] and not ignore_incomplete:
+            continue
+
+        # --- normalize the filter function for the overlapping region
+        id = (fwlen >= wlen[0]) & (fwlen <= wlen[-1])
+
+        if id.sum() < 2:
+            continue
+
+        if id.all():
+            norm = filt.norm
+        else:
+            norm = simps(ftrans[id]/fwlen[id]*fwlen[id]**(-1*filt.alpha),
+                         fwlen[id])
+
+        snu_ref = filt.ref_wlen**(-1*filt.alpha)
+
+        synflux[i] = (_integrate_piecewise_linear(wlen, g, c0, c1, fwlen[id],
+                                                  ftrans[id] / norm)
+                      * snu_ref)
+
+    return(synflux, covered)
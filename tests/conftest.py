@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+Make the repository importable as the package miscellaneous (its name when
+installed), independent of the name of the checkout directory
+"""
+
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "miscellaneous" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "miscellaneous", os.path.join(_ROOT, "__init__.py"),
+        submodule_search_locations=[_ROOT])
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["miscellaneous"] = _module
+    _spec.loader.exec_module(_module)
+
+
+def _gauss_curve(cwlen, hwidth, npts=60):
+    fwlen = np.linspace(cwlen - hwidth, cwlen + hwidth, npts)
+    ftrans = np.exp(-0.5 * ((fwlen - cwlen) / (hwidth / 2.5))**2)
+    return(fwlen, ftrans)
+
+
+@pytest.fixture
+def filters():
+    """
+    A few smooth synthetic filter curves as Filter objects
+    """
+
+    from miscellaneous import Filter
+
+    return([Filter(*_gauss_curve(c, w), c, name=n) for n, c, w in
+            [("F3", 3.4, 0.5), ("F4", 4.6, 0.7), ("F11", 11.5, 3.0),
+             ("F22", 22.0, 3.0)]])
+
+
+@pytest.fixture
+def spectrum():
+    """
+    A smooth spectrum sampled every 0.01 micron from 1 to 30 micron
+    """
+
+    wlen = np.arange(1, 30, 0.01)
+    return(wlen, (wlen / 10)**1.5 * (1 + 0.3 * np.sin(3 * wlen)))
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from miscellaneous import synthphot, synthphot_files
+
+
+def test_messages_reported_per_file(tmp_path, spectrum, filters, capsys):
+    wlen, fnu = spectrum
+
+    full = str(tmp_path / "full.npy")
+    short = str(tmp_path / "short.npy")
+    np.save(full, np.array([wlen, fnu]))
+    np.save(short, np.array([wlen[wlen < 15], fnu[wlen < 15]]))
+
+    res = synthphot_files([full, short, str(tmp_path / "missing.npy")],
+                          filters, workers=0, progress=False)
+
+    assert np.isclose(res["F22"][0], synthphot(wlen, fnu, filters[3]))
+    assert np.isnan(res["F22"][1]) and np.isclose(
+        res["F3"][1], synthphot(wlen, fnu, filters[0]))
+    assert np.all(np.isnan([res[n][2] for n in ("F3", "F22")]))
+
+    out = capsys.readouterr().out.splitlines()
+
+    # --- one message for the short spectrum, one for the missing file
+    assert out[0] == ("SYNTHPHOT_FILES: " + short + ": ERROR: spectrum not "
+                      + "covering whole filter curve. Abort...")
+    assert out[1].startswith("SYNTHPHOT_FILES: WARNING could not read "
+                             + str(tmp_path / "missing.npy"))
+    assert len(out) == 2
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import iter_catalog_chunks, write_catalog_chunks
+
+
+def _read_npy_header(fname):
+    with open(fname, "rb") as f:
+        np.lib.format.read_magic(f)
+        return(np.lib.format.read_array_header_1_0(f))
+
+
+def test_non_ascii_csv(tmp_path):
+    fname = tmp_path / "cat.csv"
+    fname.write_text("name,w1\nNGC é,1.0\nESO ü,\n", encoding="utf-8")
+
+    chunks = list(iter_catalog_chunks(str(fname)))
+
+    assert list(chunks[0]["name"]) == ["NGC é", "ESO ü"]
+    assert chunks[0]["w1"][0] == 1.0
+    assert np.isnan(chunks[0]["w1"][1])
+
+
+def test_non_numeric_row_named(tmp_path):
+    fname = tmp_path / "cat.csv"
+    fname.write_text("name,w1\na,1.0\nb,2.0\nc,é\n", encoding="utf-8")
+
+    with pytest.raises(IOError, match="row 3: value 'é'"):
+        list(iter_catalog_chunks(str(fname), chunk_size=2))
+
+
+def test_npy_round_trip(tmp_path):
+    outname = str(tmp_path / "cat.npy")
+
+    # --- many columns give a long header
+    names = ["column_with_a_long_name_" + str(i) for i in range(40)]
+    chunks = [{n: np.arange(j * 7, j * 7 + 7, dtype=float) for n in names}
+              for j in range(3)]
+    for j, chunk in enumerate(chunks):
+        chunk["name"] = np.array(["src" + str(j * 7 + k) for k in range(7)])
+
+    nrows = write_catalog_chunks(chunks, outname, str_width=8)
+
+    shape, fortran, dtype = _read_npy_header(outname)
+    assert nrows == 21 and shape == (21,) and not fortran
+    assert dtype["name"] == np.dtype("U8")
+
+    data = np.load(outname)
+    assert np.array_equal(data[names[5]], np.arange(21))
+    assert data["name"][-1] == "src20"
+
+
+def test_too_long_string(tmp_path):
+    chunks = [{"name": np.array(["ab"])}, {"name": np.array(["abcdef"])}]
+
+    with pytest.raises(ValueError, match="row 2"):
+        write_catalog_chunks(chunks, str(tmp_path / "cat.npy"))
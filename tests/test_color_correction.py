@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import (ColorCorrectionTable, Filter, FilterLibrary,
+                           set_default_library, write_filter_library)
+
+
+def test_names_need_a_library(filters):
+    set_default_library(None)
+
+    with pytest.raises(IOError, match="no filter library set"):
+        ColorCorrectionTable(["F3"], alphas=[-2, 0, 2])
+
+
+def test_library_matches_filters(tmp_path, filters):
+    fname = str(tmp_path / "filters.bin")
+    write_filter_library(fname, {f.name: {"fwlen": f.fwlen,
+                                          "ftrans": f.ftrans}
+                                 for f in filters})
+    lib = FilterLibrary(fname)
+
+    # --- the library uses the effective wavelengths as ref_wlen
+    ref = ColorCorrectionTable([Filter(f.fwlen, f.ftrans,
+                                       lib.info(f.name)["eff_wlen"])
+                                for f in filters[:2]], alphas=[-2, 0, 2])
+
+    for library in (fname, lib):
+        ct = ColorCorrectionTable(["F3", "F4"], alphas=[-2, 0, 2],
+                                  library=library)
+
+        # --- the library stores the curves as float32
+        assert list(ct.names) == ["F3", "F4"]
+        assert np.allclose(ct.kfac, ref.kfac, rtol=1e-5)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+
+import numpy as np
+
+from miscellaneous import combine_measurements, combine_measurements_grouped
+
+
+def _code(warn):
+    if warn is None:
+        return(0)
+    if "Non-valid" in warn:
+        return(1)
+    if "ERROR" in warn:
+        return(-1)
+    return(2 if "upper" in warn else 3)
+
+
+def test_grouped_matches_single():
+    rng = np.random.default_rng(4)
+    n = 3000
+    groups = rng.integers(0, 700, n) * 3 - 5
+    vals = rng.normal(10, 2, n)
+    errs = np.abs(rng.normal(0.5, 0.3, n))
+    flags = rng.choice([-1, 0, 0, 0, 1, 2, 5], n)
+    vals[rng.random(n) < 0.08] = np.nan
+    errs[rng.random(n) < 0.08] = np.nan
+    errs[rng.random(n) < 0.05] = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        ids, val, err, flag, warn = combine_measurements_grouped(
+            vals, errs, flags, groups)
+
+        for k, g in enumerate(ids):
+            m = groups == g
+            res = combine_measurements(vals[m], errs[m], flags[m])
+
+            if res is None:
+                assert warn[k] == -2 and flag[k] == -1
+                continue
+
+            assert np.allclose([val[k], err[k]], res[:2], rtol=1e-12,
+                               equal_nan=True)
+            assert flag[k] == res[2]
+            assert warn[k] == _code(res[3])
+
+
+def test_grouped_empty():
+    ids, val, err, flag, warn = combine_measurements_grouped([])
+    assert len(ids) == len(val) == len(err) == len(flag) == len(warn) == 0
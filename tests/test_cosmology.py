@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import DistanceTable, lum_dist
+
+
+@pytest.mark.parametrize("Om0, Ode0", [(0.3, None), (0.3, 0.6), (0.3, 0.8)])
+def test_table_matches_quadrature(Om0, Ode0):
+    dt = DistanceTable(Om0=Om0, Ode0=Ode0, zmax=10)
+    z = np.array([1e-4, 0.01, 0.5, 1.0, 3.0, 9.9])
+
+    assert np.allclose(dt.lum_dist(z), dt.lum_dist_exact(z), rtol=1e-6)
+    assert dt.check_accuracy() < 1e-6
+    assert np.isnan(dt.lum_dist(11.0))
+
+
+def test_matches_astropy():
+    cosmology = pytest.importorskip("astropy.cosmology")
+
+    z = np.linspace(0.01, 5, 20)
+    ref = cosmology.FlatLambdaCDM(H0=70, Om0=0.3, Tcmb0=0).luminosity_distance(
+        z).value
+
+    assert np.allclose(lum_dist(z), ref, rtol=1e-6)
+
+
+def test_save_load(tmp_path):
+    dt = DistanceTable(H0=67.7, Om0=0.31)
+    fname = str(tmp_path / "dist.npz")
+    dt.save(fname)
+
+    z = np.array([0.1, 2.0])
+    assert np.array_equal(DistanceTable.load(fname).lum_dist(z),
+                          dt.lum_dist(z))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+
+import numpy as np
+
+from miscellaneous import DiskCache, synthphot
+
+
+def test_hit_returns_stored_result(tmp_path, spectrum, filters):
+    wlen, fnu = spectrum
+    cache = DiskCache(str(tmp_path))
+
+    ref = synthphot(wlen, fnu, filters[0])
+
+    assert cache.synthphot(wlen, fnu, filters[0]) == ref
+    assert cache.synthphot(wlen, fnu, filters[0]) == ref
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # --- other content, other entry
+    cache.synthphot(wlen, 2 * fnu, filters[0])
+    assert cache.misses == 2 and len(cache) == 2
+
+
+def test_arrays_and_defaults(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    calls = []
+
+    def func(x, scale=2.0):
+        calls.append(1)
+        return(np.asfortranarray(np.outer(x, x) * scale))
+
+    cached = cache.memoize(func)
+    x = np.arange(4.0)
+
+    res = cached(x)
+    assert np.array_equal(cached(x), res)
+    assert np.array_equal(cached(x, scale=2.0), res)
+    assert len(calls) == 1
+
+
+def test_corrupt_entry_recomputed(tmp_path, spectrum, filters):
+    wlen, fnu = spectrum
+    cache = DiskCache(str(tmp_path))
+    ref = cache.synthphot(wlen, fnu, filters[0])
+
+    for path in glob.glob(str(tmp_path / "*.bin")):
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+    assert cache.synthphot(wlen, fnu, filters[0]) == ref
+    assert cache.misses == 2
+
+
+def test_eviction_keeps_size_bound(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=20000)
+    cached = cache.memoize(lambda i: np.full(500, float(i)))
+
+    for i in range(20):
+        cached(i)
+
+    assert 0 < cache.size() <= 20000
+    assert np.all(cached(19) == 19)
+
+
+def test_module_version_changes_key(tmp_path, spectrum, filters,
+                                    monkeypatch):
+    import miscellaneous.filter_curve as filter_curve
+
+    wlen, fnu = spectrum
+    key = DiskCache(str(tmp_path)).key(synthphot, (wlen, fnu, filters[0]),
+                                       {})
+
+    # --- synthphot calls into filter_curve, a new version must not hit
+    monkeypatch.setattr(filter_curve, "__version__", "99.0.0")
+    cache = DiskCache(str(tmp_path))
+
+    assert cache.key(synthphot, (wlen, fnu, filters[0]), {}) != key
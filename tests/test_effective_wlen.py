@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from miscellaneous import (effective_wlen, effective_wlen_interp,
+                           effective_wlen_table)
+
+
+def test_table_matches_scalar(filters):
+    alphas = np.array([2.0, -3.0, 0.0])
+    table = effective_wlen_table(filters, alphas)
+
+    for filt, row in zip(filters, table):
+        ref = [effective_wlen(filt.fwlen, filt.ftrans, alpha=a)
+               for a in alphas]
+        assert np.allclose(row, ref, rtol=1e-12)
+
+
+def test_interp_unsorted_alphas(filters):
+    filt = filters[2]
+    alphas = np.array([3.0, -5.0, 1.0, -1.0, 5.0, 1.0, -3.0])
+    effective_wlen_table([filt], alphas)
+
+    # --- cached grid is sorted and unique
+    assert np.array_equal(filt._eff_wlen_table[0], np.unique(alphas))
+
+    query = np.array([-4.0, -1.0, 0.5, 4.5])
+    res = effective_wlen_interp(filt, query, alphas=alphas)
+
+    grid = np.linspace(-5, 5, 201)
+    ref = np.interp(query, grid, effective_wlen_table([filt], grid)[0])
+    assert np.allclose(res, ref, rtol=1e-2)
+    assert np.all(np.diff(res) < 0)
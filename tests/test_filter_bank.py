@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from miscellaneous import synthphot, synthphot_bank
+
+
+def _spec(wlen):
+    return((wlen / 10)**1.5 * (1 + 0.3 * np.sin(3 * wlen)))
+
+
+def test_bank_tolerance(spectrum, filters):
+    wlen, fnu = spectrum
+
+    res, covered = synthphot_bank(wlen, fnu, filters)
+    ref = np.array([synthphot(wlen, fnu, f) for f in filters])
+
+    # --- synthphot drops the partial intervals at the filter edges
+    assert np.all(covered)
+    assert np.allclose(res, ref, rtol=2e-3)
+
+    # --- both against a densely sampled reference
+    fine = np.arange(1, 30, 0.0005)
+    truth = np.array([synthphot(fine, _spec(fine), f) for f in filters])
+
+    assert np.allclose(res, truth, rtol=3e-4)
+    assert np.max(np.abs(res / truth - 1)) < np.max(np.abs(ref / truth - 1))
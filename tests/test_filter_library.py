@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import (FilterLibrary, get_filter, set_default_library,
+                           write_filter_library)
+
+
+@pytest.fixture
+def library(tmp_path, filters):
+    fname = str(tmp_path / "filters.bin")
+    curves = {f.name: {"fwlen": f.fwlen, "ftrans": f.ftrans, "zp": 300.0}
+              for f in filters}
+    write_filter_library(fname, curves, aliases={"A3": "F3"})
+
+    return(fname)
+
+
+def test_round_trip(library, filters):
+    lib = FilterLibrary(library)
+
+    assert sorted(lib.names) == sorted(f.name for f in filters)
+    assert "A3" in lib
+
+    filt = lib["A3"]
+    assert filt.name == "F3"
+    assert filt.zp == 300.0
+    assert not filt.approximate
+    assert np.allclose(filt.fwlen, filters[0].fwlen, rtol=1e-6)
+
+    with pytest.raises(KeyError):
+        lib["W3"]
+
+
+def test_get_filter_requires_library(library):
+    set_default_library(None)
+
+    with pytest.raises(IOError, match="no filter library set"):
+        get_filter("F3")
+
+    set_default_library(library)
+    try:
+        assert get_filter("F4").name == "F4"
+    finally:
+        set_default_library(None)
+
+
+def test_bad_file(tmp_path):
+    fname = tmp_path / "bad.bin"
+    fname.write_bytes(b"NOTAFILTERLIBRARY")
+
+    with pytest.raises(IOError, match="not a filter library"):
+        FilterLibrary(str(fname))
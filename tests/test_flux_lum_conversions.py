@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+
+import numpy as np
+import pytest
+
+from miscellaneous import flux2lum, fnu2lum, lum2flux, lum2fnu
+
+
+MPC = 3.086e24
+
+
+def _fnu2lum_ref(fnu, dist, wlen):
+    return(4 * np.pi * (MPC * dist)**2 * fnu * 1e-23 * 2.99792e8
+           / (wlen * 1e-6))
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(3)
+    return(rng.uniform(0.1, 10, 50), rng.uniform(1, 100, 50),
+           rng.uniform(1, 30, 50))
+
+
+@pytest.mark.parametrize("log_fnu, log_dist, log_wlen, log_lum",
+                         itertools.product([False, True], repeat=4))
+def test_fnu2lum_all_log_flags(values, log_fnu, log_dist, log_wlen,
+                               log_lum):
+    fnu, dist, wlen = values
+    ref = _fnu2lum_ref(fnu, dist, wlen)
+
+    res = fnu2lum(np.log10(fnu) if log_fnu else fnu,
+                  np.log10(dist) if log_dist else dist,
+                  np.log10(wlen) if log_wlen else wlen,
+                  log_fnu=log_fnu, log_dist=log_dist, log_wlen=log_wlen,
+                  log_lum=log_lum)
+
+    assert np.allclose(10**res if log_lum else res, ref, rtol=1e-12)
+
+
+def test_round_trips(values):
+    fnu, dist, wlen = values
+
+    lum = fnu2lum(fnu, dist, wlen)
+    assert np.allclose(lum2fnu(lum, dist, wlen), fnu, rtol=1e-12)
+    assert np.allclose(lum2fnu(lum, dist, wlen, fnu_unit="mJy"), 1e3 * fnu,
+                       rtol=1e-12)
+
+    lum = flux2lum(fnu, dist)
+    assert np.allclose(lum2flux(lum, dist), fnu, rtol=1e-12)
+    assert np.allclose(lum2flux(lum, dist, flux_unit="W/m^2"), 1e-3 * fnu,
+                       rtol=1e-12)
+    assert np.allclose(flux2lum(fnu, dist, log_lum=False),
+                       4 * np.pi * (MPC * dist)**2 * fnu, rtol=1e-12)
+
+
+def test_out_and_dtype(values):
+    fnu, dist, wlen = values
+    ref = fnu2lum(fnu, dist, wlen)
+
+    out = np.empty(50)
+    assert fnu2lum(fnu, dist, wlen, out=out) is out
+    assert np.array_equal(out, ref)
+
+    res = fnu2lum(fnu, dist, wlen, dtype=np.float32)
+    assert res.dtype == np.float32
+    assert np.allclose(res, ref, rtol=1e-6)
+
+
+def test_redshift_input(values):
+    fnu, dist, wlen = values
+    from miscellaneous import lum_dist
+
+    z = np.linspace(0.1, 2, 50)
+    assert np.allclose(fnu2lum(fnu, wlen=wlen, z=z),
+                       fnu2lum(fnu, lum_dist(z), wlen), rtol=1e-12)
+    assert np.allclose(lum2flux(fnu, z=z), lum2flux(fnu, lum_dist(z)),
+                       rtol=1e-12)
+
+
+@pytest.mark.parametrize("func, kwargs", [(fnu2lum, {"wlen": 10.0}),
+                                          (lum2fnu, {"wlen": 10.0}),
+                                          (flux2lum, {}), (lum2flux, {})])
+def test_missing_dist_and_z(values, func, kwargs, capsys):
+    assert func(values[0], **kwargs) == -1
+    assert "neither dist nor z" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("func, nargs", [(fnu2lum, 3), (lum2fnu, 3),
+                                         (flux2lum, 2), (lum2flux, 2)])
+@pytest.mark.parametrize("log_out", [False, True])
+def test_out_aliasing_each_argument(values, func, nargs, log_out):
+    args = list(values[:nargs])
+    outkey = {fnu2lum: "log_lum", flux2lum: "log_lum", lum2fnu: "log_fnu",
+              lum2flux: "log_flux"}[func]
+
+    ref = func(*args, **{outkey: log_out})
+
+    for i in range(nargs):
+        inputs = [a.copy() for a in args]
+        res = func(*inputs, out=inputs[i], **{outkey: log_out})
+
+        assert res is inputs[i]
+        assert np.allclose(res, ref, rtol=1e-12)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import KCorrTable
+
+
+def test_unsorted_zgrid(spectrum, filters):
+    wlen, fnu = spectrum
+
+    ref = KCorrTable(wlen, fnu, filters, np.linspace(0, 0.5, 11))
+    kt = KCorrTable(wlen, fnu, filters, [0.5, 0.1, 0.0, 0.3, 0.25, 0.1])
+
+    assert np.array_equal(kt.zgrid, [0.0, 0.1, 0.25, 0.3, 0.5])
+    assert np.allclose(kt.kcorrection(0.0), 0.0, atol=1e-12)
+    assert np.allclose(kt.kcorrection(kt.zgrid), ref.kcorrection(kt.zgrid),
+                       rtol=1e-12)
+
+
+def test_unknown_filter(spectrum, filters):
+    kt = KCorrTable(*spectrum, filters, [0.0, 0.5])
+
+    assert np.isfinite(kt.kcorrection(0.2, "F11"))
+
+    with pytest.raises(KeyError, match="W3"):
+        kt.kcorrection(0.2, "W3")
+
+
+def test_save_load(tmp_path, spectrum, filters):
+    kt = KCorrTable(*spectrum, filters, [0.0, 0.2, 0.5])
+    fname = str(tmp_path / "kcorr.npz")
+    kt.save(fname)
+
+    loaded = KCorrTable.load(fname)
+
+    assert list(loaded.names) == list(kt.names)
+    assert np.array_equal(loaded.flux(0.3), kt.flux(0.3))
+    assert repr(loaded) == repr(kt)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+
+import numpy as np
+
+from miscellaneous import convert_flux, fnu2lum, parallel_apply
+
+
+def test_parallel_matches_direct():
+    rng = np.random.default_rng(5)
+    flux = rng.uniform(1, 2, 10000)
+    wlen = rng.uniform(1, 30, 10000)
+
+    for workers in (1, 3):
+        res = parallel_apply(convert_flux, flux, "Jy", "W/m^2", wlen=wlen,
+                             chunk_size=999, workers=workers)
+        assert np.array_equal(res, convert_flux(flux, "Jy", "W/m^2",
+                                                wlen=wlen))
+
+        res = parallel_apply(fnu2lum, flux, 10.0, wlen, chunk_size=999,
+                             workers=workers)
+        assert np.array_equal(res, fnu2lum(flux, 10.0, wlen))
+
+
+def test_parallel_error_reported_once():
+    flux = np.ones(10000)
+    buf = io.StringIO()
+
+    with contextlib.redirect_stdout(buf):
+        res = parallel_apply(convert_flux, flux, "Jy", "nope",
+                             chunk_size=100, workers=3)
+
+    assert res == -1
+    assert buf.getvalue().count("\n") == 2
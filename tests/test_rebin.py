@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from miscellaneous import Rebinner, rebin_spectra
+
+
+def test_rebin_conserves_flux():
+    rng = np.random.default_rng(2)
+    wlen = np.sort(rng.uniform(1, 10, 500))
+    fnu = rng.uniform(0.5, 2, 500)
+
+    # --- source bins reach half way to the neighbours
+    edges = np.concatenate([[1.5 * wlen[0] - 0.5 * wlen[1]],
+                            0.5 * (wlen[1:] + wlen[:-1]),
+                            [1.5 * wlen[-1] - 0.5 * wlen[-2]]])
+
+    # --- 37 equal target bins spanning exactly the source bins
+    step = (edges[-1] - edges[0]) / 37
+    new = edges[0] + (np.arange(37) + 0.5) * step
+
+    rb = Rebinner(wlen, new)
+    res = rb(fnu)
+
+    assert rb.valid.all()
+    assert np.isclose(np.sum(res * step), np.sum(fnu * np.diff(edges)),
+                      rtol=1e-12)
+
+
+def test_rebin_identity_and_constant():
+    wlen = np.linspace(1, 10, 200)
+    fnu = np.sin(wlen) + 2
+
+    assert np.allclose(Rebinner(wlen, wlen)(fnu)[1:-1], fnu[1:-1])
+
+    res = rebin_spectra(wlen, np.ones(200), np.linspace(2, 9, 50))
+    assert np.allclose(res, 1.0)
+
+
+def test_rebin_stack_errors_and_fill():
+    wlen = np.linspace(1, 10, 100)
+    stack = np.vstack([np.ones(100), 2 * np.ones(100)])
+    new = np.linspace(0, 12, 30)
+
+    flux, err = rebin_spectra(wlen, stack, new, fluxerr=0.1 * stack,
+                              fill=-1.0)
+    assert flux.shape == (2, 30)
+    assert np.all(flux[:, 0] == -1) and np.all(err[:, 0] == -1)
+
+    # --- the cached operator keeps its own fill value
+    assert np.isnan(rebin_spectra(wlen, stack[0], new)[0])
+
+    # --- averaging over several source pixels reduces the error
+    inside = flux[0] > 0
+    assert np.all(err[0, inside] < 0.1)
+
+    assert rebin_spectra(wlen, np.ones(99), new) == -1
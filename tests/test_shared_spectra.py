@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from miscellaneous import SharedSpectralLibrary, synthphot, synthphot_shared
+
+
+def test_matches_synthphot_and_reports(spectrum, filters, capsys):
+    wlen, fnu = spectrum
+
+    fluxden = np.array([fnu, 2 * fnu, fnu * (wlen < 15)])
+    ref = np.array([[synthphot(wlen, f, filt) for filt in filters]
+                    for f in fluxden[:2]])
+
+    # --- the last spectrum has a hole across F22
+    wlens = np.array([wlen, wlen, np.where(wlen < 15, wlen, 0)])
+
+    with SharedSpectralLibrary(wlen, fluxden) as lib:
+        res = synthphot_shared(lib, filters, workers=1, spectra_per_task=2)
+
+    assert np.allclose(res[:2], ref, rtol=1e-12)
+
+    with SharedSpectralLibrary(wlens, fluxden) as lib:
+        res = synthphot_shared(lib, filters, workers=1, spectra_per_task=2)
+
+    assert np.allclose(res[:2], ref, rtol=1e-12)
+    assert np.isnan(res[2, 3]) and np.isfinite(res[2, 0])
+
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["SYNTHPHOT_SHARED: spectrum 2: ERROR: spectrum not "
+                   + "covering whole filter curve. Abort..."]
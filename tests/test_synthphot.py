@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from miscellaneous import (Filter, PhotMatrix, SpectralAxis, synthphot,
+                           synthphot_batch, synthphot_freq, synthphot_mc,
+                           synthphot_multi, synthphot_stream)
+from miscellaneous.filter_curve import (_cumulative_integrals,
+                                        _integrate_piecewise_linear)
+from miscellaneous.spectral_axis import _simpson_weights
+from scipy.integrate import simps
+
+
+def test_simpson_weights_match_simps():
+    rng = np.random.default_rng(1)
+
+    for n in (2, 3, 4, 7, 10, 101):
+        x = np.sort(rng.uniform(1, 10, n))
+        y = rng.normal(size=n)
+        assert np.isclose(_simpson_weights(x) @ y, simps(y, x), rtol=1e-12)
+
+
+def test_filter_and_axis_match_arrays(spectrum, filters):
+    wlen, fnu = spectrum
+    axis = SpectralAxis(wlen)
+
+    for filt in filters:
+        ref = synthphot(wlen, fnu, filt.fwlen, filt.ftrans, filt.ref_wlen)
+
+        assert np.isclose(synthphot(wlen, fnu, filt), ref, rtol=1e-12)
+        assert np.isclose(synthphot(axis, fnu, filt), ref, rtol=1e-12)
+
+        ref = synthphot_freq(wlen, fnu, filt.fwlen, filt.ftrans,
+                             filt.ref_wlen)
+        assert np.isclose(synthphot_freq(wlen, fnu, filt), ref, rtol=1e-12)
+
+
+def test_batch_and_matrix_match_synthphot(spectrum, filters):
+    wlen, fnu = spectrum
+    stack = np.vstack([fnu, 2 * fnu, fnu * wlen])
+
+    ref = np.array([[synthphot(wlen, f, filt) for f in stack]
+                    for filt in filters])
+
+    batch = np.array([synthphot_batch(wlen, stack, filt) for filt in filters])
+    assert np.allclose(batch, ref, rtol=1e-12)
+
+    pm = PhotMatrix(wlen, filters)
+    assert np.allclose(pm(stack), ref.T, rtol=1e-12)
+
+
+def test_not_covered_returns_minus_one(spectrum, filters):
+    wlen, fnu = spectrum
+    short = wlen < 10
+
+    assert synthphot(wlen[short], fnu[short], filters[2]) == -1
+    assert synthphot_batch(wlen[short], fnu[short], filters[2]) == -1
+
+
+@pytest.mark.parametrize("chunk_size", [5, 776, 777, 10**6])
+@pytest.mark.parametrize("npix", [2900, 2901])
+def test_stream_matches_synthphot(filters, chunk_size, npix):
+    # --- odd and even numbers of points inside the filter and chunk
+    #     boundaries at every parity
+    wlen = np.linspace(1, 30, npix)
+    fnu = (wlen / 10)**1.5 * (1 + 0.3 * np.sin(3 * wlen))
+
+    for filt in filters:
+        ref = synthphot(wlen, fnu, filt)
+        res = synthphot_stream((wlen, fnu), filt, chunk_size=chunk_size)
+        assert np.isclose(res, ref, rtol=1e-12)
+
+
+def test_stream_from_npy_file(tmp_path, spectrum, filters):
+    wlen, fnu = spectrum
+    fname = str(tmp_path / "spec.npy")
+    np.save(fname, np.vstack([wlen, fnu]))
+
+    assert np.isclose(synthphot_stream(fname, filters[0], chunk_size=1000),
+                      synthphot(wlen, fnu, filters[0]), rtol=1e-12)
+
+
+def test_mc_nominal_and_scatter(spectrum, filters):
+    wlen, fnu = spectrum
+    res = synthphot_mc(wlen, fnu, 0.01 * fnu, filters[1], nreal=2000,
+                       seed=1, block_size=300)
+
+    assert res["flux"] == pytest.approx(synthphot(wlen, fnu, filters[1]),
+                                        rel=1e-12)
+    assert res["mean"] == pytest.approx(res["flux"], rel=1e-3)
+    assert res["samples"].shape == (2000,)
+
+
+def test_piecewise_linear_integration_is_exact():
+    # --- g and the curve linear between their points: the product is a
+    #     quadratic per interval and the integral exact
+    x = np.linspace(1, 5, 9)
+    g = 2 * x + 1
+    c0, c1 = _cumulative_integrals(x, g)
+
+    knots = np.array([1.5, 2.0, 4.25])
+    trans = np.array([0.0, 1.0, 1.0])
+
+    fine = np.linspace(1.5, 4.25, 200001)
+    ref = simps(np.interp(fine, knots, trans) * (2 * fine + 1), fine)
+
+    res = _integrate_piecewise_linear(x, g, c0, c1, knots, trans)
+    assert res == pytest.approx(ref, rel=1e-10)
+
+    # --- 2D knots: one integral per row
+    res = _integrate_piecewise_linear(x, g, c0, c1,
+                                      np.vstack([knots, knots]), trans)
+    assert np.allclose(res, ref, rtol=1e-10)
+
+
+def test_multi_tolerance(spectrum, filters):
+    wlen, fnu = spectrum
+
+    res, covered = synthphot_multi(wlen, fnu, filters)
+    ref = np.array([synthphot(wlen, fnu, f) for f in filters])
+
+    # --- synthphot drops the partial intervals at the filter edges
+    assert np.all(covered)
+    assert np.allclose(res, ref, rtol=2e-3)
+
+    # --- both against a densely sampled reference
+    fine = np.arange(1, 30, 0.0005)
+    fine_fnu = (fine / 10)**1.5 * (1 + 0.3 * np.sin(3 * fine))
+    truth = np.array([synthphot(fine, fine_fnu, f) for f in filters])
+
+    assert np.allclose(res, truth, rtol=2e-4)
+    assert np.max(np.abs(res / truth - 1)) < np.max(np.abs(ref / truth - 1))
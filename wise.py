@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+__version__ = "1.1.1"
 
 """
 HISTORY:
     - 2020-01-17: created by Daniel Asmus
+    - 2026-10-18: batched conversion of (N, 4) catalogs (mag2jansky_batch);
+                  correction tables moved to module level
+    - 2026-10-18: zero points without color correction from
+                  flux_conversions.get_zp
 
 
 NOTES:
-    -
+    - mag2jansky_batch treats every row like mag2jansky treats one source.
+      If a color is not available (NaN magnitude), the color correction of
+      the affected bands uses the remaining color, or none (1.0) if there is
+      no color left
+    - NaN magnitude errors mark non-detections and are replaced by the
+      magnitude itself
 
 TO-DO:
     -
@@ -18,91 +27,139 @@ TO-DO:
 
 import numpy as _np
 
+from .flux_conversions import get_zp as _get_zp
+
 wlens = _np.array([3.3526, 4.6028, 11.5608, 22.8])
 hwidths = _np.array([0.663, 1.042, 5.506, 4.102]) * 0.5
 
+# --- zero points without and with color correction
+zps = _get_zp(["W1", "W2", "W3", "W4"])  # Jy
+zps_cc = _np.array([306.682, 170.663, 29.045, 8.284])  # Jy
 
-# %%
-def mag2jansky(mags, merrs=None, cc=False, w4cor=True):
+# --- color correction table given in Wright et al. 2010
+fc = _np.array([[1.0283, 1.0084, 0.9961, 0.9907, 0.9921, 1.0, 1.0142, 1.0347],
+                [1.0206, 1.0066, 0.9976, 0.9935, 0.9943, 1.0, 1.1081, 1.2687],
+                [1.1344, 1.0088, 0.9292, 0.9169, 0.9373, 1.0, 1.1081, 1.2687],
+                [1.0142, 1.0013, 0.9934, 0.9905, 0.9926, 1.0, 1.0130, 1.0319]])
 
+# --- W1-W2, W2-W3 and W3-W4 colors of the table
+cols = _np.array([[-0.404, -0.0538, 0.2939, 0.6393, 0.9828, 1.3246, 1.6649,
+                   2.0041],
+                  [-0.9624, -0.0748, 0.8575, 1.8357, 2.8586, 3.9225, 5.0223,
+                   6.1524],
+                  [-0.8684, -0.0519, 0.72, 1.4458, 2.1272, 2.7680, 3.3734,
+                   3.9495]])
+
+# --- W3-W4 color above which W4 is corrected for very red sources
+w4cor_color = 2.1272
+
+
+def _mean2(a, b):
     """
-    Convert the WISE magnitudes into flux densities using the conversion
-    relations and color corrections given in the documentation:
-    http://wise2.ipac.caltech.edu/docs/release/allsky/expsup/sec4_4h.html#FluxCC
+    Mean of a and b ignoring NaN (NaN only if both are NaN)
     """
 
-    mags = _np.array(mags, dtype=float)
+    na = _np.isnan(a)
+    nb = _np.isnan(b)
 
-    # --- first calculate the colors
-    W1W2 = mags[0] - mags[1]
-    W2W3 = mags[1] - mags[2]
-    W3W4 = mags[2] - mags[3]
+    with _np.errstate(invalid="ignore"):
+        return((_np.where(na, 0, a) + _np.where(nb, 0, b))
+               / ((~na).astype(int) + (~nb)))
 
-    # --- use the color correction table given in Wright et al. 2010
-    fc1 = _np.array([1.0283, 1.0084, 0.9961, 0.9907, 0.9921, 1.0, 1.0142, 1.0347])
-    fc2 = _np.array([1.0206, 1.0066, 0.9976, 0.9935, 0.9943, 1.0, 1.1081, 1.2687])
-    fc3 = _np.array([1.1344, 1.0088, 0.9292, 0.9169, 0.9373, 1.0, 1.1081, 1.2687])
-    fc4 = _np.array([1.0142, 1.0013, 0.9934, 0.9905, 0.9926, 1.0, 1.0130, 1.0319])
 
-    col1 = _np.array([-0.404, -0.0538, 0.2939, 0.6393, 0.9828, 1.3246, 1.6649, 2.0041])
-    col2 = _np.array([-0.9624, -0.0748, 0.8575, 1.8357, 2.8586, 3.9225, 5.0223, 6.1524])
-    col3 = _np.array([-0.8684, -0.0519, 0.72, 1.4458, 2.1272, 2.7680, 3.3734, 39495])
+# %%
+def mag2jansky_batch(mags, merrs=None, cc=False, w4cor=True):
 
-    # --- determine the corrections based on the actual color and interpolation
-    #     of the above table
-    if cc is True:
+    """
+    Convert the WISE magnitudes of many sources into flux densities at once,
+    like mag2jansky
+
+    Parameters
+    ----------
+    mags : TYPE float array
+        DESCRIPTION. W1 to W4 magnitudes with the shape (N, 4), NaN for
+        missing values
+    merrs : TYPE float array, optional
+        DESCRIPTION. The default is None. Magnitude errors (N, 4), NaN for
+        non-detections
+    cc : TYPE bool, optional
+        DESCRIPTION. The default is False. Apply the color corrections
+    w4cor : TYPE bool, optional
+        DESCRIPTION. The default is True. Correct W4 of very red sources
+
+    Returns
+    -------
+    float array: flux densities in Jy (N, 4), and the flux errors (N, 4) if
+        merrs is given
 
-        cc1 = _np.interp(W1W2, col1, fc1)
+    """
 
-        cc2 = _np.mean([_np.interp(W1W2, col1, fc2), _np.interp(W2W3, col2, fc2)])
+    mags = _np.atleast_2d(_np.asarray(mags, dtype=float))
 
-        cc3 = _np.mean([_np.interp(W2W3, col2, fc3), _np.interp(W3W4, col3, fc3)])
+    # --- W1-W2, W2-W3, W3-W4 colors of all sources
+    colors = mags[:, :-1] - mags[:, 1:]
 
-        cc4 = _np.interp(W3W4, col3, fc4)
+    if cc is True:
 
-    #print(cc1,cc2,cc3,cc4)
+        # --- interpolate the table for each band and color
+        cc1 = _np.interp(colors[:, 0], cols[0], fc[0])
 
-        cc = _np.array([cc1, cc2, cc3, cc4])
+        cc2 = _mean2(_np.interp(colors[:, 0], cols[0], fc[1]),
+                     _np.interp(colors[:, 1], cols[1], fc[1]))
 
-        # --- zero points
-        zps = _np.array([306.682, 170.663, 29.045, 8.284])  # Jy
+        cc3 = _mean2(_np.interp(colors[:, 1], cols[1], fc[2]),
+                     _np.interp(colors[:, 2], cols[2], fc[2]))
 
-        fluxes = zps / cc * 10 ** (-mags/2.5)
+        cc4 = _np.interp(colors[:, 2], cols[2], fc[3])
+
+        ccs = _np.column_stack([cc1, cc2, cc3, cc4])
+        ccs[_np.isnan(ccs)] = 1.0
+
+        zp = zps_cc / ccs
 
     else:
+        zp = _np.broadcast_to(zps, mags.shape)
 
-        # --- zero points
-        zps = _np.array([309.540, 171.787, 31.674, 8.363])  # Jy
-        cc = 1
+    fluxes = zp * 10 ** (-mags/2.5)
 
-        fluxes = zps * 10 ** (-mags/2.5)
+    # --- additional flux correction in W4 for very red sources (alpha >=1):
+    if w4cor is True:
+        with _np.errstate(invalid="ignore"):
+            red = colors[:, 2] >= w4cor_color
 
+        fluxes[red, 3] = 0.9 * fluxes[red, 3]
 
+    if merrs is None:
+        return(fluxes)
 
-    # --- additional flux correction in W4 for very red sources (alpha >=1):
-    if (W3W4 >= 2.1272) and (w4cor is True):
-        fluxes[3] = 0.9 * fluxes[3]
+    # --- flux errors from the maximum of the upper and lower error, with
+    #     the error of non-detections set very large
+    merrs = _np.atleast_2d(_np.asarray(merrs, dtype=float))
+    merrs = _np.where(_np.isnan(merrs), mags, merrs)
 
-    # --- if the magnitude errors are provide compute the flux errors using the
-    #     maximum of the upper and lower error
-    if merrs is not None:
+    uf = zp * 10 ** (-(mags-merrs)/2.5)
+    lf = zp * 10 ** (-(mags+merrs)/2.5)
 
-        merrs = _np.array(merrs, dtype=float)
+    errors = _np.maximum(uf-fluxes, fluxes-lf)
 
-        # --- check for non-detections and set the error very large
-        nondet = _np.array(_np.where(_np.isnan(merrs)))[0]
+    return(fluxes, errors)
 
-        if sum(nondet) > 0:
-            #print(nondet)
-            merrs[nondet] = mags[nondet]
 
-        uf = zps / cc * 10 ** (-(mags-merrs)/2.5)
-        lf = zps / cc * 10 ** (-(mags+merrs)/2.5)
+# %%
+def mag2jansky(mags, merrs=None, cc=False, w4cor=True):
 
-        errors = _np.max([uf-fluxes, fluxes-lf],axis=0)
+    """
+    Convert the WISE magnitudes into flux densities using the conversion
+    relations and color corrections given in the documentation:
+    http://wise2.ipac.caltech.edu/docs/release/allsky/expsup/sec4_4h.html#FluxCC
+    """
 
-        return(fluxes,errors)
+    res = mag2jansky_batch(_np.reshape(mags, (1, 4)),
+                           merrs=None if merrs is None
+                           else _np.reshape(merrs, (1, 4)),
+                           cc=cc, w4cor=w4cor)
 
-    else:
-       return(fluxes)
+    if merrs is not None:
+        return(res[0][0], res[1][0])
 
+    return(res[0])